@@ -0,0 +1,53 @@
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _fake
+
+_START = time.perf_counter()
+_TARGET = re.compile(r"^exe_\d+ = EXE\(.*name='([^']+)'")
+
+
+def _info(message: str):
+    # Format wie PyInstaller: "<ms seit Start> INFO: <Text>"
+    print(f"{int((time.perf_counter() - _START) * 1000)} INFO: {message}", flush=True)
+
+
+def _targets(args: list, scripts: list) -> list:
+    """(name, onedir) pro Ziel: aus der Spec (build_variants) oder aus --name / Script-Namen."""
+    spec = next((s for s in scripts if s.endswith(".spec")), None)
+    if spec:
+        with open(spec, encoding="utf-8") as f:
+            return [(m.group(1), "exclude_binaries=True" in line)
+                    for line in f if (m := _TARGET.match(line))]
+    name = _fake.option(args, "--name") or (os.path.splitext(os.path.basename(scripts[0]))[0] if scripts else "App")
+    return [(name, "--onedir" in args)]
+
+
+def run(pyi_args: list = None):
+    """
+    Stand-in für PyInstaller: Analyse (volle Latenz/Ausgabe) einmal pro Aufruf, danach pro Ziel ein
+    kurzer EXE-Schritt (1/5 der Latenz) -> <distpath>/<name>.exe bzw. <distpath>/<name>/<name>.exe.
+    """
+    args = list(sys.argv[1:] if pyi_args is None else pyi_args)
+    scripts = [a for a in args if a.endswith((".py", ".spec")) and not a.startswith("-")]
+    dist = _fake.option(args, "--distpath", "dist")
+    work = _fake.option(args, "--workpath", "build")
+    targets = _targets(args, scripts)
+    _info(f"PyInstaller: 0.0-fake, Python: {sys.version.split()[0]}")
+    _info(f"Analyzing {scripts[0] if scripts else '?'}")
+    _fake.simulate("PyInstaller", "INFO: Building")
+    _info("Building PYZ (ZlibArchive) PYZ-00.pyz completed successfully.")
+    for name, onedir in targets:
+        os.makedirs(os.path.join(work, name), exist_ok=True)
+        _info(f"Building {'EXE' if onedir else 'PKG'} for {name}")
+        time.sleep(_fake.LATENCY / 5)
+        target = os.path.join(dist, name, f"{name}.exe") if onedir else os.path.join(dist, f"{name}.exe")
+        _fake.write_pe(target)
+        _info(f"Building EXE from EXE-00.toc completed successfully.")
+
+
+if __name__ == "__main__":
+    run()
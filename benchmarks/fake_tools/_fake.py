@@ -0,0 +1,66 @@
+"""
+Gemeinsame Helfer der Stand-in-Tools (PyInstaller, pip, osslsigncode, openssl) für benchmarks/.
+Verhalten über Umgebungsvariablen:
+  EXEBUILDER_FAKE_LATENCY  Sekunden pro Aufruf (Standard 0.05)
+  EXEBUILDER_FAKE_LINES    Ausgabezeilen pro Aufruf (Standard 50)
+  EXEBUILDER_FAKE_EXE_KB   Größe der erzeugten EXE (Standard 512)
+  EXEBUILDER_FAKE_FAIL     Kommagetrennte Tool-Namen, die mit Exit-Code 1 enden
+"""
+import os
+import sys
+import time
+import struct
+
+LATENCY = float(os.environ.get("EXEBUILDER_FAKE_LATENCY", "0.05"))
+LINES = int(os.environ.get("EXEBUILDER_FAKE_LINES", "50"))
+EXE_KB = int(os.environ.get("EXEBUILDER_FAKE_EXE_KB", "512"))
+FAIL = set(filter(None, os.environ.get("EXEBUILDER_FAKE_FAIL", "").split(",")))
+
+_CHUNKS = 10
+
+
+def simulate(tool: str, line: str = "INFO: arbeite"):
+    """Verteilt LINES Ausgabezeilen und LATENCY Sekunden auf einige Blöcke (wie echte Tools)."""
+    per_chunk = max(1, LINES // _CHUNKS) if LINES else 0
+    written = 0
+    for _ in range(_CHUNKS):
+        n = min(per_chunk, LINES - written)
+        if n > 0:
+            sys.stdout.write("".join(f"{tool}: {line} {written + i}\n" for i in range(n)))
+            written += n
+        sys.stdout.flush()
+        if LATENCY:
+            time.sleep(LATENCY / _CHUNKS)
+    if written < LINES:
+        sys.stdout.write("".join(f"{tool}: {line} {i}\n" for i in range(written, LINES)))
+    sys.stdout.flush()
+    if tool in FAIL:
+        sys.stderr.write(f"{tool}: ERROR: simulierter Fehler\n")
+        sys.exit(1)
+
+
+def option(args: list, name: str, default=None):
+    """Wert von '--name wert' oder '--name=wert'."""
+    for i, arg in enumerate(args):
+        if arg == name and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return default
+
+
+def write_pe(path: str, size_kb: int = None):
+    """Minimales, strukturell gültiges PE32 (eine Sektion bis Dateiende), damit verify_executable passt."""
+    size = max(4096, (size_kb if size_kb is not None else EXE_KB) * 1024)
+    data = bytearray(size)
+    data[0:2] = b"MZ"
+    struct.pack_into("<I", data, 0x3C, 0x80)
+    data[0x80:0x84] = b"PE\0\0"
+    struct.pack_into("<HHIIIHH", data, 0x84, 0x14C, 1, 0, 0, 0, 224, 0x0102)
+    data[0x98:0x9A] = b"\x0b\x01"
+    section = 0x98 + 224
+    data[section:section + 5] = b".text"
+    struct.pack_into("<II", data, section + 16, size - 0x400, 0x400)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
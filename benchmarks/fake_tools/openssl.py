@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _fake
+
+
+def main(args: list) -> int:
+    """Stand-in für 'openssl req -x509 ...' und 'openssl pkcs12 -export ...' (schreibt Platzhalter-Dateien)."""
+    if not args or args[0] == "version":
+        print("OpenSSL 0.0-fake")
+        return 0
+    _fake.simulate("openssl", "Generating key")
+    outputs = [_fake.option(args, "-keyout"), _fake.option(args, "-out")]
+    for path in filter(None, outputs):
+        with open(path, "wb") as f:
+            f.write(b"-----BEGIN FAKE-----\n" + os.urandom(512) + b"\n-----END FAKE-----\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
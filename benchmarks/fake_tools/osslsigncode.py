@@ -0,0 +1,34 @@
+import os
+import sys
+import struct
+import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _fake
+
+_SECURITY_DIR = 0x98 + 96 + 4 * 8   # Data Directory 4 im PE32 Optional-Header von _fake.write_pe
+
+
+def main(args: list) -> int:
+    """Stand-in für 'osslsigncode sign ... -in a.exe -out b.exe': hängt eine Pseudo-Zertifikatstabelle an."""
+    if not args or args[0] != "sign":
+        print("osslsigncode 0.0-fake")
+        return 0
+    src, dst = _fake.option(args, "-in"), _fake.option(args, "-out")
+    if not src or not dst or not os.path.exists(src):
+        sys.stderr.write("osslsigncode: -in/-out fehlt\n")
+        return 1
+    _fake.simulate("osslsigncode", "Timestamp")
+    shutil.copyfile(src, dst)
+    with open(dst, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        f.write(b"\0" * 2048)
+        f.seek(_SECURITY_DIR)
+        f.write(struct.pack("<II", offset, 2048))
+    print("Succeeded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _fake
+
+
+def main(args: list) -> int:
+    """Stand-in für 'pip install -r datei': meldet jedes Paket, installiert nichts."""
+    if not args or args[0] != "install":
+        print("pip 0.0-fake")
+        return 0
+    packages = []
+    req_file = _fake.option(args, "-r") or _fake.option(args, "--requirement")
+    if req_file and os.path.exists(req_file):
+        with open(req_file, encoding="utf-8") as f:
+            packages = [line.split("--hash")[0].strip() for line in f if line.strip() and not line.startswith("#")]
+    for pkg in packages:
+        print(f"Collecting {pkg}")
+    _fake.simulate("pip", "Downloading")
+    print(f"Successfully installed {' '.join(packages)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import time
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.core.resources import ResourceSampler
+from src.utils.helpers import log
+
+HISTORY_DIR = ROOT / "builds" / "benchmarks"
+
+# Unterhalb dieser absoluten Abweichung ist eine "Regression" nur Rauschen
+MIN_DELTA = {"s": 0.01, "mb": 5.0}
+
+
+def unit_of(metric: str) -> str:
+    return "mb" if metric.endswith("_mb") else "s"
+
+
+def summarize(samples: dict) -> dict:
+    """{metric: [werte]} -> {metric: median}."""
+    return {key: round(statistics.median(values), 4) for key, values in samples.items() if values}
+
+
+def format_value(metric: str, value) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.1f} MB" if unit_of(metric) == "mb" else f"{value * 1000:.1f} ms"
+
+
+class MemoryProbe:
+    """Peak-RSS des eigenen Prozessbaums (inkl. Kindprozesse) während eines Benchmark-Falls."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self._sampler = None
+
+    def __enter__(self):
+        if ResourceSampler.available():
+            self._sampler = ResourceSampler(os.getpid(), interval=self.interval).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.report = self._sampler.stop() if self._sampler else None
+        return False
+
+    @property
+    def peak_rss_mb(self):
+        return self.report["peak_rss_mb"] if self.report else None
+
+
+class Baseline:
+    """Gespeicherte Mediane eines Laufs; Vergleich mit relativer Schwelle und Mindestabstand."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.data = json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else None
+
+    @property
+    def exists(self) -> bool:
+        return self.data is not None
+
+    def save(self, report: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        self.data = report
+
+    def compare(self, metrics: dict, threshold: float) -> list:
+        regressions = []
+        base_metrics = (self.data or {}).get("metrics", {})
+        for key, value in metrics.items():
+            base = base_metrics.get(key)
+            if value is None or not base:
+                continue
+            if value > base * (1 + threshold) and value - base > MIN_DELTA[unit_of(key)]:
+                regressions.append({"metric": key, "value": value, "baseline": base,
+                                    "change": round(value / base - 1, 3)})
+        return regressions
+
+
+def record(name: str, report: dict) -> Path:
+    """Hängt den Bericht an builds/benchmarks/<name>.jsonl an (Verlauf über viele Läufe)."""
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    path = HISTORY_DIR / f"{name}.jsonl"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"ts": time.time(), **report}) + "\n")
+    return path
+
+
+def report_and_check(report: dict, baseline: Baseline, threshold: float, update: bool) -> bool:
+    """Loggt die Metriken, vergleicht mit der Baseline bzw. speichert sie. True = keine Regression."""
+    for key, value in report["metrics"].items():
+        base = (baseline.data or {}).get("metrics", {}).get(key)
+        suffix = f"   (Baseline {format_value(key, base)})" if base and not update else ""
+        log.info(f" {key:<36} {format_value(key, value):>12}{suffix}")
+
+    if update:
+        baseline.save(report)
+        log.success(f"Baseline gespeichert: {baseline.path}")
+        return True
+    if not baseline.exists:
+        log.info("Keine Baseline vorhanden (--update-baseline legt eine an).")
+        return True
+    regressions = baseline.compare(report["metrics"], threshold)
+    for item in regressions:
+        log.error(f"Regression: {item['metric']} {format_value(item['metric'], item['value'])} "
+                  f"(Baseline {format_value(item['metric'], item['baseline'])}, +{item['change']:.0%})")
+    if not regressions:
+        log.success(f"Alle Metriken innerhalb der Baseline (+{threshold:.0%}).")
+    report["regressions"] = regressions
+    return not regressions
@@ -0,0 +1,305 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import ROOT, MemoryProbe, Baseline, summarize, record, report_and_check
+from toolchain import FakeToolchain, RealToolchain
+from src.utils.log_backend import backend, ERROR
+from src.utils.events import ExitCode
+from src.utils.helpers import log
+
+APP_SCRIPT = 'import sys\nprint("Hallo aus dem Benchmark", sys.argv)\n'
+FAKE_PACKAGES = 20
+# Synthetisches Projekt für die Bytecode-Fälle: genug Quelltext, dass Kompilieren messbar ist
+HEAVY_MODULES = 120
+HEAVY_FUNCTIONS = 40
+
+
+class CaseSkipped(Exception):
+    pass
+
+
+class BenchContext:
+    """Workspace und Werkzeuge, die sich alle Fälle eines Laufs teilen."""
+
+    def __init__(self, workspace: Path, toolchain, optimize: int = 1):
+        self.workspace = workspace
+        self.toolchain = toolchain
+        self.optimize = optimize
+        self.tools = toolchain.available()
+        self.script = workspace / "bench_app.py"
+        self.script.write_text(APP_SCRIPT, encoding="utf-8")
+        self.requirements = workspace / "bench_requirements.txt"
+        if toolchain.name == "fake":
+            # Nicht installierte Pakete -> das Delta ist nie leer und pip wird jedes Mal aufgerufen
+            lines = [f"exebuilder-bench-pkg-{i}==1.0.{i}" for i in range(FAKE_PACKAGES)]
+        else:
+            # Echtes pip installiert nichts: bereits vorhandenes Paket -> nur Delta-Berechnung
+            lines = ["pip"]
+        self.requirements.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self._pfx = None
+        self._heavy = None
+
+    def heavy_script(self) -> Path:
+        """Script + Paket 'benchlib' mit HEAVY_MODULES Modulen (einmal pro Lauf erzeugt)."""
+        if self._heavy is None:
+            package = self.workspace / "benchlib"
+            package.mkdir(exist_ok=True)
+            for m in range(HEAVY_MODULES):
+                body = [f'"""Benchmark-Modul {m}."""', "import math", ""]
+                for f in range(HEAVY_FUNCTIONS):
+                    body += [f"def func_{f}(x, y={f}):", f'    """Berechnet Variante {f} für Modul {m}."""',
+                             "    total = 0", "    for i in range(x):",
+                             f"        total += math.sqrt(i * y + {m}) if i % {f + 2} else i", "    return total", ""]
+                (package / f"mod_{m}.py").write_text("\n".join(body), encoding="utf-8")
+            imports = "\n".join(f"from benchlib import mod_{m}" for m in range(HEAVY_MODULES))
+            (package / "__init__.py").write_text("", encoding="utf-8")
+            (package / "everything.py").write_text(imports + "\n", encoding="utf-8")
+            self._heavy = self.workspace / "bench_heavy.py"
+            self._heavy.write_text("import benchlib.everything\nprint('ok')\n", encoding="utf-8")
+        return self._heavy
+
+    def require(self, *tools):
+        missing = [t for t in tools if not self.tools.get(t)]
+        if missing:
+            raise CaseSkipped(f"nicht vorhanden: {', '.join(missing)}")
+
+    def signer(self):
+        from src.core.signer import AuthenticodeSigner
+        signer = AuthenticodeSigner()
+        signer.tool_path = Path(self.toolchain.osslsigncode)
+        return signer
+
+    def certificate(self) -> Path:
+        if self._pfx is None:
+            from src.core.certs import CertificateManager
+            self._pfx, _ = CertificateManager(Path("certs_store")).create_certificate("BenchSign", "bench", use_openssl=True)
+        return self._pfx
+
+
+def _child_peak(builder):
+    """Peak-RSS des PyInstaller-Prozessbaums aus dem letzten Build-Report (None ohne psutil)."""
+    resources = (builder.last_report or {}).get("resources") or {}
+    return resources.get("peak_rss_mb") if resources.get("samples") else None
+
+
+# --- Fälle: liefern zusätzliche Metriken (dict) oder werfen CaseSkipped ---
+
+def case_builder(ctx: BenchContext) -> dict:
+    ctx.require("pyinstaller")
+    from src.core.builder import PyBuilder
+    builder = PyBuilder()
+    exe = builder.build_from_gui(ctx.script, "BenchBuild", clean=False)
+    if not exe:
+        raise RuntimeError("PyBuilder lieferte keine EXE")
+    return {"child_peak_rss_mb": _child_peak(builder)}
+
+
+def case_variants(ctx: BenchContext) -> dict:
+    ctx.require("pyinstaller")
+    from src.core.builder import PyBuilder
+    builder = PyBuilder()
+    variants = [{"name": "BenchCli"}, {"name": "BenchGui", "console": False}, {"name": "BenchDir", "one_file": False}]
+    if not builder.build_variants(ctx.script, variants, clean=False):
+        raise RuntimeError("Varianten-Build fehlgeschlagen")
+    # saved_s (Schätzung im Build-Report) ist kein Regressionsmaß: größer ist hier besser
+    return {"child_peak_rss_mb": _child_peak(builder)}
+
+
+def _startup(ctx: BenchContext, env: dict) -> float:
+    """Frischer Interpreter, der das komplette Projekt importiert (Startzeit der App ohne deren Laufzeit)."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import benchlib.everything"], cwd=str(ctx.workspace),
+                   env={**os.environ, **env}, check=True)
+    return time.perf_counter() - start
+
+
+def case_bytecode(ctx: BenchContext) -> dict:
+    """Vorkompilieren kalt/warm und Startzeit aus Quelltext vs. aus dem geteilten pyc-Cache."""
+    from src.core.bytecode import BytecodeCache
+    script = ctx.heavy_script()
+    cache_dir = Path(tempfile.mkdtemp(prefix="bytecode_", dir=ctx.workspace))
+    cache = BytecodeCache(cache_dir)
+    sources = cache.collect_sources(script)
+    start = time.perf_counter()
+    cache.precompile(sources, ctx.optimize)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    cache.precompile(sources, ctx.optimize)
+    warm = time.perf_counter() - start
+
+    # Ohne Cache: kein Schreiben -> jeder Start kompiliert die App-Module neu (Standardbibliothek aus __pycache__)
+    opt_env = {"PYTHONOPTIMIZE": str(ctx.optimize)} if ctx.optimize else {}
+    from_source = _startup(ctx, {"PYTHONDONTWRITEBYTECODE": "1", **opt_env})
+    cached = _startup(ctx, {**cache.environment(ctx.optimize), "PYTHONDONTWRITEBYTECODE": "1"})
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return {"precompile_cold": cold, "precompile_warm": warm, "startup_source": from_source, "startup_cached": cached}
+
+
+def case_bytecode_build(ctx: BenchContext) -> dict:
+    """PyInstaller-Build desselben Projekts ohne und mit vorkompiliertem Cache (warm)."""
+    ctx.require("pyinstaller")
+    from src.core.builder import PyBuilder, native_optimize
+    from src.core.bytecode import BytecodeCache
+    script = ctx.heavy_script()
+    builder = PyBuilder()
+    cache = BytecodeCache()
+    # Wie die Pipeline: kompiliert wird für die Stufe, mit der der Build-Prozess selbst importiert
+    level = 0 if native_optimize() else ctx.optimize
+    cache.precompile(cache.collect_sources(script), level)
+
+    metrics = {}
+    for key, env in (("build_plain", None), ("build_precompiled", cache.environment(level))):
+        start = time.perf_counter()
+        if not builder.build_from_gui(script, "BenchHeavy", clean=True, env=env, optimize=ctx.optimize):
+            raise RuntimeError("PyBuilder lieferte keine EXE")
+        metrics[key] = time.perf_counter() - start
+    return metrics
+
+
+def case_certificate(ctx: BenchContext) -> dict:
+    ctx.require("openssl")
+    from src.core.certs import CertificateManager
+    CertificateManager(Path("certs_store")).create_certificate("BenchCert", "bench", use_openssl=True)
+    return {}
+
+
+def case_signer(ctx: BenchContext) -> dict:
+    ctx.require("osslsigncode", "openssl")
+    from src.core.readiness import authenticode_size
+    pfx = ctx.certificate()
+    target = ctx.workspace / "sign_target.exe"
+    sys.path.insert(0, str(Path(__file__).resolve().parent / "fake_tools"))
+    try:
+        import _fake
+        _fake.write_pe(str(target), 256)
+    finally:
+        sys.path.pop(0)
+    if not ctx.signer().sign_exe(target, pfx, "bench"):
+        raise RuntimeError("Signatur fehlgeschlagen")
+    if not authenticode_size(target):
+        raise RuntimeError("Keine Zertifikatstabelle nach dem Signieren")
+    return {}
+
+
+def case_pip(ctx: BenchContext) -> dict:
+    ctx.require("pip")
+    from src.core.environment import EnvironmentManager
+    EnvironmentManager()._install_pip(ctx.requirements)
+    return {}
+
+
+def case_pipeline(ctx: BenchContext) -> dict:
+    ctx.require("pyinstaller", "osslsigncode", "openssl")
+    if not hasattr(ctx, "orchestrator"):
+        from src.core.orchestrator import BuildOrchestrator
+        # Ein Orchestrator für alle Durchläufe (wie GUI/Daemon): Environment und Zertifikat sind warm
+        ctx.orchestrator = BuildOrchestrator()
+        ctx.orchestrator.signer = ctx.signer()
+    config = {"script_file": str(ctx.script), "app_name": "BenchPipeline", "cert_mode": "auto",
+              "cert_name": "BenchPipeline", "cert_password": "bench", "use_openssl": True,
+              "clean": False, "delta": True, "archive": True, "remote_cache": None}
+    run = ctx.orchestrator.run_full_pipeline(config)
+    if run is None or not run.ok:
+        raise RuntimeError("Pipeline fehlgeschlagen: " + ", ".join(f"{r.name}: {r.error}" for r in (run.failed if run else [])))
+    metrics = {f"stage.{r.name}": r.duration for r in run.results.values()}
+    metrics["critical_path"] = run.critical_path_time
+    metrics["child_peak_rss_mb"] = _child_peak(run.context["builder"])
+    return metrics
+
+
+CASES = {"builder": case_builder, "variants": case_variants, "certificate": case_certificate, "signer": case_signer,
+         "pip": case_pip, "pipeline": case_pipeline, "bytecode": case_bytecode,
+         "bytecode_build": case_bytecode_build}
+
+
+def run_cases(ctx: BenchContext, names: list, runs: int, warmup: int) -> tuple:
+    samples, skipped = {}, {}
+    for name in names:
+        func = CASES[name]
+        for i in range(warmup + runs):
+            try:
+                with MemoryProbe() as memory:
+                    start = time.perf_counter()
+                    extra = func(ctx)
+                    wall = time.perf_counter() - start
+            except CaseSkipped as e:
+                skipped[name] = str(e)
+                break
+            if i < warmup:
+                continue
+            samples.setdefault(f"{name}.wall", []).append(wall)
+            if memory.peak_rss_mb is not None:
+                samples.setdefault(f"{name}.peak_rss_mb", []).append(memory.peak_rss_mb)
+            for key, value in extra.items():
+                if value is not None:
+                    samples.setdefault(f"{name}.{key}", []).append(value)
+    return samples, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline-Benchmarks gegen Stand-in- oder echte Tools")
+    parser.add_argument("--real", action="store_true", help="Installierte Tools statt Stand-ins verwenden")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Auswahl aus {', '.join(CASES)}")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in: Sekunden pro Tool-Aufruf")
+    parser.add_argument("--lines", type=int, default=200, help="Stand-in: Ausgabezeilen pro Tool-Aufruf")
+    parser.add_argument("--exe-kb", type=int, default=512, help="Stand-in: Größe der erzeugten EXE")
+    parser.add_argument("--optimize", type=int, choices=(0, 1, 2), default=1, help="Bytecode-Fälle: -O-Stufe")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Erlaubte Verschlechterung (0.2 = 20%%)")
+    parser.add_argument("--baseline", help="Baseline-Datei (Standard: benchmarks/baseline_<fake|real>.json)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="Workspace nicht löschen")
+    parser.add_argument("--verbose", action="store_true", help="Build-Logs auf der Konsole zeigen")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.cases.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"Unbekannte Fälle: {', '.join(unknown)}")
+
+    mode = "real" if args.real else "fake"
+    baseline = Baseline(Path(args.baseline) if args.baseline else Path(__file__).resolve().parent / f"baseline_{mode}.json")
+    workspace = Path(tempfile.mkdtemp(prefix="exebuilder_bench_"))
+    cwd = Path.cwd()
+    console_level = backend.console_level
+    if not args.verbose:
+        backend.console_level = ERROR
+
+    toolchain = RealToolchain(workspace, ROOT) if args.real else \
+        FakeToolchain(workspace, latency=args.latency, lines=args.lines, exe_kb=args.exe_kb)
+    try:
+        # Alle relativen Pfade (builds/, certs_store/, tools/) landen im Workspace
+        os.chdir(workspace)
+        with toolchain:
+            ctx = BenchContext(workspace, toolchain, optimize=args.optimize)
+            samples, skipped = run_cases(ctx, names, args.runs, args.warmup)
+    finally:
+        os.chdir(cwd)
+        log.flush()
+        backend.console_level = console_level
+        if not args.keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {"settings": {**toolchain.describe(), "runs": args.runs, "warmup": args.warmup, "optimize": args.optimize,
+                           "python": sys.version.split()[0], "platform": sys.platform},
+              "metrics": summarize(samples), "skipped": skipped}
+    log.info(f"--- Benchmark ({mode}, Median aus {args.runs} Läufen) ---")
+    for name, reason in skipped.items():
+        log.warning(f"Übersprungen: {name} ({reason})")
+    ok = report_and_check(report, baseline, args.threshold, args.update_baseline)
+    log.info(f"Verlauf: {record(f'pipeline_{mode}', report)}")
+    log.flush()
+    return ExitCode.OK if ok else ExitCode.REGRESSION
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import ROOT, Baseline, summarize, record, report_and_check
+from src.utils.helpers import log
+from src.utils.events import ExitCode
+
+BASELINE = Path(__file__).resolve().parent / "startup_baseline.json"
+
+# Diese Module darf der GUI-Import nicht laden – sie gehören in den Hintergrund bzw. zum ersten Build
+DEFERRED_MODULES = ("requests", "asyncio", "cryptography", "packaging", "src.core.orchestrator",
+                    "src.core.environment", "src.core.network", "PyInstaller")
+
+_IMPORT_PROBE = """
+import sys, time, json
+t = time.perf_counter()
+sys.path.insert(0, {root!r})
+import src.ui.gui
+print(json.dumps({{"seconds": time.perf_counter() - t,
+                  "eager": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    """Kalter Import von src.ui.gui in einem frischen Interpreter (braucht kein Display)."""
+    code = _IMPORT_PROBE.format(root=str(ROOT), deferred=DEFERRED_MODULES)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "Import fehlgeschlagen")
+    data = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {"import_gui": data["seconds"], "import_process": wall, "eager": data["eager"]}
+
+
+def measure_window(timeout: float = 30.0) -> dict:
+    """Prozessstart bis erstes gezeichnetes Fenster (main_gui.py im Probe-Modus). None ohne Display."""
+    env = {**os.environ, "EXEBUILDER_STARTUP_PROBE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(ROOT / "main_gui.py")], stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True, cwd=ROOT, env=env)
+    try:
+        for line in proc.stdout:
+            if '"window_shown"' in line:
+                wall = time.perf_counter() - start
+                data = json.loads(line[line.index("{"):])
+                return {"time_to_window": wall, "window_in_process": data["seconds"], "modules": data["modules"]}
+        return None
+    finally:
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def run(runs: int, window: bool) -> dict:
+    samples = {}
+    eager = set()
+    modules = None
+    for _ in range(runs):
+        result = measure_import()
+        eager.update(result.pop("eager"))
+        if window:
+            shown = measure_window()
+            if shown is None:
+                log.warning("Kein Fenster messbar (kein Display?) – nur Import-Zeiten.")
+                window = False
+            else:
+                modules = shown.pop("modules")
+                result.update(shown)
+        for key, value in result.items():
+            samples.setdefault(key, []).append(value)
+    # Nur Zeiten sind Metriken; die Modulanzahl beim ersten Fenster steht informativ im Bericht
+    return {"settings": {"python": sys.version.split()[0], "platform": sys.platform, "runs": runs},
+            "metrics": summarize(samples), "window_modules": modules, "eager_modules": sorted(eager)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-Benchmark der GUI (Import und Zeit bis zum Fenster)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-window", action="store_true", help="Nur Import messen (z.B. auf CI ohne Display)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Erlaubte Verschlechterung (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    args = parser.parse_args()
+
+    report = run(args.runs, not args.no_window)
+    log.info(f"--- Startup (Median aus {args.runs} Läufen) ---")
+    ok = report_and_check(report, Baseline(BASELINE), args.threshold, args.update_baseline)
+    if report["eager_modules"]:
+        log.error(f"Beim GUI-Import geladen, obwohl verzögert: {', '.join(report['eager_modules'])}")
+        ok = False
+    log.info(f"Verlauf: {record('startup', report)}")
+    log.flush()
+    return ExitCode.OK if ok else ExitCode.REGRESSION
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import os
+import sys
+import shutil
+import socket
+import importlib.util
+from pathlib import Path
+
+FAKE_DIR = Path(__file__).resolve().parent / "fake_tools"
+
+
+def _wrapper(bin_dir: Path, name: str, script: Path) -> Path:
+    """Ausführbarer Starter für ein Python-Stand-in (Shell-Script bzw. .cmd unter Windows)."""
+    if os.name == "nt":
+        path = bin_dir / f"{name}.cmd"
+        path.write_text(f'@"{sys.executable}" "{script}" %*\r\n', encoding="utf-8")
+    else:
+        path = bin_dir / name
+        path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+        path.chmod(0o755)
+    return path
+
+
+class FakeToolchain:
+    """
+    Stand-ins für PyInstaller, pip, osslsigncode und openssl mit einstellbarer Latenz und Ausgabemenge.
+    PyInstaller/pip werden über PYTHONPATH vor die echten Pakete gelegt ('python -m ...' in Kindprozessen),
+    osslsigncode/openssl als Starter in einem bin-Verzeichnis. Ein lokaler TCP-Listener dient als
+    Verbindungs-Probe, damit nichts auf das Netzwerk wartet.
+    """
+
+    name = "fake"
+
+    def __init__(self, workspace: Path, latency: float = 0.05, lines: int = 50, exe_kb: int = 512):
+        self.workspace = Path(workspace)
+        self.settings = {"EXEBUILDER_FAKE_LATENCY": str(latency), "EXEBUILDER_FAKE_LINES": str(lines),
+                         "EXEBUILDER_FAKE_EXE_KB": str(exe_kb)}
+        self.bin_dir = self.workspace / "fake_bin"
+        self.osslsigncode = None
+        self._listener = None
+        self._saved_env = {}
+
+    def __enter__(self):
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        self.osslsigncode = _wrapper(self.bin_dir, "osslsigncode", FAKE_DIR / "osslsigncode.py")
+        _wrapper(self.bin_dir, "openssl", FAKE_DIR / "openssl.py")
+        # EnvironmentManager prüft nur, ob tools/osslsigncode.exe existiert
+        tools = self.workspace / "tools"
+        tools.mkdir(exist_ok=True)
+        shutil.copyfile(self.osslsigncode, tools / "osslsigncode.exe")
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(64)
+        port = self._listener.getsockname()[1]
+
+        pythonpath = os.pathsep.join(filter(None, [str(FAKE_DIR), os.environ.get("PYTHONPATH")]))
+        self._set_env({**self.settings, "PYTHONPATH": pythonpath,
+                       "PATH": os.pathsep.join([str(self.bin_dir), os.environ.get("PATH", "")]),
+                       "EXEBUILDER_PROBE_ENDPOINTS": f"127.0.0.1:{port}"})
+        return self
+
+    def __exit__(self, *exc):
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if self._listener:
+            self._listener.close()
+        return False
+
+    def _set_env(self, values: dict):
+        for key, value in values.items():
+            self._saved_env.setdefault(key, os.environ.get(key))
+            os.environ[key] = value
+
+    def available(self) -> dict:
+        return {"pyinstaller": True, "pip": True, "osslsigncode": True, "openssl": True}
+
+    def describe(self) -> dict:
+        return {"toolchain": self.name, **{k.replace("EXEBUILDER_FAKE_", "").lower(): v for k, v in self.settings.items()}}
+
+
+class RealToolchain:
+    """Die installierten Tools; Fälle ohne passendes Tool werden übersprungen."""
+
+    name = "real"
+
+    def __init__(self, workspace: Path, repo_root: Path):
+        self.workspace = Path(workspace)
+        self.osslsigncode = Path(repo_root) / "tools" / "osslsigncode.exe"
+
+    def __enter__(self):
+        # Vorhandene Tools (inkl. DLLs) in den Workspace, sonst startet EnvironmentManager einen Download
+        if self.osslsigncode.exists():
+            shutil.copytree(self.osslsigncode.parent, self.workspace / "tools", dirs_exist_ok=True)
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def available(self) -> dict:
+        return {
+            "pyinstaller": importlib.util.find_spec("PyInstaller") is not None,
+            "pip": importlib.util.find_spec("pip") is not None,
+            "osslsigncode": self.osslsigncode.exists(),
+            "openssl": shutil.which("openssl") is not None,
+        }
+
+    def describe(self) -> dict:
+        return {"toolchain": self.name, **{k: str(v) for k, v in self.available().items()}}
@@ -1,5 +1,9 @@
 import sys
 import os
+import json
+import getpass
+import argparse
+import statistics
 from pathlib import Path
 from colorama import Fore, Style, init
 
@@ -7,10 +11,17 @@ from colorama import Fore, Style, init
 sys.path.append(str(Path(__file__).parent))
 
 from src.core.orchestrator import BuildOrchestrator
+from src.core.manifest import BatchManifest, BatchRunner
+from src.core.readiness import verify_executable, authenticode_size
+from src.utils.events import EventStream, ExitCode
 from src.utils.helpers import log
 
 init(autoreset=True)
 
+# Alle Stages außer diesen werden beim reinen Signieren übersprungen
+SIGN_STAGES = {"environment:tools", "certificate", "sign"}
+SECRET_KEYS = ("cert_password",)
+
 def get_input(prompt: str, default=None):
     if default:
         user_in = input(f"{Fore.GREEN}{prompt} {Fore.RESET}[{default}]: ").strip()
@@ -18,34 +29,301 @@ def get_input(prompt: str, default=None):
     else:
         return input(f"{Fore.GREEN}{prompt}: {Fore.RESET}").strip()
 
+def run_batch(args) -> int:
+    """Nicht-interaktiver Batch-Modus über ein Manifest (TOML/YAML)."""
+    manifest = BatchManifest.load(Path(args.manifest))
+    runner = BatchRunner(BuildOrchestrator(), manifest, parallel=args.parallel)
+    summary = runner.run()
+    if args.summary:
+        runner.write_summary(summary, Path(args.summary))
+    return 0 if summary["succeeded"] == summary["total"] else 1
+
+# --- Headless-CLI (build / sign / verify / bench) ---
+
+def _parse_value(raw: str):
+    """--set Werte: JSON wenn möglich (true, 3, [..]), sonst String."""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+def load_config(args) -> dict:
+    """Dieselbe Config wie run_full_pipeline: JSON-Datei, danach Flags und --set KEY=VALUE."""
+    config = {"cert_mode": "auto", "cert_name": "MyCert", "use_openssl": False, "console": True, "one_file": True}
+    if args.config:
+        config.update(json.loads(Path(args.config).read_text(encoding="utf-8")))
+    flags = {"script_file": args.script, "app_name": args.app_name, "icon_path": args.icon,
+             "cert_name": args.cert_name, "pfx_path": args.pfx, "password_env": args.password_env}
+    config.update({key: value for key, value in flags.items() if value is not None})
+    if args.pfx:
+        config["cert_mode"] = "file"
+    if args.asset:
+        config["assets"] = list(config.get("assets", [])) + args.asset
+    if args.reproducible:
+        config["reproducible"] = True
+    if args.precompile:
+        config["precompile"] = True
+    if args.optimize is not None:
+        config["optimize"] = args.optimize
+    if args.variant:
+        config["variants"] = [parse_variant(item) for item in args.variant]
+    for item in args.set or []:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"--set erwartet KEY=VALUE, nicht '{item}'")
+        config[key.strip()] = _parse_value(value)
+    # Kein Standard-Passwort: nur aus der Config oder einer Umgebungsvariable
+    if not config.get("cert_password"):
+        config["cert_password"] = os.environ.get(config.get("password_env") or "EXEBUILDER_CERT_PASSWORD", "")
+    return config
+
+def parse_variant(raw: str) -> dict:
+    """--variant NAME[:windowed][:onedir] -> Varianten-Dict für build_variants."""
+    name, *flags = raw.split(":")
+    unknown = set(flags) - {"console", "windowed", "onefile", "onedir"}
+    if not name or unknown:
+        raise ValueError(f"--variant erwartet NAME[:windowed][:onedir], nicht '{raw}'")
+    return {"name": name, "console": "windowed" not in flags, "one_file": "onedir" not in flags}
+
+def public_config(config: dict) -> dict:
+    return {key: ("***" if key in SECRET_KEYS and value else value) for key, value in config.items()}
+
+def emit_run(events: EventStream, run) -> int:
+    """Artefakte, Cache-Treffer und Abschluss eines PipelineRun als Events; liefert den Exit-Code."""
+    code = ExitCode.for_run(run)
+    if run is None:
+        events.emit("error", message="Script nicht gefunden")
+        events.emit("run_end", ok=False, exit_code=code)
+        return code
+    ctx = run.context
+    if ctx.get("signed"):
+        events.artifact("signed_exe", ctx["signed"], signature_bytes=authenticode_size(ctx["signed"]))
+    elif ctx.get("exe"):
+        events.artifact("exe", ctx["exe"])
+    for name, path in (ctx.get("variants") or {}).items():
+        if path != ctx.get("exe"):
+            events.artifact("variant_exe", path, variant=name)
+    if ctx.get("dist"):
+        events.emit("artifact", kind="dist", path=str(Path(ctx["dist"]).resolve()))
+    if ctx.get("delta"):
+        events.artifact("delta", ctx["delta"])
+    if ctx.get("artifact"):
+        events.emit("archive", app=ctx["config"].get("app_name"), version=ctx["artifact"].get("version"),
+                    files=len(ctx["artifact"].get("files", {})))
+    if ctx.get("cache_hits"):
+        events.emit("cache", hits=ctx["cache_hits"])
+    for failed in run.failed:
+        events.emit("error", stage=failed.name, message=str(failed.error))
+    events.emit("run_end", ok=run.ok, exit_code=code, wall_time=round(run.wall_time, 4),
+                critical_path=run.critical_path, critical_path_time=round(run.critical_path_time, 4))
+    return code
+
+def cmd_build(args, events: EventStream, orchestrator: BuildOrchestrator) -> int:
+    config = load_config(args)
+    events.emit("run_start", command="build", app=config.get("app_name"), config=public_config(config))
+    run = orchestrator.run_full_pipeline(config, listeners=[events.stage_listener])
+    variants = run.context.get("variants") if run else None
+    if variants:
+        report = run.context["builder"].reports.get(next(iter(variants)), {})
+        events.emit("variants", names=list(variants), wall_s=report.get("wall_s"), shared_s=report.get("shared_s"),
+                    separate_estimate_s=report.get("separate_estimate_s"), saved_s=report.get("saved_s"))
+    return emit_run(events, run)
+
+def cmd_sign(args, events: EventStream, orchestrator: BuildOrchestrator) -> int:
+    config = load_config(args)
+    exe = Path(args.exe)
+    events.emit("run_start", command="sign", exe=str(exe.resolve()), config=public_config(config))
+    if not exe.is_file():
+        events.emit("error", message=f"Datei nicht gefunden: {exe}")
+        events.emit("run_end", ok=False, exit_code=ExitCode.USAGE)
+        return ExitCode.USAGE
+    scheduler = orchestrator.build_pipeline(config, listeners=[events.stage_listener])
+    skip = set(scheduler.stages) - SIGN_STAGES
+    run = scheduler.run({"config": config, "exe": exe, "cache_hits": {}}, skip=skip)
+    return emit_run(events, run)
+
+def cmd_verify(args, events: EventStream, orchestrator: BuildOrchestrator) -> int:
+    if args.reproducible:
+        config = load_config(args)
+        events.emit("run_start", command="verify", mode="reproducible", config=public_config(config))
+        result = orchestrator.verify_reproducible(config, listeners=[events.stage_listener])
+        code = ExitCode.OK if result.get("reproducible") else ExitCode.VERIFY
+        events.emit("verify", check="reproducible", ok=bool(result.get("reproducible")),
+                    digests=result.get("digests"), difference=result.get("difference"), error=result.get("error"))
+        events.emit("run_end", ok=code == ExitCode.OK, exit_code=code)
+        return code
+
+    if not args.exe:
+        events.emit("error", message="verify braucht --exe oder --reproducible")
+        events.emit("run_end", ok=False, exit_code=ExitCode.USAGE)
+        return ExitCode.USAGE
+    exe = Path(args.exe)
+    events.emit("run_start", command="verify", mode="exe", exe=str(exe.resolve()))
+    if not exe.is_file():
+        events.emit("error", message=f"Datei nicht gefunden: {exe}")
+        events.emit("run_end", ok=False, exit_code=ExitCode.USAGE)
+        return ExitCode.USAGE
+    ok, detail = verify_executable(exe)
+    signature = authenticode_size(exe)
+    record = events.artifact("exe", exe, format=detail if ok else None, signature_bytes=signature)
+    checks = {"structure": ok}
+    if args.require_signature:
+        checks["signature"] = signature > 0
+    if args.sha256:
+        checks["sha256"] = record["sha256"] == args.sha256.lower()
+    passed = all(checks.values())
+    events.emit("verify", check="exe", ok=passed, checks=checks, detail=detail)
+    code = ExitCode.OK if passed else ExitCode.VERIFY
+    events.emit("run_end", ok=passed, exit_code=code)
+    return code
+
+def cmd_bench(args, events: EventStream, orchestrator: BuildOrchestrator) -> int:
+    """Baut N-mal und meldet Median/Min/Max pro Stage und Wall-Time; optional gegen eine Baseline."""
+    config = load_config(args)
+    events.emit("run_start", command="bench", runs=args.runs, config=public_config(config))
+    samples = {}
+    for i in range(args.runs):
+        run = orchestrator.run_full_pipeline(config, listeners=[events.stage_listener])
+        code = ExitCode.for_run(run)
+        if code != ExitCode.OK:
+            emit_run(events, run)
+            return code
+        samples.setdefault("wall_time", []).append(run.wall_time)
+        for result in run.results.values():
+            samples.setdefault(result.name, []).append(result.duration)
+        events.emit("bench_iteration", iteration=i + 1, wall_time=round(run.wall_time, 4),
+                    cache_hits=run.context.get("cache_hits", {}))
+
+    stats = {name: {"median": round(statistics.median(values), 4), "min": round(min(values), 4),
+                    "max": round(max(values), 4)} for name, values in samples.items()}
+    regressions = []
+    if args.baseline and Path(args.baseline).exists() and not args.update_baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")).get("stats", {})
+        for name, values in stats.items():
+            base = baseline.get(name, {}).get("median")
+            if base and values["median"] > base * (1 + args.threshold) and values["median"] - base > 0.05:
+                regressions.append({"name": name, "median": values["median"], "baseline": base})
+    events.emit("bench_result", runs=args.runs, stats=stats, regressions=regressions)
+    if args.baseline and args.update_baseline:
+        Path(args.baseline).write_text(json.dumps({"runs": args.runs, "stats": stats}, indent=2), encoding="utf-8")
+        events.emit("baseline", path=str(Path(args.baseline).resolve()))
+    code = ExitCode.REGRESSION if regressions else ExitCode.OK
+    events.emit("run_end", ok=not regressions, exit_code=code)
+    return code
+
+COMMANDS = {"build": cmd_build, "sign": cmd_sign, "verify": cmd_verify, "bench": cmd_bench}
+
+# Einzige Definition von --reproducible: interaktiv, vor und nach dem Subcommand gültig. SUPPRESS, damit
+# der Subparser ein "--reproducible build" nicht mit seinem Standardwert überschreibt
+REPRODUCIBLE = argparse.ArgumentParser(add_help=False)
+REPRODUCIBLE.add_argument("--reproducible", action="store_true", default=argparse.SUPPRESS,
+                          help="Deterministischer Build (SOURCE_DATE_EPOCH, PYTHONHASHSEED)")
+
+def add_headless_commands(parser: argparse.ArgumentParser):
+    common = argparse.ArgumentParser(add_help=False, parents=[REPRODUCIBLE])
+    common.add_argument("--config", help="JSON-Datei mit der Pipeline-Config (wie run_full_pipeline)")
+    common.add_argument("--script", help="Start-Script (script_file)")
+    common.add_argument("--app-name")
+    common.add_argument("--icon")
+    common.add_argument("--asset", action="append", help="Zusatz-Datei/-Ordner (mehrfach möglich)")
+    common.add_argument("--cert-name")
+    common.add_argument("--pfx", help="Vorhandene .pfx nutzen (cert_mode=file)")
+    common.add_argument("--password-env", help="Umgebungsvariable mit dem Zertifikats-Passwort "
+                                               "(Standard: EXEBUILDER_CERT_PASSWORD)")
+    common.add_argument("--set", action="append", metavar="KEY=VALUE", help="Beliebiger Config-Schlüssel")
+    common.add_argument("--variant", action="append", metavar="NAME[:windowed][:onedir]",
+                        help="Weitere Variante aus derselben Analyse (mehrfach möglich, erste = Haupt-EXE)")
+    common.add_argument("--precompile", action="store_true",
+                        help="Projekt + Dependencies vorab parallel kompilieren (geteilter pyc-Cache)")
+    common.add_argument("--optimize", type=int, choices=(0, 1, 2), help="Bytecode-Optimierung wie -O / -OO")
+    common.add_argument("--events", default="-", help="NDJSON-Events nach Datei statt stdout ('-')")
+    common.add_argument("--run-id", help="ID für alle Events dieses Aufrufs (Standard: zufällig)")
+
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("build", parents=[common], help="Build + Signatur + Paket (nicht interaktiv)")
+    p_sign = sub.add_parser("sign", parents=[common], help="Vorhandene EXE signieren")
+    p_sign.add_argument("--exe", required=True)
+    p_verify = sub.add_parser("verify", parents=[common], help="EXE prüfen oder Reproduzierbarkeit verifizieren")
+    p_verify.add_argument("--exe")
+    p_verify.add_argument("--sha256", help="Erwarteter Digest")
+    p_verify.add_argument("--require-signature", action="store_true", help="Authenticode-Signatur muss vorhanden sein")
+    p_bench = sub.add_parser("bench", parents=[common], help="Wiederholte Builds mit Stage-Statistik")
+    p_bench.add_argument("--runs", type=int, default=3)
+    p_bench.add_argument("--baseline", help="Baseline-JSON zum Vergleichen")
+    p_bench.add_argument("--update-baseline", action="store_true")
+    p_bench.add_argument("--threshold", type=float, default=0.2, help="Erlaubte Verschlechterung (0.2 = 20%%)")
+
+def run_headless(args) -> int:
+    events = EventStream.open(args.events, args.run_id)
+    try:
+        return COMMANDS[args.command](args, events, BuildOrchestrator())
+    except (OSError, ValueError) as e:
+        # Config nicht lesbar / ungültig
+        events.emit("error", message=f"{type(e).__name__}: {e}")
+        events.emit("run_end", ok=False, exit_code=ExitCode.USAGE)
+        return ExitCode.USAGE
+    except KeyboardInterrupt:
+        events.emit("run_end", ok=False, exit_code=ExitCode.INTERRUPTED)
+        return ExitCode.INTERRUPTED
+    except Exception as e:
+        events.emit("error", message=f"{type(e).__name__}: {e}")
+        events.emit("run_end", ok=False, exit_code=ExitCode.FAILED)
+        return ExitCode.FAILED
+    finally:
+        log.flush()
+        events.close()
+
 def main():
+    parser = argparse.ArgumentParser(description="EXE Builder CLI", parents=[REPRODUCIBLE])
+    parser.add_argument("--manifest", help="Batch-Manifest (.toml/.yaml) mit mehreren Apps")
+    parser.add_argument("--parallel", type=int, default=None, help="Anzahl paralleler Builds (überschreibt Manifest)")
+    parser.add_argument("--summary", help="Zusammenfassung zusätzlich als JSON schreiben")
+    parser.add_argument("--watch", action="store_true", help="Nach dem Build auf Änderungen warten und inkrementell neu bauen")
+    parser.add_argument("--verify-reproducible", action="store_true", help="Zweimal bauen und die Digests vergleichen")
+    add_headless_commands(parser)
+    args = parser.parse_args()
+    # Nicht set_defaults(): das würde den Standard der geteilten Action (auch im Subparser) überschreiben
+    args.reproducible = getattr(args, "reproducible", False)
+
+    if args.command:
+        sys.exit(run_headless(args))
+
+    if args.manifest:
+        sys.exit(run_batch(args))
+
+    if not sys.stdin.isatty():
+        # Ohne Terminal nie auf Eingaben warten (CI): Subcommand benutzen
+        parser.print_help(sys.stderr)
+        sys.exit(ExitCode.USAGE)
+
     orchestrator = BuildOrchestrator()
-    
+
     print(f"{Fore.CYAN}### EXE BUILDER CLI - PROFESSIONAL ###{Style.RESET_ALL}")
     print("1. Build & Sign")
     print("2. Exit")
-    
+
     if get_input("Auswahl", "1") == "1":
         script = get_input("Python Script", "main.py")
         app_name = get_input("App Name", "MyTool")
-        
+
         # Cert Mode Auswahl
         print("\n[Zertifikat Modus]")
         print("1 = Neu erstellen oder Cache nutzen (nach Name)")
         print("2 = Vorhandene .pfx Datei nutzen")
         mode_sel = get_input("Wähle", "1")
-        
+
         cert_mode = "auto" if mode_sel == "1" else "file"
         pfx_path = ""
         cert_name = ""
-        
+
         if cert_mode == "file":
             pfx_path = get_input("Pfad zur .pfx Datei")
         else:
             cert_name = get_input("Zertifikats-Name (ID)", "MyCert")
 
-        pwd = get_input("Passwort", "123456")
-        
+        # Kein Standard-Passwort mehr; verdeckte Eingabe
+        pwd = getpass.getpass(f"{Fore.GREEN}Passwort: {Fore.RESET}")
+
         config = {
             "script_file": script,
             "app_name": app_name,
@@ -55,10 +333,17 @@ def main():
             "cert_password": pwd,
             "use_openssl": False, # Im CLI standardmäßig aus für Einfachheit
             "console": True,
-            "one_file": True
+            "one_file": True,
+            "reproducible": args.reproducible
         }
-        
-        orchestrator.run_full_pipeline(config)
+
+        if args.verify_reproducible:
+            result = orchestrator.verify_reproducible(config)
+            sys.exit(0 if result["reproducible"] else 1)
+        if args.watch:
+            orchestrator.watch(config)
+        else:
+            orchestrator.run_full_pipeline(config)
 
 if __name__ == "__main__":
     main()
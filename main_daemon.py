@@ -0,0 +1,62 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Pfad-Fix
+sys.path.append(str(Path(__file__).parent))
+
+from src.core.daemon import BuildDaemon, DaemonClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ExeBuilder Build-Daemon (Warme Worker + Job-Queue)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Daemon starten")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--socket", help="Unix-Socket statt TCP")
+    p_serve.add_argument("--workers", type=int, default=2, help="Anzahl warmer Worker = max. parallele Jobs")
+    p_serve.add_argument("--no-warm", action="store_true", help="PyInstaller nicht vorladen")
+
+    p_submit = sub.add_parser("submit", help="Job einreichen")
+    p_submit.add_argument("config", help="JSON-Datei mit der Pipeline-Config")
+    p_submit.add_argument("--priority", type=int, default=0)
+    p_submit.add_argument("--follow", action="store_true", help="Log streamen bis der Job fertig ist")
+
+    p_status = sub.add_parser("status", help="Job-Status (ohne ID: alle Jobs)")
+    p_status.add_argument("job_id", nargs="?")
+
+    p_cancel = sub.add_parser("cancel", help="Job abbrechen")
+    p_cancel.add_argument("job_id")
+
+    for p in (p_submit, p_status, p_cancel):
+        p.add_argument("--url", default="http://127.0.0.1:8765", help="http://host:port oder unix:///pfad")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        BuildDaemon(workers=args.workers, warm=not args.no_warm).serve(args.host, args.port, args.socket)
+        return 0
+
+    client = DaemonClient(args.url)
+    if args.command == "submit":
+        config = json.loads(Path(args.config).read_text(encoding="utf-8"))
+        job = client.submit(config, args.priority)
+        print(job["id"])
+        if args.follow:
+            for line in client.stream_log(job["id"]):
+                print(line)
+            job = client.status(job["id"])
+            print(json.dumps(job, indent=2))
+            return 0 if job["status"] == "done" else 1
+    elif args.command == "status":
+        print(json.dumps(client.status(args.job_id) if args.job_id else client.jobs(), indent=2))
+    elif args.command == "cancel":
+        print(json.dumps(client.cancel(args.job_id)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
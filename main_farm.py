@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import time
+import secrets
+import argparse
+import subprocess
+from pathlib import Path
+
+# Pfad-Fix
+sys.path.append(str(Path(__file__).parent))
+
+from src.core.farm import FarmCoordinator, FarmWorker, FarmClient, TOKEN_ENV
+from src.core.manifest import BatchManifest, BatchRunner, ManifestError
+from src.utils.helpers import log
+
+
+def _load_configs(args) -> list:
+    """Configs aus Manifest (.toml/.yaml) oder einer einzelnen JSON-Config."""
+    if args.manifest:
+        return BatchManifest.load(Path(args.manifest)).apps
+    return [json.loads(Path(args.config).read_text(encoding="utf-8"))]
+
+
+def _run_release(coordinator: FarmCoordinator, configs: list, priority: int, summary_path: str,
+                 timeout: float = None) -> int:
+    jobs = [coordinator.submit(config, priority) for config in configs]
+    if not coordinator.wait([job.id for job in jobs], timeout):
+        open_jobs = [job for job in jobs if not job.is_finished]
+        log.error(f"Zeitlimit ({timeout:.0f}s) erreicht, {len(open_jobs)} Job(s) nicht fertig - werden abgebrochen.")
+        for job in open_jobs:
+            coordinator.cancel(job.id)
+    summary = coordinator.summary()
+    BatchRunner.log_summary(summary)
+    for node in summary["nodes"]:
+        log.info(f" Knoten {node['name']:<16} {node['completed']} ok, {node['failed']} fehlgeschlagen, "
+                 f"{node['stolen']} gestohlen, Faktor {node['speed_factor']}")
+    if summary_path:
+        BatchRunner.write_summary(summary, Path(summary_path))
+    return 0 if summary["succeeded"] == summary["total"] else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ExeBuilder Build-Farm (Koordinator + Knoten)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_coord = sub.add_parser("coordinator", help="Koordinator starten")
+    p_coord.add_argument("--host", default="127.0.0.1")
+    p_coord.add_argument("--port", type=int, default=8790)
+    p_coord.add_argument("--heartbeat-timeout", type=float, default=15.0)
+    p_coord.add_argument("--max-attempts", type=int, default=3)
+
+    p_worker = sub.add_parser("worker", help="Build-Knoten starten")
+    p_worker.add_argument("--name", help="Knotenname (Standard: Hostname)")
+    p_worker.add_argument("--slots", type=int, default=1, help="Parallele Builds auf diesem Knoten")
+    p_worker.add_argument("--no-warm", action="store_true", help="PyInstaller nicht vorladen")
+
+    p_local = sub.add_parser("local", help="Koordinator + N lokale Knoten-Prozesse (Test/Einzelmaschine)")
+    p_local.add_argument("--nodes", type=int, default=3)
+    p_local.add_argument("--slots", type=int, default=1)
+    p_local.add_argument("--port", type=int, default=0)
+    p_local.add_argument("--timeout", type=float, default=6 * 3600, help="Zeitlimit für den gesamten Lauf (Sekunden)")
+
+    p_submit = sub.add_parser("submit", help="Jobs einreichen")
+
+    for p in (p_submit, p_local):
+        source = p.add_mutually_exclusive_group(required=True)
+        source.add_argument("--manifest", help="Batch-Manifest mit mehreren Apps")
+        source.add_argument("--config", help="JSON-Datei mit einer Pipeline-Config")
+        p.add_argument("--priority", type=int, default=0)
+        p.add_argument("--summary", help="Zusammenfassung als JSON schreiben")
+
+    p_status = sub.add_parser("status", help="Jobs, Knoten oder Zusammenfassung anzeigen")
+    p_status.add_argument("what", choices=["jobs", "nodes", "summary"], nargs="?", default="jobs")
+
+    for p in (p_coord, p_local):
+        p.add_argument("--job-timeout", type=float, default=3600.0,
+                       help="Laufende Jobs ohne Ergebnis nach so vielen Sekunden neu einplanen")
+    for p in (p_worker, p_submit, p_status):
+        p.add_argument("--url", default="http://127.0.0.1:8790", help="Adresse des Koordinators")
+    for p in (p_coord, p_worker, p_submit, p_status):
+        p.add_argument("--token", default=os.environ.get(TOKEN_ENV),
+                       help=f"Gemeinsames Farm-Token (Standard: {TOKEN_ENV})")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "coordinator":
+            coordinator = FarmCoordinator(heartbeat_timeout=args.heartbeat_timeout, max_attempts=args.max_attempts,
+                                          token=args.token, result_timeout=args.job_timeout)
+            try:
+                coordinator.start(args.host, args.port)
+            except ValueError as e:
+                log.error(str(e))
+                return 2
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                log.info("Koordinator wird beendet...")
+            finally:
+                coordinator.shutdown()
+            return 0
+
+        if args.command == "worker":
+            FarmWorker(args.url, args.name, args.slots, warm=not args.no_warm, token=args.token).run()
+            return 0
+
+        if args.command == "local":
+            configs = _load_configs(args)
+            # Einmal-Token nur für diesen Lauf; Knoten bekommen es über die Umgebung, nicht die Kommandozeile
+            token = os.environ.get(TOKEN_ENV) or secrets.token_urlsafe(32)
+            coordinator = FarmCoordinator(token=token, result_timeout=args.job_timeout)
+            host, port = coordinator.start("127.0.0.1", args.port)
+            url = f"http://{host}:{port}"
+            workers = [subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "worker", "--url", url,
+                                         "--name", f"local-{i + 1}", "--slots", str(args.slots)],
+                                        env={**os.environ, TOKEN_ENV: token})
+                       for i in range(args.nodes)]
+            try:
+                return _run_release(coordinator, configs, args.priority, args.summary, args.timeout)
+            finally:
+                for proc in workers:
+                    proc.terminate()
+                for proc in workers:
+                    proc.wait(10)
+                coordinator.shutdown()
+
+        client = FarmClient(args.url, token=args.token)
+        if args.command == "submit":
+            for config in _load_configs(args):
+                job = client.submit(config, args.priority)
+                print(f"{job['id']}  {job['app_name']}")
+        elif args.command == "status":
+            data = {"jobs": client.jobs, "nodes": client.nodes, "summary": client.summary}[args.what]()
+            print(json.dumps(data, indent=2))
+        return 0
+    except ManifestError as e:
+        log.error(f"Manifest ungültig: {e}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,61 +1,61 @@
-import sys
+import time
+_STARTED = time.perf_counter()
+
 import os
-import subprocess
+import sys
+import json
 from pathlib import Path
 import tkinter as tk
-from tkinter import messagebox
 
 # Pfad-Fix für Importe
 sys.path.append(str(Path(__file__).parent))
 
-from src.core.environment import EnvironmentManager
 from src.utils.helpers import log
 
-def restart_script():
-    """Startet das Script neu, damit frisch installierte Module geladen werden können."""
-    log.info("Starte Anwendung neu, um Änderungen zu übernehmen...")
-    python = sys.executable
-    os.execl(python, python, *sys.argv)
+# Startup-Benchmark (benchmarks/startup.py): Zeit bis zum ersten sichtbaren Fenster ausgeben und beenden
+STARTUP_PROBE = os.environ.get("EXEBUILDER_STARTUP_PROBE") == "1"
 
-if __name__ == "__main__":
-    # 1. ZWINGENDER Environment Check vor dem GUI Start
-    # Das hier läuft jetzt immer als erstes.
-    try:
-        env = EnvironmentManager()
-        project_root = Path(__file__).parent
-        
-        # Prüft requirements.txt und installiert fehlendes (inkl. Ping Loop)
-        # Wenn hier etwas installiert wird, ist ein Neustart oft sicherer
-        env.prepare_environment(project_root)
-        
-    except Exception as e:
-        log.error(f"Kritischer Fehler beim Environment-Setup: {e}")
-        print("Drücken Sie Enter zum Beenden...")
-        input()
-        sys.exit(1)
 
-    # 2. Import der Drag & Drop Lib (jetzt sicher vorhanden)
+def create_root():
+    """Tk-Root mit Drag & Drop, falls tkinterdnd2 bereits installiert ist – sonst normales Tk (kein Neustart mehr)."""
     try:
         from tkinterdnd2 import TkinterDnD
+        return TkinterDnD.Tk(), True
     except ImportError:
-        log.warning("Modul 'tkinterdnd2' wurde installiert, konnte aber nicht sofort geladen werden.")
-        restart_script()
+        log.info("Modul 'tkinterdnd2' fehlt noch. Drag & Drop wird nach der Umgebungsprüfung aktiviert.")
+    except tk.TclError as e:
+        log.warning(f"tkdnd konnte nicht geladen werden: {e}")
+    return tk.Tk(), False
+
 
-    # 3. GUI Start
-    # Wir importieren die GUI erst jetzt, damit alle Libs sicher da sind
+def report_startup(root):
+    """Wird aufgerufen, sobald das Fenster gezeichnet ist."""
+    root.update_idletasks()
+    print(json.dumps({"event": "window_shown", "seconds": round(time.perf_counter() - _STARTED, 4),
+                      "modules": len(sys.modules)}), flush=True)
+    root.destroy()
+
+
+def main() -> int:
     try:
+        root, dnd_enabled = create_root()
         from src.ui.gui import AppGUI
-        
-        # Wir nutzen jetzt direkt TkinterDnD.Tk als Root
-        root = TkinterDnD.Tk()
-        
-        # Übergeben dnd_enabled=True hart, da wir es jetzt erzwingen
-        app = AppGUI(root, dnd_enabled=True)
-        
-        root.mainloop()
-        
+        app = AppGUI(root, dnd_enabled=dnd_enabled)
     except Exception as e:
         log.error(f"Fehler beim Starten der GUI: {e}")
-        print("Drücken Sie Enter zum Beenden...")
-        input()
-        sys.exit(1)
+        if not STARTUP_PROBE:
+            print("Drücken Sie Enter zum Beenden...")
+            input()
+        return 1
+
+    if STARTUP_PROBE:
+        root.after_idle(lambda: report_startup(root))
+    else:
+        # Erst das Fenster, dann Environment (Netzwerk-Probe, winget, Downloads, pip) im Hintergrund
+        root.after_idle(lambda: app.prepare_environment(Path(__file__).parent))
+    root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from src.core.assets import ContentStore, file_digest, link_or_copy
+from src.utils.helpers import log
+
+
+class _FileLock:
+    """Prozessübergreifende Sperre für den Index (Daemon-Worker, parallele CLI-Aufrufe)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._f = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a+b")
+        if sys.platform == "win32":
+            import msvcrt
+            self._f.seek(0)
+            msvcrt.locking(self._f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                self._f.seek(0)
+                msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._f.close()
+            self._thread_lock.release()
+        return False
+
+
+class ArtifactStore:
+    """
+    Inhaltsadressiertes Lager für signierte Artefakte samt Begleitdateien (.cer, install_cert.bat, Anleitung).
+    Index: builds/artifacts/index.json mit Einträgen pro App und Version; Dateien liegen dedupliziert
+    unter objects/<aa>/<sha256>. Ein Größenbudget wird per Alter + LRU durchgesetzt, gepinnte
+    Releases und die jeweils neueste Version einer App werden nie entfernt.
+    """
+
+    DEFAULT_BUDGET_MB = 5 * 1024
+
+    def __init__(self, root: Path = Path("builds") / "artifacts", max_bytes: int = None, max_age_days: float = None):
+        self.root = root
+        self.objects = ContentStore(root / "objects")
+        self.index_file = root / "index.json"
+        self._lock = _FileLock(root / ".lock")
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("EXEBUILDER_ARTIFACT_BUDGET_MB", self.DEFAULT_BUDGET_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._index = None
+        self._index_mtime = None
+
+    # --- Index ---
+
+    def _load(self) -> dict:
+        """Index lesen; nur neu parsen, wenn die Datei sich geändert hat (schnelles latest())."""
+        try:
+            mtime = self.index_file.stat().st_mtime_ns
+        except OSError:
+            return {"apps": {}, "objects": {}}
+        if self._index is None or mtime != self._index_mtime:
+            try:
+                self._index = json.loads(self.index_file.read_text(encoding="utf-8"))
+                self._index_mtime = mtime
+            except ValueError:
+                log.warning(f"Artefakt-Index beschädigt, starte leer: {self.index_file}")
+                self._index = {"apps": {}, "objects": {}}
+        return self._index
+
+    def _save(self, index: dict):
+        tmp = self.index_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, indent=1), encoding="utf-8")
+        os.replace(tmp, self.index_file)
+        self._index = index
+        self._index_mtime = self.index_file.stat().st_mtime_ns
+
+    # --- Schreiben ---
+
+    def add(self, app: str, files: dict, version: str = None, pinned: bool = False, metadata: dict = None) -> dict:
+        """
+        Legt ein Artefakt-Set ab. 'files' = {Name im Paket: Pfad}. Ist der Inhalt identisch mit der
+        neuesten Version der App, wird kein neuer Eintrag angelegt.
+        """
+        # Hashen ohne Sperre; Ablegen und Index-Eintrag in einem kritischen Abschnitt, sonst kann
+        # eine parallele GC ein gerade abgelegtes, noch nicht indiziertes Objekt löschen
+        digests = {}
+        for name, path in files.items():
+            path = Path(path)
+            if path.is_file():
+                digests[name] = (file_digest(path), path.stat().st_size, path)
+
+        now = time.time()
+        with self._lock:
+            for digest, _, path in digests.values():
+                self.objects.ingest(path, digest)
+            index = self._load()
+            entries = index["apps"].setdefault(app, [])
+            latest = entries[-1] if entries else None
+            if latest and {n: d for n, (d, _, _) in digests.items()} == latest["files"]:
+                latest["last_access"] = now
+                latest["pinned"] = latest["pinned"] or pinned
+                self._save(index)
+                log.info(f"Artefakt {app} {latest['version']} unverändert (dedupliziert).")
+                return latest
+
+            entry = {
+                "version": version or time.strftime("%Y%m%d-%H%M%S", time.localtime(now)),
+                "created": now,
+                "last_access": now,
+                "pinned": pinned,
+                "files": {n: d for n, (d, _, _) in digests.items()},
+                "metadata": metadata or {},
+            }
+            if any(e["version"] == entry["version"] for e in entries):
+                entry["version"] += f"-{len(entries)}"
+            entries.append(entry)
+            for digest, size, _ in digests.values():
+                index["objects"][digest] = size
+
+            evicted = self._enforce(index)
+            self._save(index)
+
+        self._collect_garbage()
+        log.success(f"Artefakt archiviert: {app} {entry['version']} ({len(digests)} Dateien)"
+                    + (f", {evicted} alte Versionen entfernt" if evicted else ""))
+        return entry
+
+    def pin(self, app: str, version: str, pinned: bool = True) -> bool:
+        with self._lock:
+            index = self._load()
+            entry = self._find(index, app, version)
+            if entry is None:
+                return False
+            entry["pinned"] = pinned
+            self._save(index)
+        return True
+
+    def _find(self, index: dict, app: str, version: str = None):
+        entries = index["apps"].get(app) or []
+        if version is None:
+            return entries[-1] if entries else None
+        return next((e for e in entries if e["version"] == version), None)
+
+    # --- Lesen ---
+
+    def latest(self, app: str):
+        """Neuester Eintrag einer App (ohne Schreibzugriff, Index wird nur bei Änderung neu geladen)."""
+        return self._find(self._load(), app)
+
+    def get(self, app: str, version: str):
+        return self._find(self._load(), app, version)
+
+    def list(self, app: str = None) -> dict:
+        apps = self._load()["apps"]
+        return {app: apps.get(app, [])} if app else apps
+
+    def path_of(self, digest: str) -> Path:
+        return self.objects.object_path(digest)
+
+    def materialize(self, app: str, dest: Path, version: str = None) -> Path:
+        """
+        Stellt eine Version als Ordner wieder her (Reflink, sonst Kopie) und zählt als Zugriff (LRU).
+        Keine Hardlinks: Änderungen an der exportierten Datei würden sonst das Lager verändern.
+        """
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            index = self._load()
+            entry = self._find(index, app, version)
+            if entry is None:
+                raise KeyError(f"Kein Artefakt für {app} {version or '(latest)'}")
+            entry["last_access"] = time.time()
+            self._save(index)
+            for name, digest in entry["files"].items():
+                target = dest / name
+                if target.exists():
+                    target.unlink()
+                link_or_copy(self.path_of(digest), target, allow_hardlink=False)
+        return dest
+
+    # --- Retention ---
+
+    def total_size(self, index: dict = None) -> int:
+        index = index or self._load()
+        live = {d for entries in index["apps"].values() for e in entries for d in e["files"].values()}
+        return sum(index["objects"].get(d, 0) for d in live)
+
+    def _enforce(self, index: dict) -> int:
+        """Entfernt Einträge nach Alter, dann nach LRU, bis das Budget passt. Rückgabe: Anzahl entfernter Einträge."""
+        evicted = 0
+        protected = {id(entries[-1]) for entries in index["apps"].values() if entries}
+
+        def removable():
+            return [(app, e) for app, entries in index["apps"].items() for e in entries
+                    if not e["pinned"] and id(e) not in protected]
+
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            for app, entry in removable():
+                if entry["created"] < cutoff:
+                    index["apps"][app].remove(entry)
+                    evicted += 1
+
+        if self.max_bytes:
+            candidates = sorted(removable(), key=lambda item: item[1]["last_access"])
+            size = self.total_size(index)
+            for app, entry in candidates:
+                if size <= self.max_bytes:
+                    break
+                index["apps"][app].remove(entry)
+                evicted += 1
+                size = self.total_size(index)
+            if size > self.max_bytes:
+                log.warning(f"Artefakt-Budget überschritten ({size / 1024 / 1024:.0f} MB), "
+                            f"nur noch gepinnte/neueste Versionen übrig.")
+
+        # Objekte ohne Referenz aus dem Index nehmen (Dateien löscht _collect_garbage)
+        live = {d for entries in index["apps"].values() for e in entries for d in e["files"].values()}
+        for digest in [d for d in index["objects"] if d not in live]:
+            del index["objects"][digest]
+        return evicted
+
+    def _collect_garbage(self):
+        with self._lock:
+            known = set(self._load()["objects"])
+            for bucket in self.objects.root.iterdir():
+                if not bucket.is_dir():
+                    continue
+                for obj in bucket.iterdir():
+                    if obj.name not in known and not obj.name.endswith(".tmp"):
+                        try:
+                            obj.unlink()
+                        except OSError:
+                            pass
+
+    def enforce(self) -> int:
+        with self._lock:
+            index = self._load()
+            evicted = self._enforce(index)
+            self._save(index)
+        self._collect_garbage()
+        return evicted
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Artefakt-Lager (builds/artifacts)")
+    parser.add_argument("--root", default=str(Path("builds") / "artifacts"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_list = sub.add_parser("list")
+    p_list.add_argument("app", nargs="?")
+    p_latest = sub.add_parser("latest")
+    p_latest.add_argument("app")
+    for name in ("pin", "unpin"):
+        p = sub.add_parser(name)
+        p.add_argument("app")
+        p.add_argument("version")
+    p_export = sub.add_parser("export", help="Version in einen Ordner auspacken")
+    p_export.add_argument("app")
+    p_export.add_argument("dest")
+    p_export.add_argument("--version")
+    sub.add_parser("gc", help="Budget/Alter durchsetzen")
+    args = parser.parse_args(argv)
+
+    store = ArtifactStore(Path(args.root))
+    if args.command == "list":
+        print(json.dumps(store.list(args.app), indent=2))
+    elif args.command == "latest":
+        entry = store.latest(args.app)
+        if entry is None:
+            return 1
+        print(json.dumps(entry, indent=2))
+    elif args.command in ("pin", "unpin"):
+        return 0 if store.pin(args.app, args.version, args.command == "pin") else 1
+    elif args.command == "export":
+        print(store.materialize(args.app, Path(args.dest), args.version))
+    elif args.command == "gc":
+        print(f"{store.enforce()} Einträge entfernt, {store.total_size() / 1024 / 1024:.1f} MB belegt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
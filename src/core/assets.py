@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.helpers import log
+
+_CHUNK = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-Write Klon (Btrfs/XFS via FICLONE). Gibt False zurück, wenn das Dateisystem es nicht kann."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    FICLONE = 0x40049409
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        try:
+            dst.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def link_or_copy(src: Path, dst: Path, allow_hardlink: bool = True) -> str:
+    """Hardlink > Reflink > Kopie. Rückgabe: verwendete Methode."""
+    if allow_hardlink:
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    if _reflink(src, dst):
+        return "reflink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+class FileHashCache:
+    """Persistenter Hash-Cache: (Pfad, mtime, Größe) -> sha256. Unveränderte Dateien werden nie erneut gelesen."""
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._entries = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def lookup(self, path: Path, st: os.stat_result):
+        entry = self._entries.get(str(path))
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+        return None
+
+    def store(self, path: Path, st: os.stat_result, digest: str):
+        with self._lock:
+            self._entries[str(path)] = [st.st_mtime_ns, st.st_size, digest]
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(tmp, self.cache_file)
+            self._dirty = False
+
+
+class ContentStore:
+    """Dedupliziertes Objekt-Lager: Jeder Inhalt liegt genau einmal unter cas/<aa>/<sha256>."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def ingest(self, src: Path, digest: str) -> bool:
+        """Übernimmt 'src' ins Lager. False, wenn der Inhalt bereits vorhanden war."""
+        target = self.object_path(digest)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        # Kein Hardlink auf die Quelle: Späteres Editieren der Quelle würde sonst das Lager verändern
+        link_or_copy(src, tmp, allow_hardlink=False)
+        os.replace(tmp, target)
+        return True
+
+
+class AssetStager:
+    """
+    Staging-Schicht für Assets.
+    Hasht Asset-Bäume parallel (mit persistentem Hash-Cache), legt Inhalte dedupliziert im
+    ContentStore ab und baut daraus hardgelinkte Staging-Verzeichnisse; identische Bäume teilen sich
+    eines. Große Bäume eines onedir-Builds legt link_tree() nach PyInstaller direkt in den dist-Ordner
+    (kein Kopieren durch PyInstaller); für --add-data liefert das Staging feste Zeitstempel
+    (reproduzierbare Builds), ohne die Originale anzufassen.
+    """
+
+    def __init__(self, cache_dir: Path = Path("builds") / "cache", staging_dir: Path = Path("builds") / "staging",
+                 workers: int = None):
+        self.store = ContentStore(cache_dir / "cas")
+        self.hash_cache = FileHashCache(cache_dir / "asset_hashes.json")
+        self.staging_dir = staging_dir.absolute()  # PyInstaller läuft ggf. in einem anderen cwd
+        self.workers = workers or min(32, (os.cpu_count() or 4) * 2)
+
+    def _list_files(self, asset: Path) -> list:
+        """[(absoluter Pfad, relativer Pfad)] sortiert, damit der Baum-Digest stabil ist."""
+        if asset.is_file():
+            return [(asset, asset.name)]
+        files = []
+        for root, dirs, names in os.walk(asset):
+            dirs.sort()
+            for name in sorted(names):
+                full = Path(root) / name
+                files.append((full, full.relative_to(asset).as_posix()))
+        return files
+
+    def _hash(self, path: Path) -> tuple[str, bool]:
+        st = path.stat()
+        digest = self.hash_cache.lookup(path, st)
+        if digest is not None:
+            return digest, True
+        digest = file_digest(path)
+        self.hash_cache.store(path, st, digest)
+        return digest, False
+
+    def stage(self, assets: list, mtime: int = None) -> tuple:
+        """
+        Rückgabe: ({Original-Pfad: Staging-Pfad}, Statistik dieses Aufrufs). Nicht existierende Assets
+        werden unverändert durchgereicht. 'mtime' setzt alle Zeitstempel im Staging auf einen festen Wert.
+        """
+        start = time.perf_counter()
+        stats = {"files": 0, "hash_cache_hits": 0, "new_objects": 0, "reused_trees": 0, "staged_trees": 0}
+        mapping = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asset-hash") as pool:
+            for item in assets:
+                src = Path(item)
+                if not src.exists():
+                    mapping[item] = item
+                    continue
+                files = self._list_files(src.resolve())
+                hashes = list(pool.map(lambda f: self._hash(f[0]), files))
+                stats["files"] += len(files)
+                stats["hash_cache_hits"] += sum(1 for _, hit in hashes if hit)
+
+                entries = [(rel, digest, full) for (full, rel), (digest, _) in zip(files, hashes)]
+                staged = self._materialize(src, entries, pool, stats)
+                if mtime is not None:
+                    from src.core.reproducible import normalize_tree_times
+                    normalize_tree_times(staged, mtime)
+                mapping[item] = str(staged)
+
+        self.hash_cache.save()
+        log.debug(f"Asset-Staging in {time.perf_counter() - start:.3f}s: {stats}")
+        return mapping, stats
+
+    def _materialize(self, src: Path, entries: list, pool, stats: dict) -> Path:
+        tree_hash = hashlib.sha256()
+        tree_hash.update(b"file" if src.is_file() else b"dir")
+        for rel, digest, _ in entries:
+            tree_hash.update(f"{rel}\0{digest}\n".encode("utf-8"))
+        tree_id = tree_hash.hexdigest()[:24]
+
+        tree_root = self.staging_dir / tree_id
+        staged = tree_root / src.name
+        marker = tree_root / ".complete"
+        if marker.exists():
+            stats["reused_trees"] += 1
+            os.utime(marker)  # für prune()
+            return staged
+
+        # Neue Inhalte ins Lager (nur fehlende Objekte werden kopiert)
+        new = pool.map(lambda e: self.store.ingest(e[2], e[1]), entries)
+        stats["new_objects"] += sum(1 for n in new if n)
+
+        tmp_root = self.staging_dir / f"{tree_id}.{os.getpid()}.tmp"
+        if tmp_root.exists():
+            shutil.rmtree(tmp_root)
+        tmp_staged = tmp_root / src.name
+        for rel, digest, _ in entries:
+            target = tmp_root / rel if src.is_file() else tmp_staged / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            link_or_copy(self.store.object_path(digest), target)
+        if src.is_dir():
+            tmp_staged.mkdir(parents=True, exist_ok=True)  # leere Ordner
+        (tmp_root / ".complete").touch()
+
+        try:
+            os.replace(tmp_root, tree_root)
+        except OSError:
+            # Ein paralleler Build war schneller -> dessen Baum ist inhaltsgleich
+            shutil.rmtree(tmp_root, ignore_errors=True)
+        stats["staged_trees"] += 1
+        return staged
+
+    @staticmethod
+    def _tree_files(root: Path) -> list:
+        if root.is_file():
+            return [Path()]
+        return [(Path(r) / n).relative_to(root) for r, _, names in os.walk(root) for n in names]
+
+    def link_tree(self, staged: Path, target: Path) -> int:
+        """
+        Legt einen gestagten Baum (Datei oder Ordner aus stage()) unter 'target' ab: Hardlinks auf die
+        Lager-Objekte, sonst Reflink/Kopie. Zeigt 'target' bereits auf dieselben Objekte (nur stat, kein
+        Lesen), bleibt er unverändert. Rückgabe: Anzahl verlinkter Dateien (0 = unverändert).
+        """
+        staged, target = Path(staged), Path(target)
+        files = self._tree_files(staged)
+        if target.exists() and staged.is_dir() == target.is_dir():
+            try:
+                if (len(self._tree_files(target)) == len(files)
+                        and all(os.path.samefile(staged / rel, target / rel) for rel in files)):
+                    return 0
+            except OSError:
+                pass
+        if target.is_dir() and not target.is_symlink():
+            shutil.rmtree(target)
+        elif target.exists() or target.is_symlink():
+            target.unlink()
+
+        for rel in files:
+            dest = target / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            link_or_copy(staged / rel, dest)
+        if staged.is_dir():
+            target.mkdir(parents=True, exist_ok=True)  # leere Ordner
+        return len(files)
+
+    def prune(self, max_age_days: float = 14):
+        """Entfernt Staging-Bäume, die länger nicht benutzt wurden (Lager-Objekte bleiben erhalten)."""
+        cutoff = time.time() - max_age_days * 86400
+        if not self.staging_dir.exists():
+            return
+        for tree in self.staging_dir.iterdir():
+            marker = tree / ".complete"
+            if marker.exists() and marker.stat().st_mtime < cutoff:
+                shutil.rmtree(tree, ignore_errors=True)
@@ -0,0 +1,245 @@
+import os
+import re
+import sys
+import time
+import warnings
+import sysconfig
+import py_compile
+import importlib.util
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from src.core.assets import FileHashCache, ContentStore, file_digest, link_or_copy
+from src.core.watch import local_imports
+from src.utils.helpers import log
+
+_TAG = sys.implementation.cache_tag
+_SKIP_DIRS = {"__pycache__", ".git", "build", "builds", "dist", ".venv", "venv", "node_modules"}
+# Teile der Standardbibliothek, die weder PyInstaller noch Apps zur Build-Zeit laden
+_STDLIB_SKIP = {"site-packages", "dist-packages", "test", "tests", "idlelib", "turtledemo", "lib2to3", "ensurepip"}
+# Grob, aber schnell: Top-Level-Importe auch in großen Dependency-Bäumen ohne AST
+_IMPORT_RE = re.compile(rb"^[ \t]*(?:import|from)[ \t]+([A-Za-z_]\w*)", re.MULTILINE)
+# Unterhalb dieser Anzahl lohnt der Start eines Prozess-Pools nicht
+_POOL_THRESHOLD = 32
+
+
+def pycache_path(prefix: Path, source: Path, optimize: int = 0) -> Path:
+    """Pfad, unter dem importlib mit sys.pycache_prefix=prefix die .pyc zu 'source' sucht."""
+    head = str(Path(source).parent.absolute())
+    if len(head) > 1 and head[1] == ":":
+        head = head[2:]  # Laufwerksbuchstabe entfällt wie in importlib.util.cache_from_source
+    opt = f".opt-{optimize}" if optimize else ""
+    return Path(prefix) / head.lstrip("\\/") / f"{Path(source).stem}.{_TAG}{opt}.pyc"
+
+
+def _compile(job: tuple):
+    """Worker: (Quelle, Ziel, Optimierung) -> Fehlertext oder None. py_compile schreibt atomar."""
+    source, target, optimize = job
+    try:
+        # SyntaxWarnings aus fremden Paketen gehören nicht ins Build-Log
+        warnings.simplefilter("ignore")
+        # Hash-basiert statt mtime: dieselbe .pyc gilt für jede Kopie derselben Quelle
+        py_compile.compile(source, cfile=target, dfile=os.path.basename(source), doraise=True,
+                           optimize=optimize, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+        return None
+    except (py_compile.PyCompileError, OSError, ValueError) as e:
+        return str(e).strip().splitlines()[-1] if str(e).strip() else type(e).__name__
+
+
+class BytecodeCache:
+    """
+    Vorkompilierter, geteilter Bytecode für Projekt und Dependencies.
+    Objekte liegen inhaltsadressiert (sha256 der Quelle, Interpreter-Tag, Optimierungsstufe) unter
+    builds/cache/bytecode (bzw. EXEBUILDER_BYTECODE_CACHE) und werden für alle Apps und Builds wiederverwendet. Der Build bekommt sie
+    per PYTHONPYCACHEPREFIX: ein Baum aus Hardlinks im Layout von importlib.
+    """
+
+    def __init__(self, cache_dir: Path = None, workers: int = None):
+        # EXEBUILDER_BYTECODE_CACHE: ein Cache für mehrere Projekte/Arbeitsverzeichnisse
+        cache_dir = cache_dir or Path(os.environ.get("EXEBUILDER_BYTECODE_CACHE") or Path("builds") / "cache" / "bytecode")
+        self.cache_dir = Path(cache_dir).absolute()
+        self.prefix = self.cache_dir / "prefix"
+        # Eigene Datei (nicht die des AssetStagers): Tausende Quellen aus Standardbibliothek und Paketen
+        # würden sonst jedes Asset-Staging mitladen
+        self.hash_cache = FileHashCache(self.cache_dir / "source_hashes.json")
+        self.workers = workers or os.cpu_count() or 4
+        self._stores = {}
+
+    @staticmethod
+    def available() -> bool:
+        return _TAG is not None
+
+    def store(self, optimize: int) -> ContentStore:
+        if optimize not in self._stores:
+            self._stores[optimize] = ContentStore(self.cache_dir / "objects" / f"{_TAG}.opt{optimize}")
+        return self._stores[optimize]
+
+    # --- Quellen ---
+
+    def collect_sources(self, script: Path, project_root: Path = None, include_deps: bool = True,
+                        include_toolchain: bool = True) -> list:
+        """
+        Script, lokale Module und (transitiv) alle installierten Pakete, die davon importiert werden.
+        'include_toolchain': zusätzlich Standardbibliothek und PyInstaller samt Abhängigkeiten. Der Prefix
+        gilt für JEDEN Import im Build-Prozess - ohne diese Module würden sie dort neu kompiliert.
+        """
+        script = Path(script).resolve()
+        root = Path(project_root or script.parent).resolve()
+        sources = {script} | local_imports(script, root)
+        if project_root:
+            sources |= set(self._walk(root))
+        if not include_deps:
+            return sorted(sources)
+
+        queue = list(sources)
+        if include_toolchain:
+            # Nur PyInstaller nach Importen durchsuchen; die Standardbibliothek importiert nur sich selbst
+            pyinstaller = [f for f in self._package_files("PyInstaller") if f not in sources]
+            queue += pyinstaller
+            sources |= set(pyinstaller) | set(self._stdlib_files())
+
+        skip = set(sys.builtin_module_names) | set(getattr(sys, "stdlib_module_names", ()))
+        seen = set()
+        while queue:
+            names = self._imported_names(queue.pop())
+            for name in names - seen - skip:
+                seen.add(name)
+                if (root / f"{name}.py").exists() or (root / name).is_dir():
+                    continue
+                files = self._package_files(name)
+                new = [f for f in files if f not in sources]
+                sources.update(new)
+                queue.extend(new)
+        return sorted(sources)
+
+    @staticmethod
+    def _imported_names(path: Path) -> set:
+        try:
+            return {m.decode("ascii") for m in _IMPORT_RE.findall(path.read_bytes())}
+        except (OSError, UnicodeDecodeError):
+            return set()
+
+    @staticmethod
+    def _package_files(name: str) -> list:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return []
+        if spec is None:
+            return []
+        if spec.submodule_search_locations:
+            files = []
+            for location in spec.submodule_search_locations:
+                files.extend(BytecodeCache._walk(Path(location)))
+            return files
+        if spec.origin and spec.origin.endswith(".py"):
+            return [Path(spec.origin)]
+        return []
+
+    @staticmethod
+    def _stdlib_files() -> list:
+        stdlib = Path(sysconfig.get_paths()["stdlib"])
+        return BytecodeCache._walk(stdlib, _SKIP_DIRS | _STDLIB_SKIP) if stdlib.is_dir() else []
+
+    @staticmethod
+    def _walk(top: Path, skip_dirs: set = _SKIP_DIRS) -> list:
+        files = []
+        for root, dirs, names in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            files.extend(Path(root) / n for n in names if n.endswith(".py"))
+        return files
+
+    # --- Kompilieren ---
+
+    def _digest(self, path: Path) -> str:
+        st = path.stat()
+        digest = self.hash_cache.lookup(path, st)
+        if digest is None:
+            digest = file_digest(path)
+            self.hash_cache.store(path, st, digest)
+        return digest
+
+    def precompile(self, sources: list, optimize: int = 0) -> dict:
+        """
+        Kompiliert fehlende Objekte parallel (Prozess-Pool, CPU-gebunden) und verlinkt alle Quellen
+        in den Prefix-Baum. Nicht kompilierbare Dateien (z.B. Python-2-Reste in Paketen) werden gezählt,
+        aber nicht verlinkt; PyInstaller behandelt sie wie bisher.
+        """
+        start = time.perf_counter()
+        store = self.store(optimize)
+        stats = {"optimize": optimize, "files": 0, "hits": 0, "compiled": 0, "failed": 0, "linked": 0,
+                 "workers": 0}
+
+        digests = {}
+        for source in sources:
+            try:
+                digests[Path(source)] = self._digest(Path(source))
+            except OSError:
+                continue
+        self.hash_cache.save()
+        stats["files"] = len(digests)
+
+        # Gleicher Inhalt (z.B. leere __init__.py) wird nur einmal kompiliert
+        todo = {}
+        for source, digest in digests.items():
+            if not store.object_path(digest).exists() and digest not in todo:
+                todo[digest] = source
+        stats["hits"] = sum(1 for d in digests.values() if d not in todo)
+
+        failed, stats["workers"] = self._compile_all(todo, store, optimize)
+        stats["compiled"] = len(todo) - len(failed)
+        stats["failed"] = len(failed)
+        for source, error in list(failed.values())[:5]:
+            log.debug(f"Bytecode: {source} nicht kompilierbar ({error})")
+
+        for source, digest in digests.items():
+            if digest not in failed and self._link(store.object_path(digest), source, optimize):
+                stats["linked"] += 1
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        log.info(f"Bytecode (-O{optimize}): {stats['files']} Quellen, {stats['hits']} aus Cache, "
+                 f"{stats['compiled']} kompiliert ({stats['workers'] or 1} Prozesse), "
+                 f"{stats['failed']} fehlerhaft in {stats['seconds']:.2f}s")
+        return stats
+
+    def _compile_all(self, todo: dict, store: ContentStore, optimize: int) -> tuple:
+        """{digest: Quelle} -> ({digest: (Quelle, Fehler)} der nicht kompilierbaren Quellen, Anzahl Prozesse)."""
+        jobs = []
+        for digest, source in todo.items():
+            target = store.object_path(digest)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((str(source), str(target), optimize))
+
+        workers = 0
+        if len(jobs) < _POOL_THRESHOLD or self.workers < 2:
+            errors = [_compile(job) for job in jobs]
+        else:
+            workers = min(self.workers, len(jobs))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                errors = list(pool.map(_compile, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+        failed = {}
+        for (digest, source), error in zip(todo.items(), errors):
+            if error:
+                failed[digest] = (source, error)
+        return failed, workers
+
+    def _link(self, obj: Path, source: Path, optimize: int) -> bool:
+        link = pycache_path(self.prefix, source, optimize)
+        try:
+            if link.exists() and os.path.samefile(link, obj):
+                return True
+            link.parent.mkdir(parents=True, exist_ok=True)
+            tmp = link.with_name(f"{link.name}.{os.getpid()}.tmp")
+            link_or_copy(obj, tmp)
+            os.replace(tmp, link)
+            return True
+        except OSError as e:
+            log.debug(f"Bytecode: {link} nicht verlinkt ({e})")
+            return False
+
+    def environment(self, optimize: int = 0) -> dict:
+        """Umgebung für PyInstaller: Prefix-Baum + Optimierungsstufe (auch für dessen Kindprozesse)."""
+        env = {"PYTHONPYCACHEPREFIX": str(self.prefix)}
+        if optimize:
+            env["PYTHONOPTIMIZE"] = str(optimize)
+        return env
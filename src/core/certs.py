@@ -2,6 +2,7 @@ import subprocess
 import os
 from pathlib import Path
 from src.utils.helpers import log, ensure_dir
+from src.utils.tracing import tracer
 
 class CertificateManager:
     """
@@ -18,8 +19,10 @@ class CertificateManager:
     def list_certificates(self):
         return list(self.store_path.glob("*.pfx"))
 
+    @tracer.traced("certificate:create", cat="certificate")
     def create_certificate(self, name: str, password: str, use_openssl: bool = False) -> tuple[Path, Path]:
         """Factory-Methode: Wählt das Backend."""
+        tracer.current().set(backend="openssl" if use_openssl else "powershell")
         if use_openssl:
             return self._create_certificate_openssl(name, password)
         else:
@@ -0,0 +1,120 @@
+import ast
+import json
+import threading
+from pathlib import Path
+from src.utils.helpers import log
+from src.utils.tracing import tracer
+
+
+class BuildConfigScanner:
+    """
+    Liest PYINSTALLER_CMD_ARGS aus Python-Dateien, OHNE sie auszuführen.
+    Die Datei wird per 'ast' geparst, nur Literal-Zuweisungen werden ausgewertet.
+    Ergebnisse werden nach (Pfad, mtime, Größe) gecached – auch über Prozessgrenzen hinweg.
+    """
+
+    KEYWORD = "PYINSTALLER_CMD_ARGS"
+
+    def __init__(self, cache_file: Path = Path("builds") / "cache" / "config_scan.json"):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._cache = self._load_cache()
+
+    def _load_cache(self) -> dict:
+        try:
+            return json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                self.cache_file.write_text(json.dumps(self._cache), encoding="utf-8")
+                self._dirty = False
+            except OSError as e:
+                log.debug(f"Config-Cache konnte nicht gespeichert werden: {e}")
+
+    def extract(self, path: Path):
+        """Liefert die Argumentliste oder None, wenn die Datei keine (literale) Config enthält."""
+        path = Path(path)
+        st = path.stat()
+        key = str(path.resolve())
+
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit and hit["mtime_ns"] == st.st_mtime_ns and hit["size"] == st.st_size:
+            tracer.instant("config:scan", cat="config", file=path.name, cache_hit=True)
+            return list(hit["args"]) if hit["args"] is not None else None
+
+        source = path.read_bytes()
+        tracer.instant("config:scan", cat="config", file=path.name, cache_hit=False, bytes=len(source))
+        args = None
+        # Billiger Vorfilter auf Bytes, bevor überhaupt geparst wird
+        if self.KEYWORD.encode() in source:
+            args = self._parse(source, path)
+
+        with self._lock:
+            self._cache[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "args": args}
+            self._dirty = True
+        return list(args) if args is not None else None
+
+    def _parse(self, source: bytes, path: Path):
+        try:
+            tree = ast.parse(source, filename=str(path))
+        except SyntaxError as e:
+            log.warning(f"Config {path.name} hat Syntaxfehler: {e}")
+            return None
+
+        args = None
+        # Nur Top-Level Statements, in Reihenfolge (wie beim Ausführen: letzte Zuweisung gewinnt)
+        for node in tree.body:
+            try:
+                if isinstance(node, ast.Assign) and any(self._is_keyword(t) for t in node.targets):
+                    args = self._literal(node.value)
+                elif isinstance(node, ast.AnnAssign) and self._is_keyword(node.target) and node.value:
+                    args = self._literal(node.value)
+                elif isinstance(node, ast.AugAssign) and self._is_keyword(node.target) and args is not None:
+                    args = args + self._literal(node.value)
+                elif isinstance(node, ast.Expr) and args is not None:
+                    args = self._apply_call(node.value, args)
+            except ValueError as e:
+                log.warning(f"{self.KEYWORD} in {path.name} ist kein reines Literal ({e}) - wird ignoriert.")
+                return None
+
+        if args is not None and not all(isinstance(a, str) for a in args):
+            log.warning(f"{self.KEYWORD} in {path.name} muss eine Liste von Strings sein.")
+            return None
+        return args
+
+    def _is_keyword(self, target) -> bool:
+        return isinstance(target, ast.Name) and target.id == self.KEYWORD
+
+    def _literal(self, node) -> list:
+        """literal_eval plus Listen-Konkatenation ([..] + [..])."""
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            return self._literal(node.left) + self._literal(node.right)
+        try:
+            value = ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            raise ValueError(f"Zeile {getattr(node, 'lineno', '?')}")
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("keine Liste")
+        return list(value)
+
+    def _apply_call(self, node, args: list) -> list:
+        """Unterstützt PYINSTALLER_CMD_ARGS.append("...") / .extend([...]) auf Top-Level."""
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and self._is_keyword(node.func.value) and len(node.args) == 1):
+            return args
+        if node.func.attr == "extend":
+            return args + self._literal(node.args[0])
+        if node.func.attr == "append":
+            try:
+                return args + [ast.literal_eval(node.args[0])]
+            except ValueError:
+                raise ValueError(f"Zeile {node.lineno}")
+        return args
@@ -0,0 +1,369 @@
+import io
+import os
+import re
+import sys
+import json
+import queue
+import socket
+import threading
+import http.client
+import multiprocessing as mp
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import urlparse, parse_qs
+from src.core.jobs import JobQueue, Job
+from src.core.resources import kill_process_tree
+from src.core.zygote import Zygote
+from src.utils.helpers import log
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class _LogForwarder(io.TextIOBase):
+    """Ersetzt stdout im Worker und schickt jede Zeile mit Job-ID an den Daemon."""
+
+    def __init__(self, events, job_id: str):
+        self.events = events
+        self.job_id = job_id
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            line = _ANSI.sub("", line).rstrip("\r")
+            if line:
+                self.events.put((self.job_id, "log", line))
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            self.write("\n")
+
+
+def _worker_main(worker_id: int, tasks, events, warm: bool):
+    """Einstiegspunkt eines warmen Worker-Prozesses."""
+    from src.core.orchestrator import BuildOrchestrator
+
+    orchestrator = BuildOrchestrator()
+    if warm and Zygote.supported():
+        # Hier laufen schon Log- und Queue-Threads: geforkt wird nur im Zygote, der PyInstaller vorlädt
+        orchestrator.builder.zygote = Zygote()
+    events.put((None, "ready", worker_id))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        job_id, config = task
+        forwarder = _LogForwarder(events, job_id)
+        old_out, old_err = sys.stdout, sys.stderr
+        sys.stdout = sys.stderr = forwarder
+        try:
+            run = orchestrator.run_full_pipeline(config)
+            if run is None:
+                result = {"ok": False, "error": "Script nicht gefunden"}
+            else:
+                result = run.as_dict()
+                if run.ok:
+                    result["artifact"] = str(run.context["signed"])
+                # Gemessene Ressourcen (Peak/Ø RSS, CPU, IO) für Scheduling-Entscheidungen
+                result["build_report"] = run.context["builder"].last_report
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        finally:
+            # Asynchrones Logging: alle Einträge des Jobs müssen noch über den Forwarder laufen
+            log.flush()
+            forwarder.flush()
+            sys.stdout, sys.stderr = old_out, old_err
+        events.put((job_id, "result", result))
+
+
+class _Worker:
+    def __init__(self, ctx, worker_id: int, events, warm: bool):
+        self.id = worker_id
+        self.tasks = ctx.Queue()
+        self.process = ctx.Process(target=_worker_main, args=(worker_id, self.tasks, events, warm),
+                                   name=f"BuildWorker-{worker_id}", daemon=True)
+        self.process.start()
+
+
+class _PendingJob:
+    def __init__(self, job: Job):
+        self.job = job
+        self.result = None
+        self.done = threading.Event()
+
+
+class WarmWorkerPool:
+    """
+    Hält N langlebige Worker-Prozesse mit vorab importiertem Framework. Auf POSIX hat jeder Worker
+    einen Zygote mit vorgeladenem PyInstaller, der Builds per fork() startet.
+    Jeder Worker bearbeitet genau einen Job gleichzeitig.
+    """
+
+    def __init__(self, size: int = 2, warm: bool = True):
+        self.size = size
+        self.warm = warm
+        self._ctx = mp.get_context("spawn")
+        self.events = self._ctx.Queue()
+        self.workers = {}
+        self._idle = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        for worker_id in range(size):
+            self._spawn(worker_id)
+        threading.Thread(target=self._collect, name="WorkerEvents", daemon=True).start()
+
+    def _spawn(self, worker_id: int):
+        self.workers[worker_id] = _Worker(self._ctx, worker_id, self.events, self.warm)
+
+    def _collect(self):
+        while True:
+            try:
+                job_id, kind, payload = self.events.get()
+            except (EOFError, OSError):
+                return
+            if kind == "ready":
+                log.debug(f"Worker {payload} bereit.")
+                self._idle.put(self.workers[payload])
+                continue
+            with self._lock:
+                pending = self._pending.get(job_id)
+            if pending is None:
+                continue
+            if kind == "log":
+                pending.job.append_log(payload)
+            elif kind == "result":
+                pending.result = payload
+                pending.done.set()
+
+    def run(self, job: Job) -> dict:
+        """Runner für die JobQueue: Blockiert, bis ein Worker den Job erledigt hat."""
+        worker = self._idle.get()
+        pending = _PendingJob(job)
+        with self._lock:
+            self._pending[job.id] = pending
+        worker.tasks.put((job.id, job.config))
+
+        try:
+            while not pending.done.wait(0.25):
+                if job.cancel_requested:
+                    self._replace(worker)
+                    raise RuntimeError("Job abgebrochen.")
+                if not worker.process.is_alive():
+                    self._replace(worker)
+                    raise RuntimeError(f"Worker {worker.id} abgestürzt (Exit {worker.process.exitcode}).")
+        finally:
+            with self._lock:
+                self._pending.pop(job.id, None)
+
+        self._idle.put(worker)
+        return pending.result
+
+    def _replace(self, worker: _Worker):
+        """Beendet den Worker samt Kindprozessen (PyInstaller/osslsigncode) und startet einen neuen."""
+        kill_process_tree(worker.process.pid)
+        worker.process.join(5)
+        self._spawn(worker.id)
+
+    def shutdown(self):
+        for worker in self.workers.values():
+            worker.tasks.put(None)
+        for worker in self.workers.values():
+            worker.process.join(5)
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """
+    REST-API:
+      GET    /health
+      GET    /jobs                    -> Liste
+      POST   /jobs                    -> {"config": {...}, "priority": 0}
+      GET    /jobs/<id>               -> Status
+      GET    /jobs/<id>/log?offset=N&follow=1
+      DELETE /jobs/<id>               -> Abbrechen
+    """
+
+    server_version = "ExeBuilderDaemon/1.0"
+
+    @property
+    def daemon(self) -> "BuildDaemon":
+        return self.server.build_daemon
+
+    def address_string(self):
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, fmt, *args):
+        log.debug(f"[Daemon] {self.address_string()} {fmt % args}")
+
+    def _send_json(self, code: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+        return parts, parse_qs(parsed.query)
+
+    def do_GET(self):
+        parts, query = self._route()
+        if parts == ["health"]:
+            return self._send_json(200, {"ok": True, "workers": self.daemon.pool.size})
+        if parts == ["jobs"]:
+            return self._send_json(200, [j.as_dict() for j in self.daemon.queue.list()])
+
+        job = self.daemon.queue.get(parts[1]) if len(parts) >= 2 and parts[0] == "jobs" else None
+        if job is None:
+            return self._send_json(404, {"error": "Job nicht gefunden"})
+        if len(parts) == 2:
+            return self._send_json(200, job.as_dict())
+        if len(parts) == 3 and parts[2] == "log":
+            return self._stream_log(job, query)
+        return self._send_json(404, {"error": "Unbekannter Pfad"})
+
+    def _stream_log(self, job: Job, query: dict):
+        offset = int(query.get("offset", ["0"])[0])
+        follow = query.get("follow", ["0"])[0] in ("1", "true")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+        try:
+            lines = job.follow_logs(offset) if follow else iter(job.logs[offset:])
+            for line in lines:
+                self.wfile.write((line + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ["jobs"]:
+            return self._send_json(404, {"error": "Unbekannter Pfad"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            config = payload["config"]
+        except (ValueError, KeyError) as e:
+            return self._send_json(400, {"error": f"Ungültiger Request: {e}"})
+        job = self.daemon.queue.submit(config, int(payload.get("priority", 0)))
+        self._send_json(202, job.as_dict())
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) == 2 and parts[0] == "jobs" and self.daemon.queue.cancel(parts[1]):
+            return self._send_json(200, {"cancelled": parts[1]})
+        self._send_json(404, {"error": "Job nicht gefunden oder bereits fertig"})
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class BuildDaemon:
+    """
+    Langlebiger Build-Service: Warme Worker, Prioritäts-Queue mit Concurrency-Limit
+    und eine lokale HTTP-API (TCP auf localhost oder Unix-Socket).
+    """
+
+    def __init__(self, workers: int = 2, warm: bool = True):
+        self.pool = WarmWorkerPool(size=workers, warm=warm)
+        self.queue = JobQueue(self.pool.run, max_concurrent=workers)
+        self.server = None
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8765, unix_socket: str = None):
+        if unix_socket:
+            if os.path.exists(unix_socket):
+                os.unlink(unix_socket)
+            self.server = _UnixHTTPServer(unix_socket, _DaemonRequestHandler)
+            where = f"unix://{unix_socket}"
+        else:
+            self.server = ThreadingHTTPServer((host, port), _DaemonRequestHandler)
+            where = f"http://{host}:{self.server.server_address[1]}"
+        self.server.build_daemon = self
+
+        log.success(f"Build-Daemon läuft auf {where} ({self.pool.size} Worker)")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            log.info("Daemon wird beendet...")
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        if self.server:
+            self.server.server_close()
+        self.queue.stop()
+        self.pool.shutdown()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DaemonClient:
+    """Schlanker Client (nur stdlib), damit CI-Jobs in Millisekunden einreichen können."""
+
+    def __init__(self, url: str = "http://127.0.0.1:8765", timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def _connection(self, timeout="default"):
+        timeout = self.timeout if timeout == "default" else timeout
+        parsed = urlparse(self.url)
+        if parsed.scheme == "unix":
+            return _UnixHTTPConnection(parsed.path, timeout=timeout)
+        return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=timeout)
+
+    def _request(self, method: str, path: str, payload=None):
+        conn = self._connection()
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body else {}
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = json.loads(resp.read() or b"null")
+            if resp.status >= 400:
+                raise RuntimeError(f"Daemon-Fehler {resp.status}: {data}")
+            return data
+        finally:
+            conn.close()
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    def submit(self, config: dict, priority: int = 0) -> dict:
+        return self._request("POST", "/jobs", {"config": config, "priority": priority})
+
+    def status(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def jobs(self) -> list:
+        return self._request("GET", "/jobs")
+
+    def cancel(self, job_id: str) -> dict:
+        return self._request("DELETE", f"/jobs/{job_id}")
+
+    def stream_log(self, job_id: str, offset: int = 0, follow: bool = True):
+        """Generator über die Log-Zeilen eines Jobs (blockiert bis Job-Ende, wenn follow=True)."""
+        conn = self._connection(timeout=None)
+        try:
+            conn.request("GET", f"/jobs/{job_id}/log?offset={offset}&follow={int(follow)}")
+            resp = conn.getresponse()
+            for raw in resp:
+                yield raw.decode("utf-8", errors="replace").rstrip("\n")
+        finally:
+            conn.close()
@@ -0,0 +1,335 @@
+import os
+import re
+import sys
+import json
+import zlib
+import shutil
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+from src.utils.helpers import log
+
+MAGIC = b"EXEDELTA1\n"
+
+# Chunk-Grenzen (Content-Defined Chunking): Ein kurzes Byte-Muster markiert eine Grenze.
+# Die Suche läuft per 're' in C statt Byte für Byte in Python; Verschiebungen im neuen
+# Build verschieben die Grenzen mit, deshalb finden sich unveränderte Bereiche wieder.
+_ANCHOR = re.compile(rb"[\x00-\x0f]\x00")   # ~1/4096 in komprimierten Daten
+MIN_CHUNK = 2 * 1024
+MAX_CHUNK = 64 * 1024
+_WINDOW = 8 * 1024 * 1024
+
+_OP_COPY = b"C"
+_OP_LITERAL = b"L"
+_OP_END = b"E"
+
+
+def _strong(data) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def iter_chunks(f, window: int = _WINDOW):
+    """Streamt (Offset, Chunk) aus einer Datei. Speicherbedarf: ~ein Fenster, unabhängig von der Dateigröße."""
+    buf = b""
+    base = 0  # Dateioffset von buf[0]
+    eof = False
+    while True:
+        if not eof and len(buf) < window:
+            more = f.read(window)
+            eof = not more
+            buf += more
+        if not buf:
+            return
+
+        pos = 0
+        while True:
+            start = pos + MIN_CHUNK
+            limit = pos + MAX_CHUNK
+            if start >= len(buf) and not eof:
+                break
+            match = _ANCHOR.search(buf, min(start, len(buf)), min(limit, len(buf)))
+            if match:
+                end = match.end()
+            elif limit <= len(buf):
+                end = limit
+            elif eof:
+                end = len(buf)
+            else:
+                break  # Grenze liegt evtl. hinter dem Fenster -> nachladen
+            yield base + pos, buf[pos:end]
+            pos = end
+            if pos >= len(buf):
+                break
+
+        base += pos
+        buf = buf[pos:]
+        if eof and not buf:
+            return
+
+
+class _FileDigest:
+    """sha256 + Größe einer Datei, gestreamt."""
+
+    @staticmethod
+    def of(path: Path) -> tuple[str, int]:
+        h = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+                size += len(block)
+        return h.hexdigest(), size
+
+
+class DeltaEncoder:
+    """
+    Erzeugt ein Binär-Delta alt -> neu.
+    Format: MAGIC, JSON-Header-Zeile, danach zlib-Strom aus Operationen
+      C <offset:Q> <länge:I>   Bytes aus der alten Datei übernehmen
+      L <länge:I> <bytes>      neue Bytes
+      E                        Ende
+    """
+
+    def __init__(self, old: Path, new: Path):
+        self.old = Path(old)
+        self.new = Path(new)
+
+    def _index_old(self) -> dict:
+        index = {}
+        with open(self.old, "rb") as f:
+            for offset, chunk in iter_chunks(f):
+                index.setdefault(_strong(chunk), (offset, len(chunk)))
+        return index
+
+    def write(self, output: Path) -> dict:
+        old_sha, old_size = _FileDigest.of(self.old)
+        new_sha, new_size = _FileDigest.of(self.new)
+        index = self._index_old()
+
+        header = {"old_sha256": old_sha, "old_size": old_size, "new_sha256": new_sha, "new_size": new_size}
+        compressor = zlib.compressobj(6)
+        stats = {"copied": 0, "literal": 0}
+        pending = None       # zusammenhängende COPY-Operation (offset, länge)
+        literal = []         # gesammelte neue Bytes
+        literal_size = 0
+
+        output = Path(output)
+        tmp = output.with_name(output.name + ".tmp")
+        with open(self.new, "rb") as f, open(tmp, "wb") as out:
+            out.write(MAGIC)
+            out.write(json.dumps(header).encode() + b"\n")
+
+            def flush_copy():
+                nonlocal pending
+                if pending:
+                    out.write(compressor.compress(_OP_COPY + struct.pack("<QI", *pending)))
+                    pending = None
+
+            def flush_literal():
+                nonlocal literal_size
+                literal_size = 0
+                if literal:
+                    data = b"".join(literal)
+                    literal.clear()
+                    out.write(compressor.compress(_OP_LITERAL + struct.pack("<I", len(data)) + data))
+
+            for _, chunk in iter_chunks(f):
+                hit = index.get(_strong(chunk))
+                if hit and hit[1] == len(chunk):
+                    flush_literal()
+                    stats["copied"] += len(chunk)
+                    if pending and pending[0] + pending[1] == hit[0]:
+                        pending = (pending[0], pending[1] + hit[1])
+                    else:
+                        flush_copy()
+                        pending = hit
+                else:
+                    flush_copy()
+                    literal.append(chunk)
+                    literal_size += len(chunk)
+                    stats["literal"] += len(chunk)
+                    if literal_size >= _WINDOW:
+                        flush_literal()
+
+            flush_copy()
+            flush_literal()
+            out.write(compressor.compress(_OP_END))
+            out.write(compressor.flush())
+        os.replace(tmp, output)
+
+        delta_size = output.stat().st_size
+        return {
+            **header,
+            "delta": str(output),
+            "delta_size": delta_size,
+            "ratio": round(delta_size / new_size, 4) if new_size else 0.0,
+            "copied_bytes": stats["copied"],
+            "literal_bytes": stats["literal"],
+        }
+
+
+class _Reader:
+    """
+    Liest exakt n Bytes aus einem zlib-Strom (gestreamt). Entpackt wird nie mehr als angefordert
+    (max_length), eine präparierte Delta-Datei kann so keinen beliebig großen Puffer erzwingen.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.z = zlib.decompressobj()
+
+    def read(self, n: int) -> bytes:
+        parts, have = [], 0
+        while have < n:
+            data = self.z.unconsumed_tail or self.f.read(256 * 1024)
+            chunk = self.z.decompress(data, n - have)
+            if not chunk:
+                if not data or self.z.eof:
+                    raise ValueError("Delta abgeschnitten")
+                continue
+            parts.append(chunk)
+            have += len(chunk)
+        return b"".join(parts)
+
+
+def read_header(delta: Path) -> dict:
+    with open(delta, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Keine Delta-Datei")
+        return json.loads(f.readline())
+
+
+def apply_delta(old: Path, delta: Path, output: Path) -> Path:
+    """Baut die neue Datei aus alter Datei + Delta und prüft den sha256 des Ergebnisses."""
+    old_sha, old_size = _FileDigest.of(Path(old))
+    output = Path(output)
+    tmp = output.with_name(output.name + ".tmp")
+
+    with open(delta, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Keine Delta-Datei")
+        header = json.loads(f.readline())
+        if header["old_sha256"] != old_sha:
+            raise ValueError("Delta passt nicht zur vorhandenen Version (sha256 der alten Datei weicht ab)")
+
+        reader = _Reader(f)
+        h = hashlib.sha256()
+        expected, written = int(header["new_size"]), 0
+        try:
+            with open(old, "rb") as src, open(tmp, "wb") as out:
+                while True:
+                    op = reader.read(1)
+                    if op == _OP_END:
+                        break
+                    if op == _OP_COPY:
+                        offset, length = struct.unpack("<QI", reader.read(12))
+                        src.seek(offset)
+                    elif op == _OP_LITERAL:
+                        length, = struct.unpack("<I", reader.read(4))
+                    else:
+                        raise ValueError(f"Unbekannte Delta-Operation: {op!r}")
+                    # Nie mehr schreiben als der Header ankündigt
+                    written += length
+                    if written > expected:
+                        raise ValueError(f"Delta erzeugt mehr als die angekündigten {expected} Bytes")
+                    while length:
+                        n = min(length, 1024 * 1024)
+                        block = src.read(n) if op == _OP_COPY else reader.read(n)
+                        if not block:
+                            raise ValueError("COPY außerhalb der alten Datei")
+                        out.write(block)
+                        h.update(block)
+                        length -= len(block)
+        except (ValueError, struct.error):
+            tmp.unlink(missing_ok=True)
+            raise
+
+    if written != expected or h.hexdigest() != header["new_sha256"]:
+        tmp.unlink(missing_ok=True)
+        raise ValueError("Ergebnis stimmt nicht mit dem erwarteten sha256 überein")
+    os.replace(tmp, output)
+    return output
+
+
+def verify_delta(old: Path, delta: Path, new: Path) -> bool:
+    """Prüft, ob alt + Delta exakt 'new' ergibt."""
+    tmp = Path(new).with_name(Path(new).name + ".verify")
+    try:
+        apply_delta(old, delta, tmp)
+        return _FileDigest.of(tmp)[0] == _FileDigest.of(Path(new))[0]
+    except ValueError as e:
+        log.error(f"Delta ungültig: {e}")
+        return False
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class ReleaseStore:
+    """Hält pro App das zuletzt ausgelieferte signierte Artefakt: builds/releases/<app>/latest<suffix>."""
+
+    def __init__(self, root: Path = Path("builds") / "releases"):
+        self.root = root
+
+    def latest(self, app: str, suffix: str = ".exe") -> Path:
+        return self.root / app / f"latest{suffix}"
+
+    def publish(self, app: str, artifact: Path) -> dict:
+        """Erzeugt das Delta vorige Version -> 'artifact' und merkt sich 'artifact' als neue Vorgängerversion."""
+        artifact = Path(artifact)
+        previous = self.latest(app, artifact.suffix)
+        previous.parent.mkdir(parents=True, exist_ok=True)
+        result = None
+
+        if previous.exists():
+            old_sha, _ = _FileDigest.of(previous)
+            new_sha, _ = _FileDigest.of(artifact)
+            if old_sha == new_sha:
+                log.info(f"Delta: {artifact.name} unverändert gegenüber der Vorversion.")
+                return None
+            delta_path = previous.parent / f"{old_sha[:12]}_{new_sha[:12]}.exdelta"
+            result = DeltaEncoder(previous, artifact).write(delta_path)
+            if not verify_delta(previous, delta_path, artifact):
+                delta_path.unlink(missing_ok=True)
+                raise ValueError("Delta-Prüfung fehlgeschlagen")
+            log.success(f"Delta {delta_path.name}: {result['delta_size'] / 1024 / 1024:.1f} MB statt "
+                        f"{result['new_size'] / 1024 / 1024:.1f} MB ({result['ratio']:.1%} der Vollversion)")
+
+        tmp = previous.with_name(previous.name + ".tmp")
+        shutil.copy2(artifact, tmp)
+        os.replace(tmp, previous)
+        return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Binär-Deltas zwischen zwei Releases")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_diff = sub.add_parser("diff", help="Delta erzeugen")
+    p_diff.add_argument("old")
+    p_diff.add_argument("new")
+    p_diff.add_argument("delta")
+    p_apply = sub.add_parser("apply", help="Delta anwenden")
+    p_apply.add_argument("old")
+    p_apply.add_argument("delta")
+    p_apply.add_argument("output")
+    p_verify = sub.add_parser("verify", help="Prüfen, ob alt + Delta = neu")
+    p_verify.add_argument("old")
+    p_verify.add_argument("delta")
+    p_verify.add_argument("new")
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        print(json.dumps(DeltaEncoder(Path(args.old), Path(args.new)).write(Path(args.delta)), indent=2))
+    elif args.command == "apply":
+        try:
+            apply_delta(Path(args.old), Path(args.delta), Path(args.output))
+        except ValueError as e:
+            log.error(str(e))
+            return 1
+    elif args.command == "verify":
+        return 0 if verify_delta(Path(args.old), Path(args.delta), Path(args.new)) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,19 @@
 import subprocess
 import sys
 import shutil
-import importlib.util
-import pkg_resources
 import zipfile
 import io
 import os
-import requests
+import time
+import tempfile
+from collections import deque
 from pathlib import Path
+from urllib.parse import urlparse
 from src.utils.helpers import log
 from src.core.network import NetworkGuard
+from src.core.lockfile import LockfileResolver
+from src.core.retry import retry_engine
+from src.utils.tracing import tracer
 
 class EnvironmentManager:
     """
@@ -24,21 +28,29 @@ class EnvironmentManager:
 
     def prepare_environment(self, project_path: Path):
         log.info(f"Analysiere Umgebung in: {project_path}")
-        
-        # 1. System Tools (OpenSSL & OSSLSIGNCODE)
+        self.prepare_tools()
+        self.prepare_dependencies(project_path)
+
+    @tracer.traced("environment:prepare_tools", cat="environment")
+    def prepare_tools(self):
+        """System Tools (OpenSSL & OSSLSIGNCODE). Wird nur für Zertifikate und Signatur gebraucht."""
         self._ensure_openssl()
         self._ensure_osslsigncode()
 
-        # 2. Python Check
+    @tracer.traced("environment:prepare_dependencies", cat="environment")
+    def prepare_dependencies(self, project_path: Path):
+        """Python-Seite: VENV Check und Dependencies (poetry.lock > pip-tools/requirements > pyproject.toml)."""
         if self._is_venv():
             log.debug("Aktives Virtual Environment (VENV) erkannt.")
         else:
             log.warning("ACHTUNG: Kein aktives VENV erkannt. Installation erfolgt global.")
 
-        # 3. Dependencies
-        if (project_path / "Requirements.txt").exists():
-            self._install_pip(project_path / "Requirements.txt")
+        resolver = LockfileResolver.detect(project_path)
+        tracer.current().set(source=resolver.source.name if resolver else None)
+        if resolver:
+            self._install_locked(resolver)
 
+    @tracer.traced("environment:osslsigncode", cat="environment")
     def _ensure_osslsigncode(self):
         """Lädt osslsigncode und ALLE Abhängigkeiten (DLLs) herunter."""
         exe_path = self.tools_dir / "osslsigncode.exe"
@@ -46,6 +58,7 @@ class EnvironmentManager:
         # Check: Existiert die Exe und ist sie größer als 0 Byte?
         if exe_path.exists() and exe_path.stat().st_size > 0:
             log.debug("Signier-Tool (osslsigncode) scheint vorhanden zu sein.")
+            tracer.current().set(cached=True)
             return
 
         log.warning("Signier-Tool (osslsigncode) fehlt oder ist beschädigt. Starte Download...")
@@ -56,13 +69,15 @@ class EnvironmentManager:
         
         try:
             log.info("Lade osslsigncode herunter...")
-            r = requests.get(url)
-            r.raise_for_status()
+            content = retry_engine.call(
+                "download:osslsigncode", lambda: self._download(url),
+                endpoint=urlparse(url).netloc, network=self.network
+            )
             
             log.info("Entpacke Tool und DLLs...")
             found_exe = False
             
-            with zipfile.ZipFile(io.BytesIO(r.content)) as z:
+            with zipfile.ZipFile(io.BytesIO(content)) as z:
                 for file_info in z.infolist():
                     # Wir ignorieren Ordner, wir wollen die Dateien direkt in 'tools/' haben (Flatten)
                     if file_info.is_dir():
@@ -93,9 +108,20 @@ class EnvironmentManager:
             if exe_path.exists():
                 exe_path.unlink()
             
+    def _download(self, url: str) -> bytes:
+        # requests erst beim ersten Download laden (spart ~100ms beim Start von GUI/CLI)
+        import requests
+        with tracer.span("download", cat="network", url=url) as span:
+            r = requests.get(url, timeout=(10, 120))
+            r.raise_for_status()
+            span.set(bytes=len(r.content), status=r.status_code)
+            return r.content
+
+    @tracer.traced("environment:openssl", cat="environment")
     def _ensure_openssl(self):
         if shutil.which("openssl"):
             log.debug("OpenSSL ist verfügbar.")
+            tracer.current().set(cached=True)
             return
             
         log.warning("OpenSSL fehlt. Versuche Installation via Winget...")
@@ -110,27 +136,56 @@ class EnvironmentManager:
     def _is_venv(self) -> bool:
         return (hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix))
 
-    def _check_package_installed(self, package_name: str) -> bool:
-        clean_name = package_name.split('==')[0].split('>=')[0].split('<=')[0].strip()
-        if importlib.util.find_spec(clean_name) is not None: return True
-        try: pkg_resources.get_distribution(clean_name); return True
-        except: return False
-
     def _install_pip(self, req_file: Path):
-        log.info("Prüfe Python Dependencies...")
-        to_install = []
-        try:
-            with open(req_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and not self._check_package_installed(line):
-                        to_install.append(line)
-        except: pass
-
-        if not to_install:
+        self._install_locked(LockfileResolver.from_requirements(req_file))
+
+    def _install_locked(self, resolver: LockfileResolver):
+        """Installiert nur das Delta zwischen Lock-Set und installierten Distributionen."""
+        log.info(f"Prüfe Python Dependencies ({resolver.source.name})...")
+        start = time.perf_counter()
+
+        with tracer.span("dependencies:delta", cat="environment") as span:
+            delta = resolver.compute_delta()
+            span.set(requirements=len(resolver.requirements), delta=len(delta))
+        log.debug(f"Dependency-Diff: {len(delta)}/{len(resolver.requirements)} Pakete in {time.perf_counter() - start:.3f}s")
+
+        if not delta:
             log.success("Dependencies aktuell.")
             return
 
-        log.info(f"Installiere {len(to_install)} Pakete...")
+        log.info(f"Installiere {len(delta)} Pakete: {', '.join(r.raw for r in delta[:10])}{' ...' if len(delta) > 10 else ''}")
         self.network.wait_for_network()
-        subprocess.check_call([sys.executable, "-m", "pip", "install"] + to_install)
+
+        # Ein einziger, gebatchter pip-Aufruf über eine temporäre Requirements-Datei
+        fd, tmp_name = tempfile.mkstemp(prefix="delta_", suffix=".txt")
+        os.close(fd)
+        tmp_file = Path(tmp_name)
+        try:
+            cmd = resolver.build_pip_command(delta, tmp_file)
+            retry_engine.call("pip:install", lambda: self._run_pip(cmd),
+                              endpoint=self._index_host(resolver), network=self.network)
+        finally:
+            tmp_file.unlink(missing_ok=True)
+
+    def _index_host(self, resolver: LockfileResolver) -> str:
+        opts = resolver.pip_options
+        for i, opt in enumerate(opts[:-1]):
+            if opt in ("--index-url", "-i"):
+                return urlparse(opts[i + 1]).netloc or "pypi.org"
+        return "pypi.org"
+
+    @tracer.traced("pip:install", cat="environment")
+    def _run_pip(self, cmd: list):
+        """Streamt die pip-Ausgabe und hängt das Ende an den Fehler an (für die Retry-Klassifizierung)."""
+        tail = deque(maxlen=200)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, encoding="utf-8", errors="replace")
+        for line in process.stdout:
+            line = line.rstrip()
+            if line:
+                tail.append(line)
+                print(line)
+        process.wait()
+        tracer.current().set(pid=process.pid, returncode=process.returncode)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, output="\n".join(tail))
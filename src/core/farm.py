@@ -0,0 +1,796 @@
+import os
+import hmac
+import json
+import time
+import uuid
+import socket
+import hashlib
+import threading
+import itertools
+import http.client
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, quote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.core.jobs import Job
+from src.utils.helpers import log
+
+_BLOCK = 1024 * 1024
+# Begleitdateien im dist-Ordner, die zusammen mit der signierten EXE eingesammelt werden
+_COMPANION_FILES = ("install_cert.bat", "ANLEITUNG_LESEN.txt")
+# Gemeinsames Geheimnis von Koordinator, Knoten und CLI (Bearer-Token auf jedem Request)
+TOKEN_ENV = "EXEBUILDER_FARM_TOKEN"
+
+
+class FarmJob(Job):
+    """Job der Build-Farm: zusätzlich Knoten, Versuche und eingesammelte Artefakte."""
+
+    def __init__(self, config: dict, priority: int = 0, max_attempts: int = 3):
+        super().__init__(config, priority)
+        self.node = None
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.artifacts = {}
+        self.seq = 0
+
+    @property
+    def app(self) -> str:
+        return self.config.get("app_name", "?")
+
+    def as_dict(self) -> dict:
+        data = super().as_dict()
+        data.update({"node": self.node, "attempts": self.attempts, "artifacts": dict(self.artifacts)})
+        return data
+
+
+class DurationModel:
+    """
+    Historische Build-Dauern: gleitender Mittelwert pro App und Geschwindigkeitsfaktor pro Knoten
+    (tatsächliche / erwartete Dauer). Persistiert, damit die Planung am Release-Tag auf Erfahrung beruht.
+    """
+
+    DEFAULT = 60.0
+    ALPHA = 0.3
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.apps = data.get("apps", {})
+        self.nodes = data.get("nodes", {})
+
+    def expected(self, app: str, node: str = None) -> float:
+        base = self.apps.get(app)
+        if base is None:
+            base = sum(self.apps.values()) / len(self.apps) if self.apps else self.DEFAULT
+        return base * self.nodes.get(node, 1.0)
+
+    def record(self, app: str, node: str, duration: float):
+        with self._lock:
+            predicted = self.apps.get(app)
+            self.apps[app] = duration if predicted is None else predicted + self.ALPHA * (duration - predicted)
+            if predicted:
+                factor = duration / predicted
+                old = self.nodes.get(node, 1.0)
+                self.nodes[node] = old + self.ALPHA * (factor - old)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"apps": self.apps, "nodes": self.nodes}, indent=2), encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError as e:
+                log.warning(f"Build-Dauern konnten nicht gespeichert werden: {e}")
+
+
+class NodeState:
+    """Sicht des Koordinators auf einen Worker-Knoten."""
+
+    def __init__(self, node_id: str, name: str, slots: int, info: dict = None):
+        self.id = node_id
+        self.name = name
+        self.slots = max(1, slots)
+        self.info = info or {}
+        self.last_seen = time.monotonic()
+        self.alive = True
+        self.queue = []        # zugewiesene, noch nicht gestartete Jobs (nach Priorität sortiert)
+        self.running = {}      # job_id -> FarmJob
+        self.completed = 0
+        self.failed = 0
+        self.stolen = 0
+
+    def as_dict(self, model: DurationModel) -> dict:
+        return {
+            "id": self.id, "name": self.name, "slots": self.slots, "alive": self.alive,
+            "queued": [j.id for j in self.queue], "running": list(self.running),
+            "completed": self.completed, "failed": self.failed, "stolen": self.stolen,
+            "speed_factor": round(model.nodes.get(self.name, 1.0), 3),
+            "last_seen_ago": round(time.monotonic() - self.last_seen, 1),
+            **self.info,
+        }
+
+
+class FarmCoordinator:
+    """
+    Verteilt Build-and-Sign-Jobs auf registrierte Knoten.
+    - Zuweisung an den Knoten mit der frühesten erwarteten Fertigstellung (Queue-Tiefe x historische Dauer)
+    - Leerlaufende Knoten stehlen wartende Jobs des am stärksten belasteten Knotens
+    - Knoten ohne Heartbeat gelten als tot; ihre Jobs werden neu eingeplant (max. 'max_attempts')
+    - Laufende Jobs ohne Ergebnis nach 'result_timeout' Sekunden ebenso (Knoten lebt, Slot hängt)
+    - Artefakte und Reports landen zentral unter builds/farm/<job_id>/
+    """
+
+    def __init__(self, root: Path = Path("builds") / "farm", heartbeat_timeout: float = 15.0,
+                 max_attempts: int = 3, token: str = None, result_timeout: float = 3600.0):
+        self.root = Path(root)
+        self.token = token or os.environ.get(TOKEN_ENV)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.result_timeout = result_timeout
+        self.max_attempts = max_attempts
+        self.model = DurationModel(self.root / "durations.json")
+        self.nodes = {}
+        self.jobs = {}
+        self.unassigned = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.server = None
+        threading.Thread(target=self._reaper, name="FarmReaper", daemon=True).start()
+
+    # --- Planung ---
+
+    @staticmethod
+    def _sort_key(job: FarmJob):
+        return (-job.priority, job.seq)
+
+    def _backlog(self, node: NodeState) -> float:
+        """Geschätzte Sekunden, bis der Knoten alle ihm zugewiesenen Jobs abgearbeitet hat."""
+        now = time.time()
+        busy = sum(max(0.0, self.model.expected(j.app, node.name) - (now - (j.started or now)))
+                   for j in node.running.values())
+        queued = sum(self.model.expected(j.app, node.name) for j in node.queue)
+        return (busy + queued) / node.slots
+
+    def _place(self, job: FarmJob):
+        """Weist den Job dem Knoten mit der frühesten erwarteten Fertigstellung zu (Lock gehalten)."""
+        alive = [n for n in self.nodes.values() if n.alive]
+        if not alive:
+            self.unassigned.append(job)
+            self.unassigned.sort(key=self._sort_key)
+            return
+        best = min(alive, key=lambda n: self._backlog(n) + self.model.expected(job.app, n.name))
+        best.queue.append(job)
+        best.queue.sort(key=self._sort_key)
+        job.node = best.id
+
+    def submit(self, config: dict, priority: int = 0) -> FarmJob:
+        job = FarmJob(config, priority, self.max_attempts)
+        with self._cond:
+            job.seq = next(self._seq)
+            self.jobs[job.id] = job
+            self._place(job)
+            self._cond.notify_all()
+        target = self.nodes[job.node].name if job.node else "noch kein Knoten"
+        log.info(f"Farm-Job {job.id} ({job.app}, Prio {priority}) -> {target}")
+        return job
+
+    def _take(self, node: NodeState):
+        """Nächster Job für 'node': eigene Queue, dann unzugewiesene Jobs, dann Work Stealing (Lock gehalten)."""
+        if node.queue:
+            return node.queue.pop(0)
+        if self.unassigned:
+            return self.unassigned.pop(0)
+        victims = [n for n in self.nodes.values()
+                   if n is not node and n.queue and (not n.alive or len(n.running) >= n.slots)]
+        if not victims:
+            return None
+        victim = max(victims, key=self._backlog)
+        # Vom Ende stehlen: den Job, den der überlastete Knoten als letztes gestartet hätte
+        job = victim.queue.pop()
+        node.stolen += 1
+        log.info(f"Work Stealing: {node.name} übernimmt {job.id} ({job.app}) von {victim.name}")
+        return job
+
+    # --- RPC-Operationen ---
+
+    def register(self, name: str, slots: int = 1, info: dict = None) -> NodeState:
+        node = NodeState(uuid.uuid4().hex[:8], name, slots, info)
+        with self._cond:
+            self.nodes[node.id] = node
+            self._cond.notify_all()
+        log.success(f"Knoten registriert: {name} ({slots} Slots, id {node.id})")
+        return node
+
+    def _node(self, node_id: str) -> NodeState:
+        node = self.nodes.get(node_id)
+        if node is None:
+            raise KeyError(node_id)
+        node.last_seen = time.monotonic()
+        if not node.alive:
+            log.info(f"Knoten {node.name} meldet sich zurück.")
+            node.alive = True
+        return node
+
+    def next_job(self, node_id: str, wait: float = 10.0):
+        """Long-Poll: liefert den nächsten Job für den Knoten oder None nach 'wait' Sekunden."""
+        deadline = time.monotonic() + wait
+        with self._cond:
+            node = self._node(node_id)
+            while True:
+                if not self._stopped and len(node.running) < node.slots:
+                    job = self._take(node)
+                    if job is not None:
+                        job.node = node.id
+                        job.attempts += 1
+                        job.set_status(Job.RUNNING)
+                        node.running[job.id] = job
+                        return job
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopped:
+                    return None
+                self._cond.wait(min(remaining, 1.0))
+                node.last_seen = time.monotonic()
+
+    def heartbeat(self, node_id: str, logs: dict = None) -> dict:
+        """Lebenszeichen + neue Log-Zeilen der laufenden Jobs. Antwort: abzubrechende Jobs."""
+        with self._cond:
+            node = self._node(node_id)
+            cancel = [job_id for job_id, job in node.running.items() if job.cancel_requested]
+        for job_id, lines in (logs or {}).items():
+            job = self.jobs.get(job_id)
+            if job is not None and job.node == node_id:
+                for line in lines:
+                    job.append_log(line)
+        return {"cancel": cancel}
+
+    def store_artifact(self, job_id: str, node_id: str, name: str, stream, length: int, sha256: str = None) -> Path:
+        """Nimmt ein Artefakt gestreamt entgegen und prüft optional den sha256."""
+        job = self.jobs.get(job_id)
+        if job is None or job.node != node_id:
+            raise KeyError(job_id)
+        name = Path(name).name
+        target_dir = self.root / job_id
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / name
+        tmp = target.with_name(name + ".part")
+        h = hashlib.sha256()
+        remaining = length
+        with open(tmp, "wb") as f:
+            while remaining > 0:
+                block = stream.read(min(remaining, _BLOCK))
+                if not block:
+                    break
+                f.write(block)
+                h.update(block)
+                remaining -= len(block)
+        if remaining or (sha256 and h.hexdigest() != sha256):
+            tmp.unlink(missing_ok=True)
+            raise ValueError(f"Artefakt {name} unvollständig oder sha256 stimmt nicht")
+        os.replace(tmp, target)
+        job.artifacts[name] = str(target)
+        return target
+
+    def complete(self, job_id: str, node_id: str, result: dict, attempt: int = None) -> bool:
+        """Ergebnis eines Knotens. Ergebnisse veralteter Zuweisungen (nach Requeue) werden verworfen."""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            node = self.nodes.get(node_id)
+            if job is None or node is None or job.node != node_id or job.is_finished:
+                return False
+            # Nach Requeue auf denselben Knoten: Ergebnis des alten Versuchs gilt nicht
+            if job_id not in node.running or (attempt is not None and attempt != job.attempts):
+                return False
+            node.running.pop(job_id)
+            node.last_seen = time.monotonic()
+            ok = bool(result.get("ok"))
+            duration = time.time() - (job.started or time.time())
+            if job.cancel_requested:
+                job.set_status(Job.CANCELLED, result=result)
+            elif ok:
+                node.completed += 1
+                job.set_status(Job.DONE, result=result)
+            else:
+                node.failed += 1
+                job.set_status(Job.FAILED, result=result, error=result.get("error"))
+            self._cond.notify_all()
+
+        if ok:
+            self.model.record(job.app, node.name, duration)
+        report = {**job.as_dict(), "node_name": node.name}
+        (self.root / job_id).mkdir(parents=True, exist_ok=True)
+        (self.root / job_id / "report.json").write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        level = log.success if ok else log.error
+        level(f"Farm-Job {job_id} ({job.app}) auf {node.name}: {job.status} nach {duration:.1f}s")
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.is_finished:
+                return False
+            job.cancel_requested = True
+            if job.status == Job.QUEUED:
+                for bucket in [self.unassigned] + [n.queue for n in self.nodes.values()]:
+                    if job in bucket:
+                        bucket.remove(job)
+                job.set_status(Job.CANCELLED)
+            self._cond.notify_all()
+        return True
+
+    # --- Ausfallerkennung ---
+
+    def _requeue(self, job: FarmJob, reason: str):
+        if job.attempts >= job.max_attempts:
+            job.set_status(Job.FAILED, error=f"{reason} (nach {job.attempts} Versuchen)")
+            log.error(f"Farm-Job {job.id} ({job.app}) endgültig fehlgeschlagen: {reason}")
+            return
+        job.set_status(Job.QUEUED)
+        job.started = None
+        job.node = None
+        job.append_log(f"--- Neu eingeplant: {reason} ---")
+        self._place(job)
+        log.warning(f"Farm-Job {job.id} ({job.app}) neu eingeplant: {reason}")
+
+    def _reaper(self):
+        while not self._stopped:
+            time.sleep(min(1.0, self.heartbeat_timeout / 3))
+            with self._cond:
+                now = time.monotonic()
+                for node in list(self.nodes.values()):
+                    if node.alive and now - node.last_seen > self.heartbeat_timeout:
+                        node.alive = False
+                        log.error(f"Knoten {node.name} antwortet nicht mehr – verteile "
+                                  f"{len(node.running)} laufende und {len(node.queue)} wartende Jobs neu.")
+                        orphans = list(node.running.values())
+                        waiting, node.queue = node.queue, []
+                        node.running.clear()
+                        for job in orphans:
+                            self._requeue(job, f"Knoten {node.name} ausgefallen")
+                        for job in waiting:
+                            job.node = None
+                            self._place(job)
+                    elif node.alive and self.result_timeout:
+                        # Knoten lebt, meldet aber kein Ergebnis (z.B. Upload hängt): Slot freigeben
+                        deadline = time.time() - self.result_timeout
+                        for job in [j for j in node.running.values() if (j.started or 0) < deadline]:
+                            del node.running[job.id]
+                            self._requeue(job, f"kein Ergebnis von {node.name} nach {self.result_timeout:.0f}s")
+                self._cond.notify_all()
+
+    # --- Auswertung ---
+
+    def wait(self, job_ids: list = None, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job_id in job_ids or list(self.jobs):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self.jobs[job_id].wait(remaining):
+                return False
+        return True
+
+    def node_list(self) -> list:
+        with self._cond:
+            nodes = []
+            for node in self.nodes.values():
+                data = node.as_dict(self.model)
+                data["backlog_seconds"] = round(self._backlog(node), 1)
+                nodes.append(data)
+            return nodes
+
+    def summary(self) -> dict:
+        """Gesamtbericht im Format des Batch-Runners, ergänzt um Knoten und Versuche."""
+        with self._cond:
+            jobs = sorted(self.jobs.values(), key=lambda j: j.created)
+            nodes = {n.id: n.name for n in self.nodes.values()}
+        apps = []
+        for job in jobs:
+            data = job.as_dict()
+            apps.append({
+                "id": job.id, "app": job.app, "ok": job.status == Job.DONE, "status": job.status,
+                "node": nodes.get(job.node), "attempts": job.attempts, "duration": data["elapsed"] or 0.0,
+                "error": job.error or (job.result or {}).get("error"),
+                "artifact": next((p for n, p in job.artifacts.items() if n.lower().endswith(".exe")), None),
+                "artifacts": dict(job.artifacts),
+            })
+        started = [j.started for j in jobs if j.started]
+        finished = [j.finished for j in jobs if j.finished]
+        summary = {
+            "total": len(apps),
+            "succeeded": sum(1 for a in apps if a["ok"]),
+            "wall_time": round(max(finished) - min(started), 3) if started and finished else 0.0,
+            "nodes": self.node_list(),
+            "apps": apps,
+        }
+        (self.root / "summary.json").write_text(json.dumps(summary, indent=2, default=str), encoding="utf-8")
+        return summary
+
+    # --- Server ---
+
+    def start(self, host: str = "127.0.0.1", port: int = 8790):
+        # Jobs enthalten Scripts, Zertifikatsnamen und Pfade: ohne Token startet der Koordinator nicht
+        if not self.token:
+            raise ValueError(f"Farm-Koordinator braucht ein Token (--token / {TOKEN_ENV})")
+        self.server = ThreadingHTTPServer((host, port), _FarmRequestHandler)
+        self.server.daemon_threads = True
+        self.server.coordinator = self
+        threading.Thread(target=self.server.serve_forever, name="FarmHTTP", daemon=True).start()
+        host, port = self.server.server_address[:2]
+        log.success(f"Farm-Koordinator läuft auf http://{host}:{port}")
+        return host, port
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class _FarmRequestHandler(BaseHTTPRequestHandler):
+    """
+    RPC (JSON über HTTP):
+      POST   /nodes                        -> {"name", "slots"}            Knoten registrieren
+      POST   /nodes/<id>/next?wait=10      -> Job oder 204                 Long-Poll
+      POST   /nodes/<id>/heartbeat         -> {"logs": {job_id: [..]}}     Antwort {"cancel": [..]}
+      PUT    /jobs/<id>/artifacts/<name>   (Header X-Node, X-Sha256)       Artefakt gestreamt
+      POST   /jobs/<id>/result             -> {"node", "result"}
+      POST   /jobs                         -> {"config", "priority"}
+      GET    /jobs, /jobs/<id>, /nodes, /summary, /health
+      DELETE /jobs/<id>
+    Jeder Request braucht "Authorization: Bearer <EXEBUILDER_FARM_TOKEN>", sonst 401.
+    """
+
+    server_version = "ExeBuilderFarm/1.0"
+
+    @property
+    def coordinator(self) -> FarmCoordinator:
+        return self.server.coordinator
+
+    def log_message(self, fmt, *args):
+        log.debug(f"[Farm] {self.client_address[0]} {fmt % args}")
+
+    def _send_json(self, code: int, payload=None):
+        body = json.dumps(payload, default=str).encode("utf-8") if payload is not None else b""
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        """Prüft das Bearer-Token (konstante Laufzeit); sonst Body verwerfen und 401 senden."""
+        header = self.headers.get("Authorization", "").encode("utf-8")
+        if hmac.compare_digest(header, f"Bearer {self.coordinator.token}".encode("utf-8")):
+            return True
+        length = int(self.headers.get("Content-Length") or 0)
+        while length > 0:
+            chunk = self.rfile.read(min(length, _BLOCK))
+            if not chunk:
+                break
+            length -= len(chunk)
+        self._send_json(401, {"error": "Token fehlt oder ist falsch"})
+        return False
+
+    def _route(self):
+        parsed = urlparse(self.path)
+        return [p for p in parsed.path.split("/") if p], parse_qs(parsed.query)
+
+    def _payload(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        parts, _ = self._route()
+        c = self.coordinator
+        if parts == ["health"]:
+            return self._send_json(200, {"ok": True, "nodes": len(c.nodes), "jobs": len(c.jobs)})
+        if parts == ["nodes"]:
+            return self._send_json(200, c.node_list())
+        if parts == ["jobs"]:
+            return self._send_json(200, [j.as_dict() for j in list(c.jobs.values())])
+        if parts == ["summary"]:
+            return self._send_json(200, c.summary())
+        if len(parts) == 2 and parts[0] == "jobs" and parts[1] in c.jobs:
+            return self._send_json(200, c.jobs[parts[1]].as_dict())
+        self._send_json(404, {"error": "Unbekannter Pfad"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        parts, query = self._route()
+        c = self.coordinator
+        try:
+            payload = self._payload()
+            if parts == ["jobs"]:
+                job = c.submit(payload["config"], int(payload.get("priority", 0)))
+                return self._send_json(202, job.as_dict())
+            if parts == ["nodes"]:
+                node = c.register(payload.get("name") or "node", int(payload.get("slots", 1)), payload.get("info"))
+                return self._send_json(201, {"id": node.id, "heartbeat_timeout": c.heartbeat_timeout})
+            if len(parts) == 3 and parts[0] == "nodes" and parts[2] == "next":
+                job = c.next_job(parts[1], float(query.get("wait", ["10"])[0]))
+                if job is None:
+                    return self._send_json(204)
+                return self._send_json(200, {"id": job.id, "config": job.config, "attempt": job.attempts})
+            if len(parts) == 3 and parts[0] == "nodes" and parts[2] == "heartbeat":
+                return self._send_json(200, c.heartbeat(parts[1], payload.get("logs")))
+            if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+                accepted = c.complete(parts[1], payload["node"], payload.get("result") or {}, payload.get("attempt"))
+                return self._send_json(200, {"accepted": accepted})
+        except KeyError as e:
+            return self._send_json(404, {"error": f"Unbekannt: {e}"})
+        except (ValueError, TypeError) as e:
+            return self._send_json(400, {"error": f"Ungültiger Request: {e}"})
+        self._send_json(404, {"error": "Unbekannter Pfad"})
+
+    def do_PUT(self):
+        if not self._authorized():
+            return
+        parts, _ = self._route()
+        if len(parts) != 4 or parts[0] != "jobs" or parts[2] != "artifacts":
+            return self._send_json(404, {"error": "Unbekannter Pfad"})
+        try:
+            length = int(self.headers["Content-Length"])
+            path = self.coordinator.store_artifact(parts[1], self.headers.get("X-Node"), parts[3], self.rfile,
+                                                   length, self.headers.get("X-Sha256"))
+        except KeyError:
+            return self._send_json(404, {"error": "Job unbekannt oder anderem Knoten zugewiesen"})
+        except (TypeError, ValueError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(201, {"path": str(path)})
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        parts, _ = self._route()
+        if len(parts) == 2 and parts[0] == "jobs" and self.coordinator.cancel(parts[1]):
+            return self._send_json(200, {"cancelled": parts[1]})
+        self._send_json(404, {"error": "Job nicht gefunden oder bereits fertig"})
+
+
+class FarmClient:
+    """Schlanker RPC-Client (nur stdlib) für Knoten und CLI."""
+
+    def __init__(self, url: str = "http://127.0.0.1:8790", timeout: float = 30.0, token: str = None):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self.token = token or os.environ.get(TOKEN_ENV)
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def _request(self, method: str, path: str, payload=None, timeout: float = None):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout or self.timeout)
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body else {}
+            conn.request(method, path, body=body, headers={**headers, **self._auth()})
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.status == 404:
+                raise KeyError(path)
+            if resp.status >= 400:
+                raise RuntimeError(f"Koordinator-Fehler {resp.status}: {data[:200]!r}")
+            return json.loads(data) if data else None
+        finally:
+            conn.close()
+
+    def submit(self, config: dict, priority: int = 0) -> dict:
+        return self._request("POST", "/jobs", {"config": config, "priority": priority})
+
+    def status(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def jobs(self) -> list:
+        return self._request("GET", "/jobs")
+
+    def nodes(self) -> list:
+        return self._request("GET", "/nodes")
+
+    def summary(self) -> dict:
+        return self._request("GET", "/summary")
+
+    def cancel(self, job_id: str) -> dict:
+        return self._request("DELETE", f"/jobs/{job_id}")
+
+    def register(self, name: str, slots: int, info: dict = None) -> dict:
+        return self._request("POST", "/nodes", {"name": name, "slots": slots, "info": info or {}})
+
+    def next_job(self, node_id: str, wait: float = 10.0):
+        return self._request("POST", f"/nodes/{node_id}/next?wait={wait}", {}, timeout=wait + self.timeout)
+
+    def heartbeat(self, node_id: str, logs: dict) -> dict:
+        return self._request("POST", f"/nodes/{node_id}/heartbeat", {"logs": logs})
+
+    def complete(self, job_id: str, node_id: str, result: dict, attempt: int = None) -> dict:
+        return self._request("POST", f"/jobs/{job_id}/result", {"node": node_id, "result": result,
+                                                                 "attempt": attempt})
+
+    def upload(self, job_id: str, node_id: str, path: Path):
+        """Streamt eine Datei zum Koordinator (sha256 wird dort geprüft)."""
+        path = Path(path)
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_BLOCK), b""):
+                h.update(block)
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.putrequest("PUT", f"/jobs/{job_id}/artifacts/{quote(path.name)}")
+            conn.putheader("Content-Length", str(path.stat().st_size))
+            conn.putheader("X-Node", node_id)
+            conn.putheader("X-Sha256", h.hexdigest())
+            for key, value in self._auth().items():
+                conn.putheader(key, value)
+            conn.endheaders()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(_BLOCK), b""):
+                    conn.send(block)
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.status >= 400:
+                raise RuntimeError(f"Upload {path.name} abgelehnt ({resp.status}): {data[:200]!r}")
+        finally:
+            conn.close()
+
+
+class FarmWorker:
+    """
+    Build-Knoten: holt Jobs per Long-Poll, baut sie in warmen Worker-Prozessen (wie der Daemon),
+    schickt Heartbeats mit Log-Zeilen und lädt Artefakte + Report zum Koordinator hoch.
+    'runner(job) -> dict' ersetzt optional die lokale Ausführung (z.B. für Tests ohne PyInstaller).
+    """
+
+    def __init__(self, url: str, name: str = None, slots: int = 1, runner=None, warm: bool = True,
+                 heartbeat_interval: float = 3.0, token: str = None):
+        self.client = FarmClient(url, token=token)
+        self.name = name or socket.gethostname()
+        self.slots = slots
+        self.heartbeat_interval = heartbeat_interval
+        self.node_id = None
+        self._pool = None
+        if runner is None:
+            from src.core.daemon import WarmWorkerPool
+            self._pool = WarmWorkerPool(size=slots, warm=warm)
+            runner = self._pool.run
+        self.runner = runner
+        self._running = {}       # job_id -> lokaler Job
+        self._log_offsets = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _register(self):
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                self.node_id = self.client.register(self.name, self.slots, {"pid": os.getpid()})["id"]
+                log.success(f"Knoten '{self.name}' beim Koordinator angemeldet (id {self.node_id}).")
+                return
+            except (OSError, RuntimeError, http.client.HTTPException) as e:
+                log.warning(f"Koordinator nicht erreichbar ({e}), neuer Versuch in {delay:.0f}s...")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 30.0)
+
+    def _prepare_config(self, config: dict) -> dict:
+        config = dict(config)
+        # Passwörter werden nie übertragen: jeder Knoten liest sie aus seiner eigenen Umgebung
+        if not config.get("cert_password") and config.get("password_env"):
+            config["cert_password"] = os.environ.get(config["password_env"], "")
+        return config
+
+    def _collect_files(self, result: dict) -> list:
+        artifact = result.get("artifact")
+        if not artifact or not Path(artifact).exists():
+            return []
+        artifact = Path(artifact)
+        files = [artifact] + [artifact.parent / name for name in _COMPANION_FILES]
+        files += sorted(artifact.parent.glob("*.cer"))
+        return [f for f in files if f.is_file()]
+
+    def _run_one(self, task: dict):
+        job = Job(self._prepare_config(task["config"]), job_id=task["id"])
+        job.set_status(Job.RUNNING)
+        with self._lock:
+            self._running[job.id] = job
+            self._log_offsets[job.id] = 0
+        log.info(f"[{self.name}] Starte {job.id} ({job.config.get('app_name')}, Versuch {task.get('attempt', 1)})")
+        try:
+            result = self.runner(job) or {}
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+
+        try:
+            if result.get("ok"):
+                for path in self._collect_files(result):
+                    self.client.upload(job.id, self.node_id, path)
+            self._flush_logs()
+        except Exception as e:
+            log.error(f"[{self.name}] Artefakte/Logs von {job.id} nicht übertragen: {e}")
+            if result.get("ok"):
+                result = {**result, "ok": False, "error": f"Upload fehlgeschlagen: {e}"}
+        finally:
+            # Immer ein Ergebnis melden, sonst bleibt der Job beim Koordinator 'running' und der Slot belegt
+            self._report(job.id, task.get("attempt"), result)
+            with self._lock:
+                self._running.pop(job.id, None)
+                self._log_offsets.pop(job.id, None)
+
+    def _report(self, job_id: str, attempt: int, result: dict, tries: int = 6):
+        delay = 1.0
+        for i in range(tries):
+            try:
+                self.client.complete(job_id, self.node_id, result, attempt)
+                return
+            except KeyError:
+                break  # Koordinator kennt Job/Knoten nicht mehr (Neustart)
+            except (OSError, RuntimeError, http.client.HTTPException) as e:
+                if i == tries - 1:
+                    break
+                log.warning(f"[{self.name}] Ergebnis von {job_id} nicht gemeldet ({e}), neuer Versuch in {delay:.0f}s...")
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+        log.error(f"[{self.name}] Ergebnis von {job_id} aufgegeben; der Koordinator plant den Job nach Ablauf neu ein.")
+
+    def _slot_loop(self):
+        while not self._stop.is_set():
+            try:
+                task = self.client.next_job(self.node_id, wait=10.0)
+            except KeyError:
+                self._register()  # Koordinator wurde neu gestartet
+                continue
+            except (OSError, RuntimeError, http.client.HTTPException) as e:
+                log.warning(f"[{self.name}] Koordinator nicht erreichbar: {e}")
+                self._stop.wait(2.0)
+                continue
+            if task:
+                self._run_one(task)
+
+    def _flush_logs(self):
+        with self._lock:
+            logs = {}
+            for job_id, job in self._running.items():
+                offset = self._log_offsets[job_id]
+                if len(job.logs) > offset:
+                    logs[job_id] = job.logs[offset:]
+                    self._log_offsets[job_id] = offset + len(logs[job_id])
+        reply = self.client.heartbeat(self.node_id, logs)
+        with self._lock:
+            for job_id in reply.get("cancel", []):
+                if job_id in self._running:
+                    self._running[job_id].cancel_requested = True
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self._flush_logs()
+            except KeyError:
+                self._register()
+            except (OSError, RuntimeError, http.client.HTTPException) as e:
+                log.debug(f"[{self.name}] Heartbeat fehlgeschlagen: {e}")
+
+    def run(self):
+        self._register()
+        threading.Thread(target=self._heartbeat_loop, name="FarmHeartbeat", daemon=True).start()
+        slots = [threading.Thread(target=self._slot_loop, name=f"FarmSlot-{i}", daemon=True)
+                 for i in range(self.slots)]
+        for t in slots:
+            t.start()
+        try:
+            while any(t.is_alive() for t in slots):
+                for t in slots:
+                    t.join(0.5)
+        except KeyboardInterrupt:
+            log.info(f"Knoten '{self.name}' wird beendet...")
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown()
@@ -0,0 +1,191 @@
+import time
+import heapq
+import itertools
+import threading
+import uuid
+from src.utils.helpers import log
+
+
+class Job:
+    """Ein Build-Auftrag inkl. Status und gestreamten Log-Zeilen."""
+
+    QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+    def __init__(self, config: dict, priority: int = 0, job_id: str = None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.config = config
+        self.priority = priority
+        self.status = self.QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.logs = []
+        self.cancel_requested = False
+        self._cond = threading.Condition()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def append_log(self, line: str):
+        with self._cond:
+            self.logs.append(line)
+            self._cond.notify_all()
+
+    def set_status(self, status: str, result: dict = None, error: str = None):
+        with self._cond:
+            self.status = status
+            if status == self.RUNNING:
+                self.started = time.time()
+            if status in (self.DONE, self.FAILED, self.CANCELLED):
+                self.finished = time.time()
+            if result is not None:
+                self.result = result
+            if error is not None:
+                self.error = error
+            self._cond.notify_all()
+
+    def follow_logs(self, offset: int = 0, timeout: float = 1.0):
+        """Generator über Log-Zeilen ab 'offset', der blockiert, bis der Job fertig ist."""
+        while True:
+            with self._cond:
+                while offset >= len(self.logs) and not self.is_finished:
+                    self._cond.wait(timeout)
+                lines = self.logs[offset:]
+                finished = self.is_finished
+            for line in lines:
+                yield line
+            offset += len(lines)
+            if finished and offset >= len(self.logs):
+                return
+
+    def wait(self, timeout: float = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.is_finished, timeout)
+
+    def as_dict(self) -> dict:
+        elapsed = None
+        if self.started:
+            elapsed = round((self.finished or time.time()) - self.started, 3)
+        return {
+            "id": self.id,
+            "app_name": self.config.get("app_name"),
+            "priority": self.priority,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "elapsed": elapsed,
+            "log_lines": len(self.logs),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Prioritäts-Queue mit Concurrency-Limit. Die eigentliche Ausführung übernimmt 'runner(job)',
+    der ein Ergebnis-dict liefert oder eine Exception wirft.
+    """
+
+    def __init__(self, runner, max_concurrent: int = 1):
+        self.runner = runner
+        self.max_concurrent = max_concurrent
+        self._heap = []
+        self._seq = itertools.count()
+        self._jobs = {}
+        self._running = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="JobDispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, config: dict, priority: int = 0) -> Job:
+        job = Job(config, priority)
+        with self._cond:
+            self._jobs[job.id] = job
+            # Höhere Priorität zuerst, bei Gleichstand FIFO
+            heapq.heappush(self._heap, (-priority, next(self._seq), job.id))
+            self._cond.notify_all()
+        log.info(f"Job {job.id} eingereiht (Prio {priority}): {config.get('app_name', '?')}")
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list:
+        with self._cond:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Queued Jobs werden sofort entfernt; laufende bekommen ein Cancel-Flag für den Runner."""
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return False
+        job.cancel_requested = True
+        if job.status == Job.QUEUED:
+            job.set_status(Job.CANCELLED)
+        return True
+
+    def set_concurrency(self, max_concurrent: int):
+        """Ändert das Limit zur Laufzeit; laufende Jobs werden nicht unterbrochen."""
+        with self._cond:
+            self.max_concurrent = max(1, int(max_concurrent))
+            self._cond.notify_all()
+
+    def remove_finished(self) -> int:
+        with self._cond:
+            # Abgebrochene, noch eingereihte Jobs stehen weiter im Heap -> Einträge zuerst bereinigen
+            self._heap = [entry for entry in self._heap
+                          if entry[2] in self._jobs and not self._jobs[entry[2]].is_finished]
+            heapq.heapify(self._heap)
+            queued = {entry[2] for entry in self._heap}
+            finished = [job_id for job_id, job in self._jobs.items() if job.is_finished and job_id not in queued]
+            for job_id in finished:
+                del self._jobs[job_id]
+            return len(finished)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _next_job(self):
+        while self._heap:
+            _, _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            if job is None or job.status != Job.QUEUED:
+                continue
+            return job
+        return None
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopped or (self._heap and self._running < self.max_concurrent))
+                if self._stopped:
+                    return
+                job = self._next_job()
+                if job is None:
+                    continue
+                self._running += 1
+                job.set_status(Job.RUNNING)
+            threading.Thread(target=self._run_job, args=(job,), name=f"Job-{job.id}", daemon=True).start()
+
+    def _run_job(self, job: Job):
+        try:
+            result = self.runner(job)
+            if job.cancel_requested:
+                job.set_status(Job.CANCELLED, result=result)
+            else:
+                ok = bool(result.get("ok", True)) if isinstance(result, dict) else bool(result)
+                job.set_status(Job.DONE if ok else Job.FAILED, result=result)
+        except Exception as e:
+            job.set_status(Job.CANCELLED if job.cancel_requested else Job.FAILED, error=str(e))
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
@@ -0,0 +1,390 @@
+import re
+import sys
+import importlib.metadata
+from pathlib import Path
+from src.utils.helpers import log
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    from packaging.specifiers import SpecifierSet, InvalidSpecifier
+    from packaging.markers import Marker, InvalidMarker
+except ImportError:
+    SpecifierSet = None
+    Marker = None
+
+
+# Kopfzeile bzw. '# via'-Kommentare von pip-compile / uv pip compile: Datei ist vollständig aufgelöst
+_COMPILED_MARKER = re.compile(r"^#.*autogenerated by (?:pip-compile|uv)|^\s*#\s*via\b", re.MULTILINE | re.IGNORECASE)
+
+
+def normalize_name(name: str) -> str:
+    """PEP 503 Normalisierung (Foo_Bar -> foo-bar)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class LockedRequirement:
+    """Ein einzelner Eintrag aus Lockfile / Requirements (Name, Specifier, Hashes, Marker)."""
+
+    def __init__(self, name: str, specifier: str = "", hashes: list = None, marker: str = "", raw: str = "", url: str = ""):
+        self.name = name
+        self.url = url
+        self.key = normalize_name(re.sub(r"\[.*\]", "", name))
+        self.specifier = specifier.strip()
+        self.hashes = hashes or []
+        self.marker = marker.strip()
+        self.raw = raw or f"{name}{self.specifier}"
+
+    def applies(self) -> bool:
+        """Prüft den Environment-Marker (z.B. sys_platform == 'win32')."""
+        if not self.marker or Marker is None:
+            return True
+        try:
+            return Marker(self.marker).evaluate()
+        except InvalidMarker:
+            return True
+
+    def is_satisfied_by(self, installed_version: str) -> bool:
+        if installed_version is None:
+            return False
+        if not self.specifier:
+            return True
+        if SpecifierSet is not None:
+            try:
+                return SpecifierSet(self.specifier).contains(installed_version, prereleases=True)
+            except InvalidSpecifier:
+                return True
+        # Fallback ohne 'packaging': Nur exakte Pins sind sicher prüfbar
+        if self.specifier.startswith("==") and "," not in self.specifier:
+            return self.specifier[2:].strip() == installed_version
+        return True
+
+    def to_pip_line(self) -> str:
+        line = f"{self.name} @ {self.url}" if self.url else f"{self.name}{self.specifier}"
+        if self.marker:
+            line += f" ; {self.marker}"
+        for h in self.hashes:
+            line += f" --hash={h}"
+        return line
+
+    def __repr__(self):
+        return f"LockedRequirement({self.raw!r})"
+
+
+class LockfileResolver:
+    """
+    Liest Dependency-Definitionen (poetry.lock, pip-tools Requirements, pyproject.toml)
+    und berechnet das exakte Delta zur installierten Umgebung.
+    """
+
+    # Reihenfolge = Priorität. Lockfiles gewinnen immer gegen lose Definitionen.
+    REQUIREMENT_FILES = ["requirements.lock", "requirements.txt", "Requirements.txt"]
+
+    def __init__(self, source: Path, requirements: list, locked: bool = False, pip_options: list = None):
+        self.source = source
+        self.requirements = requirements
+        self.locked = locked
+        self.pip_options = pip_options or []
+
+    # --- Erkennung ---
+
+    @classmethod
+    def detect(cls, project_path: Path):
+        """Sucht die beste Dependency-Quelle im Projekt. Gibt None zurück, wenn keine existiert."""
+        poetry_lock = project_path / "poetry.lock"
+        pyproject = project_path / "pyproject.toml"
+
+        if poetry_lock.exists() and tomllib is not None:
+            return cls.from_poetry_lock(poetry_lock)
+
+        for name in cls.REQUIREMENT_FILES:
+            candidate = project_path / name
+            if candidate.exists():
+                return cls.from_requirements(candidate)
+
+        if pyproject.exists() and tomllib is not None:
+            return cls.from_pyproject(pyproject)
+
+        return None
+
+    @classmethod
+    def from_requirements(cls, req_file: Path, _seen: set = None):
+        """Parst requirements.txt inkl. pip-tools Hashes, Zeilenfortsetzungen und '-r' Includes."""
+        seen = _seen if _seen is not None else set()
+        seen.add(req_file.resolve())
+
+        requirements, pip_options, includes = [], [], []
+        text = req_file.read_text(encoding="utf-8", errors="ignore")
+        compiled = bool(_COMPILED_MARKER.search(text))
+        # pip-tools schreibt Hashes über mehrere Zeilen mit '\'
+        text = re.sub(r"\\\r?\n", " ", text)
+
+        for line in text.splitlines():
+            line = line.split(" #", 1)[0].strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith(("-r ", "--requirement ")):
+                include = req_file.parent / line.split(None, 1)[1].strip()
+                if include.exists() and include.resolve() not in seen:
+                    sub = cls.from_requirements(include, seen)
+                    includes.append(sub)
+                    pip_options.extend(sub.pip_options)
+                continue
+
+            if line.startswith(("--index-url", "--extra-index-url", "-i ", "--trusted-host", "--find-links", "-f ")):
+                pip_options.extend(line.split(None, 1) if " " in line else [line])
+                continue
+
+            if line.startswith("-"):
+                # -e, -c etc. können wir nicht sinnvoll diffen
+                log.debug(f"Ignoriere Requirement-Option: {line}")
+                continue
+
+            req = cls._parse_requirement_line(line)
+            if req:
+                requirements.append(req)
+
+        # Exakt gepinnt heißt noch nicht vollständig: transitive Abhängigkeiten fehlen in handgeschriebenen
+        # Dateien. Als Lock (--no-deps) gilt die Datei nur mit Hashes für alles (pip erzwingt dann ohnehin
+        # Vollständigkeit) oder wenn pip-compile/uv sie erzeugt hat - samt aller Includes.
+        resolved = (compiled or not requirements) and all(sub.locked for sub in includes)
+        for sub in includes:
+            requirements.extend(sub.requirements)
+        pinned = bool(requirements) and all(r.specifier.startswith("==") for r in requirements)
+        hashed = all(r.hashes for r in requirements)
+        locked = pinned and (hashed or resolved)
+        if pinned and not locked:
+            log.debug(f"{req_file.name}: gepinnt, aber nicht erkennbar aufgelöst -> pip löst Abhängigkeiten auf")
+        return cls(req_file, requirements, locked=locked, pip_options=pip_options)
+
+    @classmethod
+    def from_poetry_lock(cls, lock_file: Path):
+        with open(lock_file, "rb") as f:
+            data = tomllib.load(f)
+
+        packages = data.get("package", [])
+        main = None
+        ungrouped = any("category" not in pkg and "groups" not in pkg for pkg in packages)
+        if ungrouped:
+            # lock-version 2.0 (Poetry 1.5-1.8) kennt weder 'category' noch 'groups': Die Hauptgruppe
+            # ergibt sich nur aus pyproject.toml und den Abhängigkeiten im Lock
+            pyproject = lock_file.parent / "pyproject.toml"
+            main = cls._poetry_main_packages(pyproject, packages)
+            if main is None:
+                log.warning(f"{lock_file.name}: Hauptgruppe nicht bestimmbar -> pip löst Abhängigkeiten auf")
+                if pyproject.exists():
+                    return cls.from_pyproject(pyproject)
+
+        requirements = []
+        for pkg in packages:
+            # Dev-Abhängigkeiten gehören nicht in den Build
+            if pkg.get("category", "main") != "main":
+                continue
+            groups = pkg.get("groups")
+            if groups is not None and "main" not in groups:
+                continue
+            if main is not None and normalize_name(pkg["name"]) not in main:
+                continue
+            if pkg.get("optional", False):
+                continue
+
+            marker = pkg.get("markers", "")
+            if isinstance(marker, dict):
+                marker = marker.get("main", "")
+
+            source_type = (pkg.get("source") or {}).get("type")
+            hashes = []
+            if source_type in (None, "legacy"):
+                hashes = [f["hash"] for f in pkg.get("files", []) if f.get("hash")]
+
+            requirements.append(LockedRequirement(
+                pkg["name"], f"=={pkg['version']}", hashes=hashes, marker=marker or ""
+            ))
+
+        # Ohne pyproject.toml bleibt die Gruppe unbekannt -> nicht als vollständigen Lock behandeln
+        return cls(lock_file, requirements, locked=not ungrouped or main is not None)
+
+    @classmethod
+    def _poetry_main_packages(cls, pyproject: Path, packages: list):
+        """
+        Normalisierte Namen aller Pakete der Hauptgruppe: direkte Abhängigkeiten aus pyproject.toml plus
+        deren transitive Abhängigkeiten (inkl. angeforderter Extras) laut Lock. None, wenn pyproject.toml
+        fehlt oder nicht zum Lock passt.
+        """
+        if not pyproject.exists():
+            return None
+        try:
+            with open(pyproject, "rb") as f:
+                data = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError):
+            return None
+
+        roots = []
+        for dep in data.get("project", {}).get("dependencies", []):
+            req = cls._parse_requirement_line(dep)
+            if req:
+                extras = re.search(r"\[(.*)\]", req.name)
+                roots.append((req.key, [e.strip() for e in extras.group(1).split(",")] if extras else []))
+        for name, constraint in data.get("tool", {}).get("poetry", {}).get("dependencies", {}).items():
+            optional, extras = cls._poetry_dependency(constraint)
+            if name.lower() != "python" and not optional:
+                roots.append((normalize_name(name), extras))
+
+        by_key = {normalize_name(pkg["name"]): pkg for pkg in packages}
+        main, seen_extras, stack = set(), set(), roots
+        while stack:
+            key, extras = stack.pop()
+            pkg = by_key.get(key)
+            if pkg is None:
+                log.debug(f"{key} fehlt im Lock (veraltet?)")
+                return None
+            wanted = []
+            if key not in main:
+                main.add(key)
+                wanted = [name for name, c in pkg.get("dependencies", {}).items() if not cls._poetry_dependency(c)[0]]
+            for extra in extras:
+                if (key, extra) in seen_extras:
+                    continue
+                seen_extras.add((key, extra))
+                for entry in pkg.get("extras", {}).get(extra, []):
+                    m = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", entry)
+                    if m:
+                        wanted.append(m.group(0))
+            deps = pkg.get("dependencies", {})
+            stack.extend((normalize_name(name), cls._poetry_dependency(deps.get(name, "*"))[1]) for name in wanted)
+        return main
+
+    @staticmethod
+    def _poetry_dependency(constraint) -> tuple:
+        """(optional, extras) einer Poetry-Abhängigkeit ("^1.2", {version, optional, extras} oder Liste davon)."""
+        entries = [c for c in (constraint if isinstance(constraint, list) else [constraint]) if isinstance(c, dict)]
+        if not entries:
+            return False, []
+        optional = all(c.get("optional", False) for c in entries)
+        return optional, sorted({extra for c in entries for extra in c.get("extras", [])})
+
+    @classmethod
+    def from_pyproject(cls, pyproject: Path):
+        """Fallback ohne Lockfile: PEP 621 oder [tool.poetry.dependencies]."""
+        with open(pyproject, "rb") as f:
+            data = tomllib.load(f)
+
+        requirements = []
+        for dep in data.get("project", {}).get("dependencies", []):
+            req = cls._parse_requirement_line(dep)
+            if req:
+                requirements.append(req)
+
+        poetry_deps = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
+        for name, constraint in poetry_deps.items():
+            if name.lower() == "python":
+                continue
+            marker = ""
+            if isinstance(constraint, dict):
+                if constraint.get("optional", False):
+                    continue
+                marker = constraint.get("markers", "")
+                constraint = constraint.get("version", "*")
+            requirements.append(LockedRequirement(name, cls._poetry_constraint(str(constraint)), marker=marker))
+
+        return cls(pyproject, requirements, locked=False)
+
+    # --- Parser Helfer ---
+
+    @staticmethod
+    def _parse_requirement_line(line: str):
+        hashes = re.findall(r"--hash[= ](\S+)", line)
+        line = re.sub(r"--hash[= ]\S+", "", line).strip()
+
+        marker = ""
+        if ";" in line:
+            line, marker = line.split(";", 1)
+
+        line = line.strip()
+        # Direkte Referenzen (name @ url): Nur auf Name prüfen
+        if " @ " in line:
+            name, url = (part.strip() for part in line.split(" @ ", 1))
+            return LockedRequirement(name, "", hashes, marker, raw=line, url=url)
+
+        m = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*(.*)$", line)
+        if not m:
+            log.debug(f"Konnte Requirement nicht parsen: {line}")
+            return None
+        name, extras, spec = m.group(1), m.group(2) or "", m.group(3)
+        return LockedRequirement(name + extras, spec.replace(" ", ""), hashes, marker, raw=line)
+
+    @staticmethod
+    def _poetry_constraint(constraint: str) -> str:
+        """Übersetzt Poetry Syntax (^1.2, ~1.2, 1.2.*) nach PEP 440."""
+        constraint = constraint.strip()
+        if constraint in ("", "*"):
+            return ""
+        if constraint.startswith("^"):
+            parts = constraint[1:].split(".")
+            nums = [int(p) if p.isdigit() else 0 for p in parts]
+            idx = next((i for i, n in enumerate(nums) if n != 0), len(nums) - 1)
+            upper = nums[:idx] + [nums[idx] + 1]
+            return f">={constraint[1:]},<{'.'.join(map(str, upper))}"
+        if constraint.startswith("~") and not constraint.startswith("~="):
+            parts = constraint[1:].split(".")
+            if len(parts) == 1:
+                return f">={parts[0]},<{int(parts[0]) + 1}"
+            upper = f"{parts[0]}.{int(parts[1]) + 1}"
+            return f">={constraint[1:]},<{upper}"
+        if constraint[0].isdigit():
+            return f"=={constraint}"
+        return constraint
+
+    # --- Delta ---
+
+    @staticmethod
+    def installed_distributions() -> dict:
+        """Ein einziger Scan über site-packages: {normalisierter Name: Version}."""
+        installed = {}
+        for dist in importlib.metadata.distributions():
+            name = dist.metadata["Name"]
+            if name:
+                installed.setdefault(normalize_name(name), dist.version)
+        return installed
+
+    def compute_delta(self, installed: dict = None) -> list:
+        """Liefert alle Requirements, die fehlen oder in der falschen Version installiert sind."""
+        if installed is None:
+            installed = self.installed_distributions()
+        delta = []
+        for req in self.requirements:
+            if not req.applies():
+                continue
+            if not req.is_satisfied_by(installed.get(req.key)):
+                delta.append(req)
+        return delta
+
+    def build_pip_command(self, delta: list, req_file: Path) -> list:
+        """Schreibt das Delta in eine temporäre Requirements-Datei und baut EINEN pip Aufruf."""
+        # pip aktiviert den Hash-Modus global, sobald eine Zeile einen Hash hat -> alles oder nichts
+        use_hashes = bool(delta) and all(req.hashes for req in delta)
+        if not use_hashes and any(req.hashes for req in delta):
+            log.warning("Nicht alle gelockten Pakete haben Hashes. Installiere ohne --require-hashes.")
+
+        with open(req_file, "w", encoding="utf-8") as f:
+            for req in delta:
+                line = req.to_pip_line() if use_hashes else LockedRequirement(
+                    req.name, req.specifier, marker=req.marker, url=req.url).to_pip_line()
+                f.write(line + "\n")
+
+        cmd = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check"]
+        cmd += self.pip_options
+        if self.locked:
+            # Lockfile ist vollständig aufgelöst -> keine erneute Dependency-Auflösung
+            cmd.append("--no-deps")
+        if use_hashes:
+            cmd.append("--require-hashes")
+        cmd += ["-r", str(req_file)]
+        return cmd
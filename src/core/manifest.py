@@ -0,0 +1,239 @@
+import os
+import time
+import json
+import getpass
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from src.core.builder import app_build_dir
+from src.utils.helpers import log
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+class ManifestError(ValueError):
+    """Manifest ist syntaktisch oder inhaltlich ungültig."""
+
+
+class BatchManifest:
+    """
+    Deklarative Liste mehrerer Apps (TOML oder YAML).
+
+    Beispiel (TOML):
+        [defaults]
+        cert_name = "MyCert"
+        password_env = "EXEBUILDER_CERT_PASSWORD"
+        parallel = 2
+
+        [[app]]
+        name = "ToolA"
+        script = "tool_a/main.py"
+        assets = ["tool_a/config"]
+        icon = "tool_a/icon.ico"
+        console = false
+    """
+
+    # Manifest-Schlüssel -> Pipeline-Config (run_full_pipeline)
+    KEY_MAP = {
+        "name": "app_name",
+        "script": "script_file",
+        "icon": "icon_path",
+        "assets": "assets",
+        "console": "console",
+        "one_file": "one_file",
+        "cert_mode": "cert_mode",
+        "cert_name": "cert_name",
+        "pfx": "pfx_path",
+        "use_openssl": "use_openssl",
+    }
+    PATH_KEYS = ("script_file", "icon_path", "pfx_path")
+
+    def __init__(self, path: Path, defaults: dict, apps: list):
+        self.path = path
+        self.defaults = defaults
+        self.apps = apps
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchManifest":
+        path = Path(path)
+        if not path.exists():
+            raise ManifestError(f"Manifest nicht gefunden: {path}")
+
+        if path.suffix.lower() == ".toml":
+            if tomllib is None:
+                raise ManifestError("TOML benötigt Python 3.11+ oder das Paket 'tomli'.")
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        elif path.suffix.lower() in (".yaml", ".yml"):
+            import yaml
+            with open(path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+        else:
+            raise ManifestError(f"Unbekanntes Manifest-Format: {path.suffix} (erwartet .toml/.yaml)")
+
+        defaults = data.get("defaults", {})
+        raw_apps = data.get("app") or data.get("apps") or []
+        if not raw_apps:
+            raise ManifestError("Manifest enthält keine Apps ([[app]] bzw. 'apps:').")
+
+        apps, seen = [], set()
+        for raw in raw_apps:
+            entry = cls._to_config(path.parent, {**defaults, **raw})
+            if entry["app_name"] in seen:
+                # Gleicher Name -> gleicher Build-Baum und gleiche EXE -> Race
+                raise ManifestError(f"App-Name doppelt im Manifest: {entry['app_name']}")
+            seen.add(entry["app_name"])
+            apps.append(entry)
+        return cls(path, defaults, apps)
+
+    @classmethod
+    def _to_config(cls, base: Path, raw: dict) -> dict:
+        if "script" not in raw or "name" not in raw:
+            raise ManifestError(f"App-Eintrag braucht 'name' und 'script': {raw}")
+
+        config = {"cert_mode": "auto", "cert_name": "MyCert", "console": True, "one_file": True, "assets": []}
+        for key, target in cls.KEY_MAP.items():
+            if key in raw:
+                config[target] = raw[key]
+        if "pfx_path" in config and "cert_mode" not in raw:
+            config["cert_mode"] = "file"
+
+        # Relative Pfade beziehen sich auf das Manifest, nicht auf das Arbeitsverzeichnis
+        for key in cls.PATH_KEYS:
+            if config.get(key):
+                config[key] = str((base / config[key]).resolve())
+        config["assets"] = [str((base / a).resolve()) for a in config.get("assets", [])]
+        config["password_env"] = raw.get("password_env", "")
+        return config
+
+
+class BatchRunner:
+    """
+    Nicht-interaktiver Runner für ein BatchManifest.
+    Environment-Check, Zertifikat und Passwort-Abfrage passieren genau einmal für alle Einträge.
+    """
+
+    def __init__(self, orchestrator, manifest: BatchManifest, parallel: int = None):
+        self.orchestrator = orchestrator
+        self.manifest = manifest
+        self.parallel = parallel or int(manifest.defaults.get("parallel", 1))
+        self._passwords = {}
+
+    @staticmethod
+    def _cert_key(config: dict) -> tuple:
+        if config.get("cert_mode") == "file":
+            return ("file", config.get("pfx_path"))
+        return ("auto", config.get("cert_name"))
+
+    def _password_for(self, config: dict) -> str:
+        """Passwort einmal pro Zertifikat: Env-Variable, sonst eine einzige interaktive Abfrage."""
+        key = self._cert_key(config)
+        if key not in self._passwords:
+            env_name = config.get("password_env")
+            password = os.environ.get(env_name) if env_name else None
+            if password is None:
+                password = getpass.getpass(f"Passwort für Zertifikat '{key[1]}': ")
+            self._passwords[key] = password
+        return self._passwords[key]
+
+    @staticmethod
+    def _unlock(pfx: Path, password: str) -> bool:
+        """Prüft das PFX-Passwort einmal vorab, statt 40x am Signier-Tool zu scheitern."""
+        try:
+            from cryptography.hazmat.primitives.serialization import pkcs12
+        except ImportError:
+            return True
+        try:
+            pkcs12.load_key_and_certificates(pfx.read_bytes(), password.encode("utf-8"))
+            return True
+        except ValueError:
+            return False
+
+    def prepare(self):
+        """Geteilte Vorbereitung: Environment, Zertifikate, Passwörter."""
+        log.info(f"Batch: {len(self.manifest.apps)} Apps aus {self.manifest.path.name}")
+        self.orchestrator.ensure_environment()
+
+        for config in self.manifest.apps:
+            config["cert_password"] = self._password_for(config)
+        self._assign_build_dirs()
+
+        unlocked = set()
+        for config in self.manifest.apps:
+            key = self._cert_key(config)
+            if key in unlocked:
+                continue
+            pfx, _ = self.orchestrator.get_cert_tuple(config)
+            if not self._unlock(pfx, config["cert_password"]):
+                raise ManifestError(f"Falsches Passwort für Zertifikat {pfx.name}")
+            unlocked.add(key)
+
+    def _assign_build_dirs(self):
+        """Eigener Build-Baum pro Eintrag (dist/work/spec, PyInstaller-Cache): parallele Einträge
+        dürfen sich weder Ausgaben noch den per --clean geleerten Cache teilen."""
+        used = set()
+        for config in self.manifest.apps:
+            build_dir, n = app_build_dir(config["app_name"]), 1
+            while build_dir in used:  # "Tool A" und "Tool_A" ergeben denselben Ordnernamen
+                n += 1
+                build_dir = app_build_dir(config["app_name"], f"_{n}")
+            used.add(build_dir)
+            config["build_dir"] = str(build_dir)
+
+    def _run_entry(self, config: dict) -> dict:
+        start = time.perf_counter()
+        try:
+            run = self.orchestrator.run_full_pipeline(config)
+        except Exception as e:
+            return {"app": config["app_name"], "ok": False, "duration": time.perf_counter() - start, "error": str(e)}
+
+        entry = {"app": config["app_name"], "ok": bool(run and run.ok),
+                 "duration": time.perf_counter() - start, "error": None, "artifact": None}
+        if run is None:
+            entry["error"] = "Script nicht gefunden"
+        elif run.ok:
+            entry["artifact"] = str(run.context["signed"])
+            entry["stages"] = {r.name: round(r.duration, 3) for r in run.results.values()}
+        else:
+            entry["error"] = "; ".join(f"{r.name}: {r.error}" for r in run.failed)
+        return entry
+
+    def run(self) -> dict:
+        start = time.perf_counter()
+        self.prepare()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.parallel), thread_name_prefix="batch") as pool:
+            results = list(pool.map(self._run_entry, self.manifest.apps))
+
+        summary = {
+            "manifest": str(self.manifest.path),
+            "parallel": self.parallel,
+            "total": len(results),
+            "succeeded": sum(1 for r in results if r["ok"]),
+            "wall_time": round(time.perf_counter() - start, 3),
+            "apps": results,
+        }
+        self.log_summary(summary)
+        return summary
+
+    @staticmethod
+    def log_summary(summary: dict):
+        log.info("=== BATCH ZUSAMMENFASSUNG ===")
+        for r in summary["apps"]:
+            status = "OK  " if r["ok"] else "FAIL"
+            detail = r.get("artifact") or r.get("error") or ""
+            log.info(f" [{status}] {r['app']:<24} {r['duration']:7.2f}s  {detail}")
+        msg = f"{summary['succeeded']}/{summary['total']} erfolgreich in {summary['wall_time']:.2f}s"
+        if summary["succeeded"] == summary["total"]:
+            log.success(msg)
+        else:
+            log.error(msg)
+
+    @staticmethod
+    def write_summary(summary: dict, path: Path):
+        Path(path).write_text(json.dumps(summary, indent=2), encoding="utf-8")
@@ -1,68 +1,225 @@
+import os
 import time
-import socket
-import subprocess
-import sys
+import random
+import asyncio
+import threading
 from src.utils.helpers import log
+from src.utils.tracing import tracer
+
+
+class ConnectivityMonitor:
+    """
+    Asynchroner Verbindungs-Monitor.
+    Prüft mehrere Endpunkte parallel (erster Erfolg gewinnt) und cached das Ergebnis mit kurzer TTL,
+    damit sich alle Build-Worker eines Prozesses einen einzigen Probe teilen.
+    """
+
+    # DNS (53) statt ICMP, da ICMP oft blockiert ist. PyPI zusätzlich, falls DNS-Ports gesperrt sind.
+    DEFAULT_ENDPOINTS = (("8.8.8.8", 53), ("1.1.1.1", 53), ("pypi.org", 443))
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, endpoints=None, timeout: float = 3.0, ttl: float = 5.0, offline_ttl: float = 1.0):
+        self.endpoints = tuple(endpoints or self.DEFAULT_ENDPOINTS)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.offline_ttl = offline_ttl
+
+        self._state = None
+        self._checked_at = 0.0
+        self._probe_lock = threading.Lock()
+        self._bg_running = False
+        self._bg_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, endpoints=None, timeout: float = 3.0, ttl: float = 5.0):
+        """Liefert eine prozessweite Instanz pro Endpunkt-Set."""
+        key = tuple(endpoints or cls.endpoints_from_env() or cls.DEFAULT_ENDPOINTS)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(key, timeout=timeout, ttl=ttl)
+            return cls._shared[key]
+
+    @staticmethod
+    def endpoints_from_env():
+        """EXEBUILDER_PROBE_ENDPOINTS='host:port,host:port' überschreibt die Standard-Endpunkte."""
+        raw = os.environ.get("EXEBUILDER_PROBE_ENDPOINTS", "").strip()
+        endpoints = []
+        for item in filter(None, (x.strip() for x in raw.split(","))):
+            host, _, port = item.rpartition(":")
+            if host and port.isdigit():
+                endpoints.append((host, int(port)))
+        return tuple(endpoints)
+
+    # --- Probe ---
+
+    async def _probe_endpoint(self, host: str, port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def probe(self) -> bool:
+        """Prüft alle Endpunkte gleichzeitig. Sobald einer antwortet, werden die übrigen abgebrochen."""
+        tasks = [asyncio.ensure_future(self._probe_endpoint(h, p)) for h, p in self.endpoints]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                if await fut:
+                    return True
+            return False
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # --- Cache ---
+
+    def _is_fresh(self) -> bool:
+        if self._state is None:
+            return False
+        ttl = self.ttl if self._state else self.offline_ttl
+        return (time.monotonic() - self._checked_at) < ttl
+
+    def refresh(self) -> bool:
+        """Blockierender Probe (nicht aus einem laufenden Event-Loop aufrufen). Parallele Aufrufer teilen sich das Ergebnis."""
+        with self._probe_lock:
+            if self._is_fresh():
+                return self._state
+            online = asyncio.run(self.probe())
+            self._state = online
+            self._checked_at = time.monotonic()
+            return online
+
+    def _refresh_in_background(self):
+        with self._bg_lock:
+            if self._bg_running:
+                return
+            self._bg_running = True
+
+        def worker():
+            try:
+                self.refresh()
+            finally:
+                self._bg_running = False
+
+        threading.Thread(target=worker, name="ConnectivityProbe", daemon=True).start()
+
+    def is_online(self) -> bool:
+        """Nicht-blockierend: Liefert den letzten bekannten Zustand und stößt bei Bedarf einen Hintergrund-Probe an."""
+        if not self._is_fresh():
+            self._refresh_in_background()
+        return bool(self._state)
+
+    # --- Warten ---
+
+    @staticmethod
+    def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+        """Exponentieller Backoff mit 'Full Jitter', damit Worker nicht im Gleichschritt proben."""
+        return random.uniform(base_delay, min(max_delay, base_delay * (2 ** attempt)))
+
+    async def wait_online(self, timeout: float = None, base_delay: float = 0.5, max_delay: float = 30.0) -> bool:
+        """Wartet asynchron auf Konnektivität. Gibt False zurück, wenn das Timeout abläuft."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        attempt = 0
+        while True:
+            if self._is_fresh() and self._state:
+                return True
+            if await asyncio.to_thread(self.refresh):
+                return True
+
+            delay = self.backoff_delay(attempt, base_delay, max_delay)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def wait_online_blocking(self, timeout: float = None, base_delay: float = 0.5, max_delay: float = 30.0,
+                             on_wait=None) -> bool:
+        """Synchrone Variante von wait_online() für Threads ohne Event-Loop."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            if self.refresh():
+                return True
+
+            elapsed = time.monotonic() - start
+            delay = self.backoff_delay(attempt, base_delay, max_delay)
+            if timeout is not None:
+                if elapsed >= timeout:
+                    return False
+                delay = min(delay, timeout - elapsed)
+            if on_wait:
+                on_wait(elapsed, delay)
+            time.sleep(delay)
+            attempt += 1
+
 
 class NetworkGuard:
     """
     Stellt sicher, dass eine Netzwerkverbindung besteht, bevor Aktionen ausgeführt werden.
-    Implementiert einen 'Pause & Resume' Mechanismus.
+    Implementiert einen 'Pause & Resume' Mechanismus auf Basis des geteilten ConnectivityMonitor.
     """
 
-    def __init__(self, target="8.8.8.8", port=53, timeout=3):
+    def __init__(self, target="8.8.8.8", port=53, timeout=3, endpoints=None):
         self.target = target
         self.port = port
         self.timeout = timeout
+        if endpoints is None and (target, port) != ConnectivityMonitor.DEFAULT_ENDPOINTS[0]:
+            endpoints = [(target, port)]
+        self.monitor = ConnectivityMonitor.shared(endpoints, timeout=timeout)
 
     def check_connection(self) -> bool:
-        """Prüft die Verbindung via Socket Connect (schneller als ICMP Ping)."""
-        try:
-            # Wir nutzen DNS Port 53, da ICMP oft blockiert ist
-            socket.setdefaulttimeout(self.timeout)
-            socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((self.target, self.port))
-            return True
-        except socket.error:
-            return False
+        """Prüft die Verbindung (gecached, ohne globalen Socket-Timeout)."""
+        return self.monitor.refresh()
 
-    def wait_for_network(self):
+    def is_online(self) -> bool:
+        """Nicht-blockierender Status (letzter bekannter Zustand)."""
+        return self.monitor.is_online()
+
+    def wait_for_network(self, timeout: float = None) -> bool:
         """
         Blockiert die Ausführung solange, bis das Netzwerk verfügbar ist.
-        Zeigt einen Status an.
+        Meldet den Status über den Logger statt direkt auf stdout.
         """
         if self.check_connection():
-            return
+            return True
+
+        with tracer.span("network:wait", cat="network", timeout=timeout) as span:
+            online = self._wait_offline(timeout)
+            span.set(online=online)
+        return online
 
+    def _wait_offline(self, timeout: float = None) -> bool:
         log.warning("Netzwerkverbindung verloren! Warte auf Wiederherstellung...")
-        
-        start_time = time.time()
-        while not self.check_connection():
-            elapsed = int(time.time() - start_time)
-            sys.stdout.write(f"\rWarte auf Netzwerk... ({elapsed}s)")
-            sys.stdout.flush()
-            time.sleep(2) # Prüfe alle 2 Sekunden
-        
-        print() # Newline nach dem Counter
-        log.success("Netzwerkverbindung wiederhergestellt. Setze fort.")
+        last_report = [0.0]
+
+        def report(elapsed, delay):
+            if elapsed - last_report[0] >= 10:
+                last_report[0] = elapsed
+                log.info(f"Warte auf Netzwerk... ({int(elapsed)}s)")
+
+        if self.monitor.wait_online_blocking(timeout=timeout, on_wait=report):
+            log.success("Netzwerkverbindung wiederhergestellt. Setze fort.")
+            return True
+        log.error(f"Keine Netzwerkverbindung nach {int(timeout)}s.")
+        return False
 
     def run_with_retry(self, func, *args, **kwargs):
         """
-        Wrapper, um eine Funktion auszuführen. Wenn sie wegen Netzwerk failt, 
-        wird gewartet und neu versucht.
+        Wrapper, um eine Funktion auszuführen. Wenn sie wegen Netzwerk failt,
+        wird gewartet und neu versucht (Klassifizierung über den Exception-Typ).
         """
-        max_retries = 5
-        attempt = 0
-        
-        while attempt < max_retries:
-            self.wait_for_network()
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                # Einfache Heuristik: Wenn es ein Netzwerkfehler zu sein scheint
-                if "Connection" in str(e) or "Network" in str(e) or "Timeout" in str(e):
-                    attempt += 1
-                    log.warning(f"Fehler bei Ausführung (Versuch {attempt}/{max_retries}): {e}")
-                    time.sleep(2)
-                else:
-                    raise e
-        raise ConnectionError("Maximale Anzahl an Wiederholungen überschritten.")
+        from src.core.retry import retry_engine
+
+        step = getattr(func, "__name__", "task")
+        return retry_engine.call(step, lambda: func(*args, **kwargs), network=self)
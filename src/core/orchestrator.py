@@ -1,7 +1,8 @@
+import os
 import shutil
-import time
-import importlib.util
 import sys
+import threading
+import contextlib
 from pathlib import Path
 from typing import List, Tuple, Optional
 
@@ -9,9 +10,24 @@ from typing import List, Tuple, Optional
 from src.core.environment import EnvironmentManager
 from src.core.certs import CertificateManager
 from src.core.signer import AuthenticodeSigner
-from src.core.builder import PyBuilder
+from src.core.builder import PyBuilder, native_optimize, contents_dir
 from src.core.network import NetworkGuard
+from src.core.retry import retry_engine
+from src.core.pipeline import Stage, PipelineScheduler, PipelineRun, PipelineError
+from src.core.readiness import ArtifactWatcher, verify_executable
+from src.core.config_detect import BuildConfigScanner
+from src.core.assets import AssetStager
+from src.core.bytecode import BytecodeCache
+from src.core.watch import WatchSession
+from src.core.resources import ResourceLimits
+from src.core.reproducible import (source_date_epoch, build_environment, normalize_executable,
+                                   DeterminismCheck)
+from src.core.assets import file_digest
+from src.core.delta import ReleaseStore
+from src.core.artifact_store import ArtifactStore
+from src.core.remote_cache import BuildFingerprint, RemoteBuildCache
 from src.utils.helpers import log
+from src.utils.tracing import tracer
 
 class BuildOrchestrator:
     
@@ -20,13 +36,59 @@ class BuildOrchestrator:
         self.cert_manager = CertificateManager(cert_store_path=Path("certs_store"))
         self.signer = AuthenticodeSigner()
         self.builder = PyBuilder()
+        # Eigene Build-Bäume pro 'build_dir' (parallele Jobs/Batch-Einträge teilen sich sonst dist/work)
+        self._builders = {}
+        self._builders_lock = threading.Lock()
         self.network = NetworkGuard()
+        self.artifact_watcher = ArtifactWatcher()
+        self.config_scanner = BuildConfigScanner()
+        self.asset_stager = AssetStager()
+        self.bytecode_cache = BytecodeCache()
+        self.release_store = ReleaseStore()
+        self.artifact_store = ArtifactStore()
+        self.fingerprinter = BuildFingerprint(self.asset_stager.hash_cache)
+        # Langlebige Orchestratoren (Daemon, GUI) prüfen die Umgebung nur einmal
+        self._env_locks = {"tools": threading.Lock(), "deps": threading.Lock()}
+        self._env_ready = set()
+        # Zertifikate werden pro Orchestrator nur einmal aufgelöst/erstellt (Batch-Läufe, parallele Jobs)
+        self._cert_lock = threading.Lock()
+        self._cert_cache = {}
         
     def setup_environment(self, project_root: Path):
         self.env_manager.prepare_environment(project_root)
 
+    def ensure_environment(self, project_root: Path = None):
+        """Tools und Dependencies einmalig vorbereiten (idempotent, thread-safe)."""
+        self._stage_tools({})
+        if project_root is None:
+            self._stage_deps({})
+        else:
+            self._prepare_once("deps", lambda: self.env_manager.prepare_dependencies(project_root))
+
+    def invalidate_environment(self, *keys):
+        """Erzwingt eine erneute Prüfung (z.B. wenn sich requirements.txt geändert hat)."""
+        for key in keys:
+            with self._env_locks[key]:
+                self._env_ready.discard(key)
+
+    @staticmethod
+    def _cert_key(config: dict) -> tuple:
+        if config.get("cert_mode", "auto") == "file":
+            return ("file", str(Path(config.get("pfx_path") or "").resolve()))
+        return ("auto", config.get("cert_name", "MyCert"))
+
     def get_cert_tuple(self, config: dict) -> tuple[Path, Path]:
-        # (Zertifikatslogik unverändert)
+        key = self._cert_key(config)
+        with self._cert_lock:
+            cached = self._cert_cache.get(key)
+            tracer.current().set(cert_mode=key[0], cache_hit=bool(cached and cached[0].exists()))
+            if cached and cached[0].exists():
+                return cached
+            result = self._resolve_cert(config)
+            self._cert_cache[key] = result
+            return result
+
+    def _resolve_cert(self, config: dict) -> tuple[Path, Path]:
         mode = config.get("cert_mode", "auto")
         password = config.get("cert_password", "")
         
@@ -51,129 +113,469 @@ class BuildOrchestrator:
                 f.write("Bitte install_cert.bat als Administrator ausführen!\nDann Programm starten.")
         except: pass
 
+    @tracer.traced("config:detect", cat="config")
     def detect_config_from_assets(self, assets: List[str]) -> Tuple[List[str], Path, str]:
         """
         Sucht in den vom User bereitgestellten Assets nach einer Config-Datei.
         Rückgabe: (Argumente, ProjectRoot, ConfigFilePath)
         """
-        for asset_path in assets:
-            path_obj = Path(asset_path)
-            
-            # Wir suchen nur nach .py Dateien in der Asset-Liste
-            if not path_obj.exists() or path_obj.suffix.lower() != ".py":
-                continue
-            
-            try:
-                # Schnell-Check: Enthält die Datei unser Keyword?
-                with open(path_obj, "r", encoding="utf-8", errors="ignore") as f:
-                    if "PYINSTALLER_CMD_ARGS" not in f.read():
-                        continue
-                
+        try:
+            for asset_path in assets:
+                path_obj = Path(asset_path)
+
+                # Wir suchen nur nach .py Dateien in der Asset-Liste
+                if not path_obj.exists() or path_obj.suffix.lower() != ".py":
+                    continue
+
+                try:
+                    # Kein Import/exec mehr: Nur das Literal PYINSTALLER_CMD_ARGS wird per AST gelesen (gecached)
+                    args = self.config_scanner.extract(path_obj)
+                except Exception as e:
+                    log.warning(f"Konnte Asset {path_obj.name} nicht als Config laden: {e}")
+                    continue
+                if args is None:
+                    continue
+
                 log.info(f"🔧 Build-Config in Assets erkannt: {path_obj.name}")
-                
-                # Importieren
-                spec = importlib.util.spec_from_file_location("asset_config", str(path_obj))
-                mod = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(mod)
-                
-                if hasattr(mod, "PYINSTALLER_CMD_ARGS"):
-                    args = getattr(mod, "PYINSTALLER_CMD_ARGS")
-                    
-                    # Root ermitteln: Wenn die Datei in 'scripts' liegt, ist Root eins drüber.
-                    # Sonst ist Root der Ordner der Datei.
-                    project_root = path_obj.parent
-                    if project_root.name in ["scripts", "config"]:
-                        project_root = project_root.parent
-                        
-                    log.success(f"✅ Konfiguration geladen! Root: {project_root}")
-                    return args, project_root, str(path_obj)
-                    
-            except Exception as e:
-                log.warning(f"Konnte Asset {path_obj.name} nicht als Config laden: {e}")
-                continue
-        
+
+                # Root ermitteln: Wenn die Datei in 'scripts' liegt, ist Root eins drüber.
+                # Sonst ist Root der Ordner der Datei.
+                project_root = path_obj.parent
+                if project_root.name in ["scripts", "config"]:
+                    project_root = project_root.parent
+
+                log.success(f"✅ Konfiguration geladen! Root: {project_root}")
+                return args, project_root, str(path_obj)
+        finally:
+            self.config_scanner.save()
+
         return [], None, None
 
-    def run_full_pipeline(self, config: dict):
+    def builder_for(self, config: dict) -> PyBuilder:
+        """PyBuilder für config['build_dir'] (eigenes dist/work/spec), sonst der Standard-Builder."""
+        build_dir = config.get("build_dir")
+        if not build_dir:
+            return self.builder
+        key = str(Path(build_dir).absolute())
+        with self._builders_lock:
+            if key not in self._builders:
+                builder = PyBuilder(Path(build_dir))
+                builder.zygote = self.builder.zygote
+                self._builders[key] = builder
+            return self._builders[key]
+
+    def _builder(self, ctx: dict) -> PyBuilder:
+        return ctx.get("builder") or self.builder_for(ctx["config"])
+
+    def run_full_pipeline(self, config: dict, listeners: list = None) -> PipelineRun:
+        """
+        Führt die komplette Pipeline als DAG aus. Zertifikat, Tool-Check und Config-Erkennung
+        laufen parallel zum PyInstaller-Build; nur die Signatur wartet auf alles.
+        'listeners' bekommen die Stage-Events (z.B. Fortschritt in der GUI-Queue).
+        """
         log.info("=== START PIPELINE ===")
-        
+
+        script_input = Path(config.get("script_file"))
+        if not script_input.exists():
+            log.error("Script nicht gefunden")
+            return None
+
+        # Trace nur für diesen Lauf, parallele Läufe schreiben nicht mit (EXEBUILDER_TRACE gilt prozessweit)
+        trace_file = config.get("trace_file")
+        with tracer.collect() if trace_file else contextlib.nullcontext() as trace_events:
+            try:
+                with retry_engine.run_stats():
+                    try:
+                        with tracer.span("run_full_pipeline", app=config.get("app_name")):
+                            run = self.build_pipeline(config, listeners).run(
+                                {"config": config, "cache_hits": {}, "builder": self.builder_for(config)})
+                    finally:
+                        # Retries und verlorene Zeit pro netzwerkgebundenem Schritt (nur dieser Lauf)
+                        retry_engine.log_report()
+            finally:
+                if trace_file:
+                    path = tracer.export(Path(trace_file), events=trace_events)
+                    log.info(f"Trace geschrieben: {path} (Perfetto: ui.perfetto.dev)")
+
+        for failed in run.failed:
+            log.error(f"Stage '{failed.name}' fehlgeschlagen: {failed.error}")
+        run.log_summary()
+
+        if run.ok:
+            dist = run.context["dist"]
+            log.success("✅ DONE! Fertiges Paket in:")
+            print(f" -> {dist.absolute()}")
+        return run
+
+    def watch(self, config: dict, debounce: float = 0.3, stop: threading.Event = None):
+        """Watch-Modus: Bei jeder Änderung nur die betroffenen Stages neu bauen und neu signieren."""
         script_input = Path(config.get("script_file"))
         if not script_input.exists():
             log.error("Script nicht gefunden")
             return
+        try:
+            WatchSession(self, config, debounce=debounce).run(stop)
+        except KeyboardInterrupt:
+            log.info("Watch-Modus beendet.")
+
+    def build_pipeline(self, config: dict, listeners: list = None) -> PipelineScheduler:
+        """Beschreibt die Pipeline als DAG (Inputs/Outputs bestimmen die Reihenfolge)."""
+        # OpenSSL wird nur für das OpenSSL-Backend vor dem Zertifikat gebraucht
+        cert_inputs = ["tools"] if config.get("use_openssl") else []
+        stages = [
+            Stage("environment:tools", self._stage_tools, outputs=["tools"]),
+            Stage("environment:deps", self._stage_deps, outputs=["deps"]),
+            Stage("certificate", self._stage_certificate, inputs=cert_inputs, outputs=["cert"]),
+            Stage("config", self._stage_config, outputs=["build_plan"]),
+            Stage("assets", self._stage_assets, inputs=["build_plan"], outputs=["staged_assets"]),
+            Stage("bytecode", self._stage_bytecode, inputs=["build_plan", "deps"], outputs=["bytecode"]),
+            Stage("build", self._stage_build, inputs=["build_plan", "deps", "staged_assets", "bytecode"],
+                  outputs=["exe", "variants"]),
+            Stage("sign", self._stage_sign, inputs=["exe", "cert", "tools"], outputs=["signed"]),
+            Stage("package", self._stage_package, inputs=["signed", "cert"], outputs=["dist"]),
+            Stage("delta", self._stage_delta, inputs=["signed"], outputs=["delta"]),
+            Stage("archive", self._stage_archive, inputs=["dist", "signed", "cert"], outputs=["artifact"]),
+        ]
+        return PipelineScheduler(stages, listeners=listeners)
+
+    # --- Stages ---
+
+    def _prepare_once(self, key: str, func, ctx: dict = None):
+        with self._env_locks[key]:
+            if key not in self._env_ready:
+                func()
+                self._env_ready.add(key)
+            elif ctx is not None:
+                self._cache_hit(ctx, key, True)
+        return True
+
+    @staticmethod
+    def _cache_hit(ctx: dict, key: str, value):
+        """Merkt sich übersprungene Arbeit eines Laufs (Anzeige in der GUI-Queue, Summary)."""
+        hits = ctx.get("cache_hits")
+        if hits is not None:
+            hits[key] = value
 
-        self.setup_environment(Path("."))
+    def _stage_tools(self, ctx: dict):
+        return self._prepare_once("tools", self.env_manager.prepare_tools, ctx)
 
+    def _stage_deps(self, ctx: dict):
+        return self._prepare_once("deps", lambda: self.env_manager.prepare_dependencies(Path(".")), ctx)
+
+    def _stage_certificate(self, ctx: dict):
         try:
-            pfx_path, cer_path = self.get_cert_tuple(config)
-            cert_pass = config.get("cert_password", "")
+            cached = self._cert_cache.get(self._cert_key(ctx["config"]))
+            if cached and cached[0].exists():
+                self._cache_hit(ctx, "cert", True)
+            return self.get_cert_tuple(ctx["config"])
         except Exception as e:
-            log.error(f"Cert Fehler: {e}")
-            return
+            raise PipelineError(f"Cert Fehler: {e}") from e
 
-        # --- LOGIK: CONFIG vs GUI ---
+    def _stage_config(self, ctx: dict) -> dict:
+        """Entscheidet zwischen Config-Modus (Goldstandard) und Standard-GUI-Modus."""
+        config = ctx["config"]
         # Wir schauen in die Assets, die der User in die GUI gezogen hat
         gui_assets = config.get("assets", [])
-        
         config_args, project_root, config_file = self.detect_config_from_assets(gui_assets)
-        
-        exe_path = None
-        
+
         if config_args:
-            # MODUS A: Config (Goldstandard)
-            log.info("Starte Build mit externer Konfiguration...")
-            
-            # Falls der User NOCH MEHR Assets in der GUI hat (außer der Config), 
+            # Falls der User NOCH MEHR Assets in der GUI hat (außer der Config),
             # fügen wir diese sicherheitshalber auch hinzu.
-            extra_assets = []
-            for item in gui_assets:
-                if item == config_file: continue # Config selbst nicht packen
-                
-                p = Path(item)
-                if p.is_file(): extra_assets.append(f"--add-data={item};.")
-                elif p.is_dir(): extra_assets.append(f"--add-data={item};{p.name}")
-            
+            # Config selbst nicht packen
+            extra_assets = [item for item in gui_assets if item != config_file]
             if extra_assets:
                 log.info(f"Füge {len(extra_assets)} weitere Assets aus der GUI hinzu.")
-                config_args.extend(extra_assets)
+            return {"mode": "config", "args": config_args, "project_root": project_root, "assets": extra_assets}
+
+        log.info("Keine Config-Datei in den Assets gefunden. Nutze Standard-Modus.")
+        return {"mode": "gui", "assets": list(gui_assets)}
+
+    @staticmethod
+    def _tree_size(path: Path, limit: int) -> int:
+        """Größe einer Datei bzw. eines Ordners; bricht ab, sobald 'limit' erreicht ist (nur stat)."""
+        if path.is_file():
+            return path.stat().st_size
+        total = 0
+        for root, _, names in os.walk(path):
+            for name in names:
+                try:
+                    total += (Path(root) / name).stat().st_size
+                except OSError:
+                    continue
+                if total >= limit:
+                    return total
+        return total
+
+    def _linked_assets(self, config: dict, plan: dict) -> list:
+        """
+        Assets, die am --add-data vorbei direkt in den dist-Ordner kommen: nur onedir-Builds aus dem
+        GUI-Modus (ein Ziel, bekannter Ordner), nur Bäume ab 'link_assets_min_mb' (Standard 64, 0 = aus).
+        """
+        if plan["mode"] != "gui" or config.get("variants") or config.get("one_file", True):
+            return []
+        threshold = float(config.get("link_assets_min_mb", 64) or 0) * 1024 * 1024
+        if not threshold:
+            return []
+        return [item for item in plan["assets"]
+                if Path(item).exists() and self._tree_size(Path(item), threshold) >= threshold]
+
+    def _stage_assets(self, ctx: dict) -> dict:
+        """
+        Assets inhaltsadressiert stagen (Hash-Cache + Hardlinks). Große Bäume eines onedir-Builds gehen
+        nicht durch PyInstaller: _stage_build verlinkt sie nach COLLECT in den dist-Ordner, unveränderte
+        Inhalte kosten dann nur stat(). Übrige Assets werden nur für reproduzierbare Builds gestagt
+        (feste Zeitstempel), sonst kopiert PyInstaller die Originale ('stage_assets' erzwingt es).
+        Rückgabe: {"add_data": {Original: Quelle für --add-data}, "linked": {Original: gestagter Baum}}
+        """
+        config, plan = ctx["config"], ctx["build_plan"]
+        assets = plan["assets"]
+        linked = self._linked_assets(config, plan)
+        rest = [item for item in assets if item not in linked]
+        stage = linked + (rest if config.get("stage_assets", bool(config.get("reproducible"))) else [])
+        if not stage:
+            return {"add_data": {item: item for item in assets}, "linked": {}}
+        mtime = source_date_epoch(config) if config.get("reproducible") else None
+        mapping, stats = self.asset_stager.stage(stage, mtime=mtime)
+        tracer.current().set(**stats)
+        log.info(f"Assets: {stats['files']} Dateien, {stats['hash_cache_hits']} aus Hash-Cache, "
+                 f"{stats['reused_trees']} Bäume wiederverwendet.")
+        if stats["hash_cache_hits"]:
+            self._cache_hit(ctx, "assets", stats["hash_cache_hits"])
+        return {"add_data": {item: mapping.get(item, item) for item in rest},
+                "linked": {item: mapping[item] for item in linked}}
+
+    def _link_assets(self, exe_path: Path, linked: dict):
+        """Große Asset-Bäume neben die onedir-EXE legen, wo PyInstaller sie per --add-data abgelegt hätte."""
+        data_dir = exe_path.parent / contents_dir()
+        files = 0
+        for item, staged in linked.items():
+            # Wie _add_data_specs: Dateien nach '.', Ordner unter ihrem Namen
+            files += self.asset_stager.link_tree(Path(staged), data_dir / Path(item).name)
+        tracer.current().set(linked_trees=len(linked), linked_files=files)
+        log.info(f"Große Assets nach {data_dir} verlinkt: {len(linked)} Bäume, {files} Dateien neu.")
+
+    def _stage_bytecode(self, ctx: dict):
+        """
+        Optional: Projekt + Dependencies parallel vorkompilieren (geteilter, inhaltsadressierter pyc-Cache).
+        Liefert die Umgebung für den Build (PYTHONPYCACHEPREFIX) oder None. Kompiliert wird für die
+        Optimierungsstufe, mit der der Build-Prozess selbst importiert (siehe PyBuilder._optimize).
+        """
+        config, plan = ctx["config"], ctx["build_plan"]
+        if not config.get("precompile"):
+            return None
+        if not self.bytecode_cache.available():
+            log.warning("Bytecode-Cache nicht verfügbar (kein cache_tag) - überspringe Vorkompilieren.")
+            return None
+        variants = plan["mode"] == "gui" and config.get("variants")
+        remote = RemoteBuildCache.from_config(config) if not variants else None
+        if remote and remote.contains(self._fingerprint(config, plan)):
+            # Der Build lädt die EXE aus dem Remote-Cache, PyInstaller läuft nicht
+            log.info("Remote-Cache hat diesen Build bereits - überspringe Vorkompilieren.")
+            return None
+        optimize = int(config.get("optimize", 0) or 0)
+        level = 0 if native_optimize() else optimize
+        sources = self.bytecode_cache.collect_sources(Path(config.get("script_file")), plan.get("project_root"),
+                                                      include_deps=config.get("precompile_deps", True),
+                                                      include_toolchain=config.get("precompile_toolchain", True))
+        stats = self.bytecode_cache.precompile(sources, level)
+        tracer.current().set(**stats)
+        if stats["hits"]:
+            self._cache_hit(ctx, "bytecode", stats["hits"])
+        return self.bytecode_cache.environment(level)
+
+    def _fingerprint(self, config: dict, plan: dict) -> str:
+        """Remote-Cache-Schlüssel des Builds (Bytecode-Stage prüft vorab, Build-Stage lädt/speichert)."""
+        epoch = source_date_epoch(config) if config.get("reproducible") else None
+        # Optimierungsstufe ändert den Bytecode in der EXE (0 bleibt aus Kompatibilität außen vor)
+        optimize = int(config.get("optimize", 0) or 0)
+        extra = {"epoch": epoch, "optimize": optimize} if optimize else {"epoch": epoch}
+        return self.fingerprinter.compute(config, plan, extra=extra)
+
+    @staticmethod
+    def _add_data_specs(assets: list, staged: dict) -> list:
+        """'quelle;ziel' Paare für --add-data. Quelle ist der Staging-Pfad, Ziel bleibt wie im Original."""
+        specs = []
+        for item in assets:
+            p = Path(item)
+            source = staged.get(item, item)
+            if p.is_file(): specs.append(f"{source};.")
+            elif p.is_dir(): specs.append(f"{source};{p.name}")
+        return specs
+
+    def _stage_build(self, ctx: dict) -> Path:
+        config, plan = ctx["config"], ctx["build_plan"]
+        builder = self._builder(ctx)
+        staged = ctx["staged_assets"]
+        add_data = self._add_data_specs([a for a in plan["assets"] if a not in staged["linked"]], staged["add_data"])
+        limits = ResourceLimits.from_config(config)
+        env, epoch = None, None
+        if config.get("reproducible"):
+            epoch = source_date_epoch(config)
+            env = build_environment(epoch)
+            add_data.sort()
+            log.info(f"Reproduzierbarer Build (SOURCE_DATE_EPOCH={epoch}, PYTHONHASHSEED=0)")
+        if ctx.get("bytecode"):
+            env = {**(env or {}), **ctx["bytecode"]}
 
-            # FIX: Korrekter Methodenname 'build_with_config'
-            exe_path = self.builder.build_with_config(config_args, project_root)
-            
+        if plan["mode"] == "gui" and config.get("variants"):
+            return self._build_variants(builder, config, add_data, limits, env, epoch)
+
+        # Gemeinsamer Build-Cache mehrerer Build-Knoten: gleiche Eingaben -> EXE laden statt bauen
+        remote = RemoteBuildCache.from_config(config)
+        fingerprint = None
+        if remote:
+            fingerprint = self._fingerprint(config, plan)
+            cached = remote.fetch(fingerprint, builder.dist_dir)
+            if cached:
+                log.success(f"Remote-Cache Treffer ({fingerprint[:12]}): PyInstaller übersprungen, {cached.name} geladen.")
+                tracer.current().set(remote_cache="hit", fingerprint=fingerprint[:16])
+                self._cache_hit(ctx, "remote", fingerprint[:12])
+                return {"exe": cached, "variants": {}}
+            log.info(f"Remote-Cache: kein Eintrag für {fingerprint[:12]}, baue lokal.")
+
+        if plan["mode"] == "config":
+            # MODUS A: Config (Goldstandard)
+            log.info("Starte Build mit externer Konfiguration...")
+            args = plan["args"] + [f"--add-data={spec}" for spec in add_data]
+            exe_path = builder.build_with_config(args, plan["project_root"], limits=limits, env=env,
+                                                 optimize=int(config.get("optimize", 0) or 0))
         else:
             # MODUS B: Standard GUI
-            log.info("Keine Config-Datei in den Assets gefunden. Nutze Standard-Modus.")
-            
-            clean_assets = []
-            for item in gui_assets:
-                p = Path(item)
-                if p.is_file(): clean_assets.append(f"{item};.")
-                elif p.is_dir(): clean_assets.append(f"{item};{p.name}")
-
-            exe_path = self.builder.build_from_gui(
-                script_path=script_input,
+            exe_path = builder.build_from_gui(
+                script_path=Path(config.get("script_file")),
                 app_name=config.get("app_name", "MyApp"),
                 icon_path=Path(config.get("icon_path")) if config.get("icon_path") else None,
                 console=config.get("console", True),
                 one_file=config.get("one_file", True),
-                add_data=clean_assets
+                clean=config.get("clean", True),
+                add_data=add_data,
+                limits=limits,
+                env=env,
+                optimize=int(config.get("optimize", 0) or 0)
             )
 
-        if not exe_path: return
+        if not exe_path:
+            raise PipelineError("Build fehlgeschlagen.")
+        if staged["linked"]:
+            self._link_assets(exe_path, staged["linked"])
+        if epoch is not None:
+            # Zeitstempel/Prüfsumme im PE-Header normalisieren -> byte-identische, cachebare EXE
+            normalize_executable(exe_path, epoch)
+            digest = file_digest(exe_path)
+            if builder.last_report is not None:
+                builder.last_report["sha256"] = digest
+            tracer.current().set(sha256=digest)
+            log.info(f"Unsignierte EXE sha256: {digest}")
+        if remote:
+            # Vor dem Signieren hochladen: Zertifikate sind pro Knoten verschieden, die EXE nicht
+            if remote.store(fingerprint, exe_path, {"app": config.get("app_name", "MyApp")}):
+                log.info(f"Remote-Cache: {exe_path.name} unter {fingerprint[:12]} abgelegt.")
+        return {"exe": exe_path, "variants": {}}
 
-        # SIGNIERUNG
-        log.info("Warte auf Dateisystem...")
-        time.sleep(2)
-        
-        if self.signer.sign_exe(exe_path, pfx_path, cert_pass):
-            dist = exe_path.parent
-            if cer_path:
-                try: shutil.copy(cer_path, dist / cer_path.name)
-                except: pass
-                self.cert_manager.create_install_script(dist, pfx_path.stem, cer_path)
-            self.create_readme(dist)
-            
-            log.success("✅ DONE! Fertiges Paket in:")
-            print(f" -> {dist.absolute()}")
-        else:
-            log.error("Signatur fehlgeschlagen.")
+    def _build_variants(self, builder: PyBuilder, config: dict, add_data: list, limits, env, epoch) -> dict:
+        """Alle Varianten aus einer Analyse; die erste ist die Haupt-EXE (Delta, Archiv, Paket-Ordner)."""
+        if config.get("remote_cache"):
+            log.info("Remote-Cache wird für Varianten-Builds nicht genutzt.")
+        variants = builder.build_variants(
+            script_path=Path(config.get("script_file")),
+            variants=config["variants"],
+            icon_path=Path(config.get("icon_path")) if config.get("icon_path") else None,
+            clean=config.get("clean", True),
+            add_data=add_data,
+            limits=limits,
+            env=env,
+            optimize=int(config.get("optimize", 0) or 0)
+        )
+        if not variants:
+            raise PipelineError("Varianten-Build fehlgeschlagen.")
+        if epoch is not None:
+            for exe_path in variants.values():
+                normalize_executable(exe_path, epoch)
+        report = builder.reports.get(next(iter(variants)), {})
+        tracer.current().set(variants=len(variants), saved_s=report.get("saved_s"))
+        return {"exe": next(iter(variants.values())), "variants": variants}
+
+    def verify_reproducible(self, config: dict, listeners: list = None) -> dict:
+        """Baut zweimal (ohne Zertifikat/Signatur) und vergleicht die Digests der unsignierten EXE."""
+        # Ohne Remote-Cache, sonst würde zweimal dieselbe geladene EXE verglichen
+        config = {**config, "reproducible": True, "clean": True, "remote_cache": None}
+        scheduler = self.build_pipeline(config, listeners)
+        # Nur was die EXE beeinflusst: Dependencies, Config, Assets, Build
+        skip = {"environment:tools", "certificate", "sign", "package", "delta", "archive"}
+
+        def build_once():
+            run = scheduler.run({"config": config}, skip=skip)
+            for failed in run.failed:
+                log.error(f"Stage '{failed.name}' fehlgeschlagen: {failed.error}")
+            return run.context.get("exe") if run.ok else None
+
+        return DeterminismCheck(build_once).run()
+
+    def _stage_sign(self, ctx: dict) -> Path:
+        exe_path = ctx["exe"]
+        pfx_path, _ = ctx["cert"]
+
+        # Statt fixer Wartezeit: Sobald die Datei geschlossen und vollständig ist, geht es weiter
+        if not self.artifact_watcher.wait_ready(exe_path):
+            raise PipelineError(f"Artefakt wurde nicht rechtzeitig fertig: {exe_path}")
+        valid, info = verify_executable(exe_path)
+        if not valid:
+            raise PipelineError(f"Artefakt ist kein gültiges Executable: {info}")
+        log.debug(f"Artefakt geprüft ({info}): {exe_path.name}")
+
+        # Weitere Varianten aus demselben Build werden mitsigniert
+        targets = [exe_path] + [p for p in (ctx.get("variants") or {}).values() if p != exe_path]
+        for target in targets:
+            if not self.signer.sign_exe(target, pfx_path, ctx["config"].get("cert_password", "")):
+                raise PipelineError(f"Signatur fehlgeschlagen: {target.name}")
+        return exe_path
+
+    def _stage_delta(self, ctx: dict):
+        """Binär-Delta gegen das zuletzt signierte Artefakt derselben App (optional, bricht den Build nie ab)."""
+        if not ctx["config"].get("delta", True):
+            return None
+        try:
+            result = self.release_store.publish(ctx["config"].get("app_name", "MyApp"), ctx["signed"])
+        except (OSError, ValueError) as e:
+            log.warning(f"Delta konnte nicht erstellt werden: {e}")
+            return None
+        if result:
+            tracer.current().set(ratio=result["ratio"], delta_size=result["delta_size"], new_size=result["new_size"])
+            return Path(result["delta"])
+        return None
+
+    def _stage_archive(self, ctx: dict):
+        """Legt EXE + Zertifikat + Installationsskript + Anleitung im Artefakt-Lager ab (optional)."""
+        config = ctx["config"]
+        if not config.get("archive", True):
+            return None
+        dist, signed = ctx["dist"], ctx["signed"]
+        _, cer_path = ctx["cert"]
+        files = {signed.name: signed}
+        # onefile-Varianten liegen neben der Haupt-EXE und gehören zum selben Release
+        for variant in (ctx.get("variants") or {}).values():
+            if variant != signed and variant.parent == signed.parent:
+                files[variant.name] = variant
+        if cer_path:
+            files[cer_path.name] = dist / cer_path.name
+        for extra in ("install_cert.bat", "ANLEITUNG_LESEN.txt"):
+            files[extra] = dist / extra
+        try:
+            entry = self.artifact_store.add(config.get("app_name", "MyApp"), files,
+                                            version=config.get("version"), pinned=config.get("pin", False),
+                                            metadata={"sha256": file_digest(signed)})
+        except OSError as e:
+            log.warning(f"Artefakt konnte nicht archiviert werden: {e}")
+            return None
+        tracer.current().set(version=entry["version"], files=len(entry["files"]))
+        return entry
+
+    def _stage_package(self, ctx: dict) -> Path:
+        pfx_path, cer_path = ctx["cert"]
+        dist = ctx["signed"].parent
+        if cer_path:
+            try: shutil.copy(cer_path, dist / cer_path.name)
+            except: pass
+            self.cert_manager.create_install_script(dist, pfx_path.stem, cer_path)
+        self.create_readme(dist)
+        return dist
@@ -0,0 +1,229 @@
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.utils.helpers import log
+from src.utils.tracing import tracer
+
+
+class PipelineError(RuntimeError):
+    """Eine Stage ist fehlgeschlagen (wird von Stage-Funktionen geworfen)."""
+
+
+class Stage:
+    """
+    Ein Knoten im Pipeline-DAG.
+    'func(ctx)' bekommt den geteilten Kontext und liefert den Wert für 'outputs'
+    (bei mehreren Outputs ein dict oder tuple in derselben Reihenfolge).
+    """
+
+    def __init__(self, name: str, func, inputs=(), outputs=()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+class StageResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "pending"   # pending | running | ok | failed | skipped
+        self.start = None
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+    def as_dict(self) -> dict:
+        return {"name": self.name, "status": self.status, "duration": round(self.duration, 3),
+                "error": str(self.error) if self.error else None}
+
+
+class PipelineRun:
+    """Ergebnis eines Scheduler-Laufs: Kontext, Stage-Zeiten und kritischer Pfad."""
+
+    def __init__(self, context: dict, results: dict, wall_time: float, critical_path: list):
+        self.context = context
+        self.results = results
+        self.wall_time = wall_time
+        self.critical_path = critical_path
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status == "ok" for r in self.results.values())
+
+    @property
+    def failed(self) -> list:
+        return [r for r in self.results.values() if r.status == "failed"]
+
+    @property
+    def critical_path_time(self) -> float:
+        return sum(self.results[name].duration for name in self.critical_path)
+
+    def as_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "wall_time": round(self.wall_time, 3),
+            "critical_path": self.critical_path,
+            "critical_path_time": round(self.critical_path_time, 3),
+            "stages": [r.as_dict() for r in self.results.values()],
+        }
+
+    def log_summary(self):
+        log.info("--- Pipeline Timing ---")
+        for r in self.results.values():
+            marker = "★" if r.name in self.critical_path else " "
+            log.info(f" {marker} {r.name:<22} {r.status:<8} {r.duration:7.2f}s")
+        log.info(f"Wall-Time: {self.wall_time:.2f}s | Kritischer Pfad ({self.critical_path_time:.2f}s): "
+                 f"{' -> '.join(self.critical_path)}")
+
+
+class PipelineScheduler:
+    """
+    Führt einen DAG aus Stages aus. Abhängigkeiten ergeben sich aus inputs/outputs;
+    unabhängige Stages laufen parallel in einem Thread-Pool.
+    """
+
+    def __init__(self, stages: list, max_workers: int = None, listeners: list = None):
+        self.stages = {s.name: s for s in stages}
+        self.max_workers = max_workers or max(1, len(stages))
+        self.listeners = list(listeners or [])
+        self._producers = {}
+        for stage in stages:
+            for out in stage.outputs:
+                if out in self._producers:
+                    raise ValueError(f"Output '{out}' wird von mehreren Stages erzeugt.")
+                self._producers[out] = stage.name
+
+    def dependencies(self, stage: Stage, provided=()) -> set:
+        """Stages, deren Outputs 'stage' braucht (bereits vorhandene Kontext-Werte ausgenommen)."""
+        deps = set()
+        for inp in stage.inputs:
+            if inp in provided:
+                continue
+            if inp not in self._producers:
+                raise ValueError(f"Stage '{stage.name}' braucht '{inp}', aber keine Stage erzeugt es.")
+            deps.add(self._producers[inp])
+        return deps
+
+    def downstream(self, names) -> set:
+        """'names' plus alle Stages, die (transitiv) deren Outputs konsumieren."""
+        result = set(names)
+        changed = True
+        while changed:
+            changed = False
+            produced = {out for n in result for out in self.stages[n].outputs}
+            for name, stage in self.stages.items():
+                if name not in result and produced & set(stage.inputs):
+                    result.add(name)
+                    changed = True
+        return result
+
+    def topological_order(self, provided=()) -> list:
+        deps = {name: self.dependencies(s, provided) for name, s in self.stages.items()}
+        order, done = [], set()
+        while len(order) < len(deps):
+            ready = [n for n in deps if n not in done and deps[n] <= done]
+            if not ready:
+                raise ValueError("Zyklus im Pipeline-DAG.")
+            for n in ready:
+                order.append(n)
+                done.add(n)
+        return order
+
+    def _emit(self, event: str, result: StageResult):
+        for listener in self.listeners:
+            try:
+                listener(event, result)
+            except Exception as e:
+                log.debug(f"Pipeline-Listener Fehler: {e}")
+
+    def _execute(self, stage: Stage, ctx: dict, result: StageResult):
+        result.status = "running"
+        result.start = time.perf_counter()
+        self._emit("stage_start", result)
+        try:
+            with tracer.span(f"stage:{stage.name}", cat="stage"):
+                value = stage.func(ctx)
+            if len(stage.outputs) == 1:
+                ctx[stage.outputs[0]] = value
+            elif stage.outputs:
+                if isinstance(value, dict):
+                    for out in stage.outputs:
+                        ctx[out] = value[out]
+                else:
+                    for out, v in zip(stage.outputs, value):
+                        ctx[out] = v
+            result.status = "ok"
+        except Exception as e:
+            result.status = "failed"
+            result.error = e
+        finally:
+            result.end = time.perf_counter()
+            self._emit("stage_end", result)
+
+    def run(self, context: dict = None, skip=()) -> PipelineRun:
+        """
+        Startet den DAG. 'skip' enthält Stage-Namen, deren Outputs bereits im Kontext liegen
+        (z.B. für inkrementelle Rebuilds).
+        """
+        ctx = dict(context or {})
+        provided = set(ctx)
+        active = {n: s for n, s in self.stages.items() if n not in skip}
+        results = {n: StageResult(n) for n in self.topological_order(provided) if n in active}
+        deps = {n: self.dependencies(active[n], provided) & set(active) for n in results}
+
+        done, running = set(), {}
+        aborted = False
+        t0 = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as pool:
+            while True:
+                if not aborted:
+                    for name in results:
+                        if name in done or name in running or not deps[name] <= done:
+                            continue
+                        # Kontext (contextvars) an die Stage weiterreichen, z.B. für Job-IDs
+                        run_ctx = contextvars.copy_context()
+                        running[name] = pool.submit(run_ctx.run, self._execute, active[name], ctx, results[name])
+
+                if not running:
+                    break
+
+                finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name in [n for n, f in running.items() if f in finished]:
+                    running.pop(name)
+                    done.add(name)
+                    if results[name].status == "failed":
+                        # Fail-Fast: Laufende Stages dürfen fertig werden, neue starten nicht mehr
+                        aborted = True
+
+        for r in results.values():
+            if r.status == "pending":
+                r.status = "skipped"
+
+        wall = time.perf_counter() - t0
+        return PipelineRun(ctx, results, wall, self._critical_path(results, deps))
+
+    @staticmethod
+    def _critical_path(results: dict, deps: dict) -> list:
+        """Längster Pfad (nach Dauer) durch den DAG."""
+        finish, parent = {}, {}
+        for name in results:  # results ist topologisch sortiert
+            best = max(deps[name], key=lambda d: finish[d], default=None)
+            finish[name] = results[name].duration + (finish[best] if best else 0.0)
+            parent[name] = best
+        if not finish:
+            return []
+        node = max(finish, key=finish.get)
+        path = []
+        while node:
+            path.append(node)
+            node = parent[node]
+        return list(reversed(path))
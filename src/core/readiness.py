@@ -0,0 +1,172 @@
+import os
+import sys
+import time
+import struct
+from pathlib import Path
+from src.utils.helpers import log
+from src.utils.tracing import tracer
+from src.utils.inotify import Inotify, IN_CLOSE_WRITE, IN_MODIFY, IN_MOVED_TO, IN_CREATE
+
+
+def verify_executable(path: Path) -> tuple[bool, str]:
+    """
+    Prüft, ob die Datei ein vollständiges PE- oder ELF-Binary ist (Header + Sektionen innerhalb der Datei).
+    Rückgabe: (ok, Format oder Fehlerbeschreibung)
+    """
+    try:
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            head = f.read(4096)
+            if head[:2] == b"MZ":
+                return _verify_pe(f, head, size)
+            if head[:4] == b"\x7fELF":
+                return _verify_elf(head, size)
+    except OSError as e:
+        return False, f"Nicht lesbar: {e}"
+    return False, "Unbekanntes Format (weder PE noch ELF)"
+
+
+def _verify_pe(f, head: bytes, size: int) -> tuple[bool, str]:
+    if len(head) < 0x40:
+        return False, "PE: DOS-Header abgeschnitten"
+    e_lfanew = struct.unpack_from("<I", head, 0x3C)[0]
+    f.seek(e_lfanew)
+    nt = f.read(24)
+    if len(nt) < 24 or nt[:4] != b"PE\0\0":
+        return False, "PE: Signatur fehlt"
+
+    num_sections, = struct.unpack_from("<H", nt, 6)
+    opt_size, = struct.unpack_from("<H", nt, 20)
+    opt_magic = f.read(2)
+    kind = {b"\x0b\x01": "PE32", b"\x0b\x02": "PE32+"}.get(opt_magic)
+    if kind is None:
+        return False, "PE: Unbekannter Optional-Header"
+
+    f.seek(e_lfanew + 24 + opt_size)
+    table = f.read(40 * num_sections)
+    if len(table) < 40 * num_sections:
+        return False, "PE: Sektionstabelle abgeschnitten"
+
+    end_of_image = 0
+    for i in range(num_sections):
+        raw_size, raw_ptr = struct.unpack_from("<II", table, i * 40 + 16)
+        if raw_size:
+            end_of_image = max(end_of_image, raw_ptr + raw_size)
+    if end_of_image > size:
+        return False, f"PE: Datei unvollständig ({size} < {end_of_image} Bytes)"
+    return True, kind
+
+
+def authenticode_size(path: Path) -> int:
+    """
+    Größe der Zertifikatstabelle (Security Directory, Index 4) einer PE-Datei.
+    0 = unsigniert bzw. kein PE. Prüft nur das Vorhandensein, nicht die Vertrauenskette.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(0x40)
+            if len(head) < 0x40 or head[:2] != b"MZ":
+                return 0
+            e_lfanew = struct.unpack_from("<I", head, 0x3C)[0]
+            f.seek(e_lfanew + 24)
+            magic = f.read(2)
+            # Data Directories beginnen bei Offset 96 (PE32) bzw. 112 (PE32+) im Optional-Header
+            offset = {b"\x0b\x01": 96, b"\x0b\x02": 112}.get(magic)
+            if offset is None:
+                return 0
+            f.seek(e_lfanew + 24 + offset + 4 * 8)
+            entry = f.read(8)
+            if len(entry) < 8:
+                return 0
+            file_offset, table_size = struct.unpack("<II", entry)
+            return table_size if file_offset else 0
+    except OSError:
+        return 0
+
+
+def _verify_elf(head: bytes, size: int) -> tuple[bool, str]:
+    is_64 = head[4] == 2
+    endian = "<" if head[5] == 1 else ">"
+    if is_64:
+        if len(head) < 64:
+            return False, "ELF: Header abgeschnitten"
+        shoff, = struct.unpack_from(endian + "Q", head, 0x28)
+        shentsize, shnum = struct.unpack_from(endian + "HH", head, 0x3A)
+    else:
+        if len(head) < 52:
+            return False, "ELF: Header abgeschnitten"
+        shoff, = struct.unpack_from(endian + "I", head, 0x20)
+        shentsize, shnum = struct.unpack_from(endian + "HH", head, 0x2E)
+    if shoff + shentsize * shnum > size:
+        return False, f"ELF: Datei unvollständig ({size} Bytes)"
+    return True, "ELF64" if is_64 else "ELF32"
+
+
+class ArtifactWatcher:
+    """
+    Erkennt, wann ein Build-Artefakt fertig geschrieben und geschlossen ist.
+    Linux: inotify (IN_CLOSE_WRITE / Ruhephase). Sonst: Größe/mtime-Stabilität per Polling.
+    Kehrt sofort zurück, sobald die Datei bereit ist, statt fix zu schlafen.
+    """
+
+    def __init__(self, settle: float = 0.05, poll_interval: float = 0.05):
+        self.settle = settle
+        self.poll_interval = poll_interval
+
+    @tracer.traced("artifact:wait_ready", cat="build")
+    def wait_ready(self, path: Path, timeout: float = 30.0) -> bool:
+        path = Path(path)
+        start = time.perf_counter()
+        if Inotify.available():
+            ready = self._wait_inotify(path, timeout)
+        else:
+            ready = self._wait_polling(path, timeout)
+        log.debug(f"Artefakt {'bereit' if ready else 'NICHT bereit'} nach {time.perf_counter() - start:.3f}s: {path.name}")
+        return ready
+
+    def _wait_inotify(self, path: Path, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        try:
+            ino = Inotify()
+            ino.add_watch(path.parent, IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_TO | IN_CREATE)
+        except OSError as e:
+            log.debug(f"inotify nicht nutzbar ({e}), nutze Polling.")
+            return self._wait_polling(path, timeout)
+
+        with ino:
+            while time.monotonic() < deadline:
+                events = [e for e in ino.read_events(self.settle) if e.name == path.name]
+                if any(e.mask & (IN_CLOSE_WRITE | IN_MOVED_TO) for e in events) and path.exists():
+                    return self._is_closed(path)
+                # Keine Schreib-Events während der Ruhephase -> Writer ist fertig
+                if not events and path.exists() and path.stat().st_size > 0 and self._is_closed(path):
+                    return True
+        return False
+
+    def _wait_polling(self, path: Path, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        previous = None
+        while time.monotonic() < deadline:
+            try:
+                st = path.stat()
+                signature = (st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                signature = None
+
+            if signature and signature == previous and signature[0] > 0 and self._is_closed(path):
+                return True
+            previous = signature
+            time.sleep(self.poll_interval)
+        return False
+
+    @staticmethod
+    def _is_closed(path: Path) -> bool:
+        """Unter Windows schlägt das Öffnen fehl, solange ein anderer Prozess (Linker, AV-Scanner) die Datei hält."""
+        if sys.platform != "win32":
+            return True
+        try:
+            fd = os.open(str(path), os.O_RDWR | getattr(os, "O_BINARY", 0))
+        except OSError:
+            return False
+        os.close(fd)
+        return True
@@ -0,0 +1,491 @@
+import os
+import re
+import sys
+import hmac
+import json
+import hashlib
+import ipaddress
+import argparse
+import platform
+import http.client
+from pathlib import Path
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.core.assets import ContentStore, FileHashCache, file_digest
+from src.core.retry import retry_engine
+from src.core.watch import local_imports
+from src.utils.helpers import log
+from src.utils.tracing import tracer
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+_BLOCK = 1024 * 1024
+# Verzeichnisse, die im Config-Modus nicht zum Projekt-Fingerprint gehören
+_SKIP_DIRS = {".git", "__pycache__", "build", "builds", "dist", ".venv", "venv", "env", ".tox", "node_modules"}
+_DEPENDENCY_FILES = ("poetry.lock", "requirements.lock", "requirements.txt", "Requirements.txt", "pyproject.toml",
+                     "Pipfile.lock", "pdm.lock", "uv.lock", "pylock.toml")
+
+
+def _pyinstaller_version() -> str:
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            return version("pyinstaller")
+        except PackageNotFoundError:
+            return "unknown"
+    except ImportError:
+        return "unknown"
+
+
+def _installed_distributions() -> str:
+    """sha256 über 'name==version' aller installierten Distributionen: PyInstaller bündelt, was installiert
+    ist - nicht, was in requirements.txt steht (ungepinnte Ranges, manuell installierte Pakete)."""
+    try:
+        from importlib.metadata import distributions
+    except ImportError:
+        return "unknown"
+    pins = set()
+    for dist in distributions():
+        name = dist.metadata["Name"] if dist.metadata else None
+        if name:
+            pins.add(f"{re.sub(r'[-_.]+', '-', name).lower()}=={dist.version}")
+    return hashlib.sha256("\n".join(sorted(pins)).encode("utf-8")).hexdigest()
+
+
+class BuildFingerprint:
+    """
+    sha256 über alle Eingaben, die die unsignierte EXE bestimmen: Quelltexte (inkl. lokaler Imports),
+    Icon, Assets, Build-Optionen, Dependency- und Lock-Dateien, installierte Distributionen,
+    Interpreter, PyInstaller-Version und Plattform.
+    Gleicher Fingerprint auf zwei Maschinen -> gleiches Build-Ergebnis, der Build kann übersprungen werden.
+    """
+
+    VERSION = 2
+
+    def __init__(self, hash_cache: FileHashCache = None):
+        self.hash_cache = hash_cache
+
+    def _file(self, path: Path) -> str:
+        if self.hash_cache is None:
+            return file_digest(path)
+        st = path.stat()
+        digest = self.hash_cache.lookup(path, st)
+        if digest is None:
+            digest = file_digest(path)
+            self.hash_cache.store(path, st, digest)
+        return digest
+
+    def _tree(self, path: Path, h, label: str):
+        path = Path(path)
+        if path.is_file():
+            h.update(f"{label}\0{self._file(path.resolve())}\n".encode("utf-8"))
+            return
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS)
+            for name in sorted(names):
+                full = Path(root) / name
+                rel = full.relative_to(path).as_posix()
+                h.update(f"{label}/{rel}\0{self._file(full.resolve())}\n".encode("utf-8"))
+
+    def compute(self, config: dict, plan: dict, extra: dict = None) -> str:
+        h = hashlib.sha256()
+        env = {
+            "fingerprint": self.VERSION,
+            "python": platform.python_version(),
+            "interpreter": sys.version,
+            "cache_tag": sys.implementation.cache_tag,
+            "implementation": platform.python_implementation(),
+            "platform": sys.platform,
+            "machine": platform.machine(),
+            "pyinstaller": _pyinstaller_version(),
+            "distributions": _installed_distributions(),
+        }
+        h.update(json.dumps(env, sort_keys=True).encode("utf-8"))
+
+        if plan["mode"] == "config":
+            root = Path(plan["project_root"])
+            h.update(json.dumps({"args": plan["args"]}).encode("utf-8"))
+            self._tree(root, h, "project")
+        else:
+            script = Path(config["script_file"]).resolve()
+            options = {k: config.get(k) for k in ("app_name", "console", "one_file")}
+            h.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+            root = script.parent
+            for module in sorted({script} | local_imports(script)):
+                self._tree(module, h, f"src:{Path(module).relative_to(root).as_posix()}")
+            if config.get("icon_path") and Path(config["icon_path"]).exists():
+                self._tree(Path(config["icon_path"]), h, "icon")
+
+        for item in sorted(plan.get("assets", [])):
+            if Path(item).exists():
+                # Nur Name + Inhalt zählt, nicht der absolute Pfad auf der jeweiligen Maschine
+                self._tree(Path(item), h, f"asset:{Path(item).name}")
+
+        for name in _DEPENDENCY_FILES:
+            dep = root / name
+            if dep.is_file():
+                self._tree(dep, h, f"deps:{name}")
+
+        if extra:
+            h.update(json.dumps(extra, sort_keys=True, default=str).encode("utf-8"))
+        if self.hash_cache is not None:
+            self.hash_cache.save()
+        return h.hexdigest()
+
+
+class RemoteCacheError(Exception):
+    """Fehler bei der Kommunikation mit dem Remote-Cache (wird nie bis in den Build durchgereicht)."""
+
+
+class RemoteBuildCache:
+    """
+    Client für den Remote-Build-Cache (HTTP, nur stdlib):
+      GET/HEAD/PUT /cas/<sha256>     Inhalte (EXE), gestreamt und per sha256 geprüft
+      GET/PUT      /ac/<fingerprint> Zuordnung Build-Fingerprint -> {"name", "sha256", "size"}
+    Jeder Fehler führt zu einem normalen lokalen Build; nach wiederholten Fehlern sperrt ein
+    Circuit Breaker den Cache, damit Builds nicht auf Timeouts warten.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0, token: str = None):
+        self.url = url.rstrip("/")
+        parsed = urlparse(self.url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.https = parsed.scheme == "https"
+        self.prefix = parsed.path
+        self.timeout = timeout
+        self.token = token if token is not None else os.environ.get("EXEBUILDER_CACHE_TOKEN")
+        self.breaker = retry_engine.breaker(f"remote-cache:{self.host}:{self.port}")
+        self.stats = {"hits": 0, "misses": 0, "uploads": 0, "errors": 0, "bytes_down": 0, "bytes_up": 0}
+
+    @classmethod
+    def from_config(cls, config: dict):
+        # Explizites "remote_cache": null in der Config schaltet auch die Umgebungsvariable ab
+        url = config["remote_cache"] if "remote_cache" in config else os.environ.get("EXEBUILDER_REMOTE_CACHE")
+        return cls(url, timeout=float(config.get("remote_cache_timeout", 10.0))) if url else None
+
+    # --- HTTP ---
+
+    def _connection(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _headers(self, extra: dict = None) -> dict:
+        headers = dict(extra or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _guarded(self, action: str, func, default):
+        """Führt einen Cache-Zugriff aus; Fehler werden geloggt und zählen für den Circuit Breaker."""
+        if not self.breaker.allow():
+            return default
+        try:
+            result = func()
+        except (OSError, http.client.HTTPException, RemoteCacheError, ValueError) as e:
+            self.breaker.record_failure()
+            self.stats["errors"] += 1
+            log.warning(f"Remote-Cache ({action}) fehlgeschlagen, fahre ohne Cache fort: {e}")
+            return default
+        self.breaker.record_success()
+        return result
+
+    # --- Inhalte ---
+
+    def _download(self, digest: str, dest: Path) -> Path:
+        conn = self._connection()
+        tmp = dest.with_name(dest.name + ".download")
+        try:
+            conn.request("GET", f"{self.prefix}/cas/{digest}", headers=self._headers())
+            resp = conn.getresponse()
+            if resp.status != 200:
+                resp.read()
+                raise RemoteCacheError(f"GET /cas/{digest[:12]}: HTTP {resp.status}")
+            h = hashlib.sha256()
+            size = 0
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                for block in iter(lambda: resp.read(_BLOCK), b""):
+                    f.write(block)
+                    h.update(block)
+                    size += len(block)
+            if h.hexdigest() != digest:
+                raise RemoteCacheError(f"Integritätsfehler: sha256 des Downloads passt nicht zu {digest[:12]}")
+            os.replace(tmp, dest)
+            self.stats["bytes_down"] += size
+            return dest
+        finally:
+            conn.close()
+            tmp.unlink(missing_ok=True)
+
+    def _exists(self, digest: str) -> bool:
+        conn = self._connection()
+        try:
+            conn.request("HEAD", f"{self.prefix}/cas/{digest}", headers=self._headers())
+            resp = conn.getresponse()
+            resp.read()
+            return resp.status == 200
+        finally:
+            conn.close()
+
+    def _upload(self, digest: str, path: Path):
+        size = path.stat().st_size
+        conn = self._connection()
+        try:
+            conn.putrequest("PUT", f"{self.prefix}/cas/{digest}")
+            for key, value in self._headers({"Content-Type": "application/octet-stream",
+                                             "Content-Length": str(size)}).items():
+                conn.putheader(key, value)
+            conn.endheaders()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(_BLOCK), b""):
+                    conn.send(block)
+            resp = conn.getresponse()
+            body = resp.read()
+            if resp.status not in (200, 201):
+                raise RemoteCacheError(f"PUT /cas/{digest[:12]}: HTTP {resp.status} {body[:200]!r}")
+            self.stats["bytes_up"] += size
+        finally:
+            conn.close()
+
+    def _json(self, method: str, path: str, payload=None):
+        conn = self._connection()
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = self._headers({"Content-Type": "application/json"} if body else None)
+            conn.request(method, f"{self.prefix}{path}", body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.status == 404:
+                return None
+            if resp.status >= 400:
+                raise RemoteCacheError(f"{method} {path}: HTTP {resp.status}")
+            return json.loads(data or b"null")
+        finally:
+            conn.close()
+
+    # --- Öffentliche API ---
+
+    def contains(self, fingerprint: str) -> bool:
+        """Gibt es einen Eintrag zum Fingerprint? Nur der kleine /ac-Eintrag, kein Download."""
+        return bool(self._guarded("lookup", lambda: self._json("GET", f"/ac/{fingerprint}"), None))
+
+    @tracer.traced("remote_cache:fetch", cat="cache")
+    def fetch(self, fingerprint: str, dest_dir: Path):
+        """Lädt das Artefakt zum Fingerprint nach 'dest_dir'. None bei Miss oder Fehler."""
+        def run():
+            entry = self._json("GET", f"/ac/{fingerprint}")
+            if not entry:
+                return None
+            if not _DIGEST.match(entry.get("sha256", "")) or Path(entry["name"]).name != entry["name"]:
+                raise RemoteCacheError(f"Ungültiger Cache-Eintrag: {entry}")
+            return self._download(entry["sha256"], Path(dest_dir) / entry["name"])
+
+        result = self._guarded("fetch", run, None)
+        self.stats["hits" if result else "misses"] += 1
+        tracer.current().set(hit=bool(result), fingerprint=fingerprint[:16])
+        return result
+
+    @tracer.traced("remote_cache:store", cat="cache")
+    def store(self, fingerprint: str, artifact: Path, metadata: dict = None) -> bool:
+        """Lädt das Artefakt hoch (falls noch nicht vorhanden) und verknüpft es mit dem Fingerprint."""
+        artifact = Path(artifact)
+        digest = file_digest(artifact)
+
+        def run():
+            if not self._exists(digest):
+                self._upload(digest, artifact)
+            self._json("PUT", f"/ac/{fingerprint}", {"name": artifact.name, "sha256": digest,
+                                                    "size": artifact.stat().st_size, **(metadata or {})})
+            return True
+
+        ok = self._guarded("store", run, False)
+        if ok:
+            self.stats["uploads"] += 1
+        tracer.current().set(stored=ok, sha256=digest)
+        return ok
+
+
+# --- Referenz-Server ---
+
+class _CacheRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ExeBuilderCache/1.0"
+
+    @property
+    def cache(self) -> "CacheServer":
+        return self.server.cache_server
+
+    def log_message(self, fmt, *args):
+        log.debug(f"[Cache] {self.client_address[0]} {fmt % args}")
+
+    def _send(self, code: int, body: bytes = b"", content_type: str = "application/json"):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _target(self):
+        """('cas'|'ac', key) oder None, wenn Pfad/Token ungültig sind (Antwort wurde dann schon gesendet)."""
+        if self.cache.token and not hmac.compare_digest(self.headers.get("Authorization", "").encode("utf-8"),
+                                                        f"Bearer {self.cache.token}".encode("utf-8")):
+            self._discard_body()
+            self._send(401, b'{"error": "unauthorized"}')
+            return None
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+        if len(parts) != 2 or parts[0] not in ("cas", "ac") or not _DIGEST.match(parts[1]):
+            self._discard_body()
+            self._send(404, b'{"error": "not found"}')
+            return None
+        return parts[0], parts[1]
+
+    def _discard_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        while length > 0:
+            chunk = self.rfile.read(min(length, _BLOCK))
+            if not chunk:
+                break
+            length -= len(chunk)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        target = self._target()
+        if target is None:
+            return
+        kind, key = target
+        path = self.cache.path(kind, key)
+        if not path.is_file():
+            return self._send(404, b'{"error": "not found"}')
+        size = path.stat().st_size
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream" if kind == "cas" else "application/json")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_BLOCK), b""):
+                self.wfile.write(block)
+
+    def do_PUT(self):
+        target = self._target()
+        if target is None:
+            return
+        kind, key = target
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            return self._send(411, b'{"error": "Content-Length erforderlich"}')
+        if length > self.cache.max_object_bytes:
+            self._discard_body()
+            return self._send(413, b'{"error": "zu gross"}')
+
+        if kind == "ac":
+            try:
+                entry = json.loads(self.rfile.read(length))
+                if not isinstance(entry.get("sha256"), str) or not _DIGEST.match(entry["sha256"]):
+                    return self._send(400, b'{"error": "ungueltiger sha256"}')
+                if not self.cache.path("cas", entry["sha256"]).is_file():
+                    return self._send(400, b'{"error": "Inhalt fehlt"}')
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return self._send(400, b'{"error": "ungueltiger Eintrag"}')
+            self.cache.write_entry(key, entry)
+            return self._send(201, b"{}")
+
+        # Inhalt gestreamt in eine temporäre Datei, sha256 muss zum Pfad passen
+        target_path = self.cache.path("cas", key)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target_path.with_name(f"{key}.{os.getpid()}.{id(self)}.tmp")
+        h = hashlib.sha256()
+        remaining = length
+        try:
+            with open(tmp, "wb") as f:
+                while remaining > 0:
+                    block = self.rfile.read(min(remaining, _BLOCK))
+                    if not block:
+                        break
+                    f.write(block)
+                    h.update(block)
+                    remaining -= len(block)
+            if remaining or h.hexdigest() != key:
+                tmp.unlink(missing_ok=True)
+                return self._send(400, b'{"error": "sha256 passt nicht zum Inhalt"}')
+            os.replace(tmp, target_path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self._send(201, b"{}")
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class CacheServer:
+    """Referenz-Implementierung des Cache-Protokolls (lokal, ohne externe Dienste)."""
+
+    def __init__(self, root: Path = Path("builds") / "remote_cache", token: str = None,
+                 max_object_mb: int = 4096):
+        self.root = Path(root)
+        self.objects = ContentStore(self.root / "cas")
+        self.ac_dir = self.root / "ac"
+        self.ac_dir.mkdir(parents=True, exist_ok=True)
+        self.token = token
+        self.max_object_bytes = max_object_mb * 1024 * 1024
+        self.server = None
+
+    def path(self, kind: str, key: str) -> Path:
+        return self.objects.object_path(key) if kind == "cas" else self.ac_dir / f"{key}.json"
+
+    def write_entry(self, key: str, entry: dict):
+        target = self.path("ac", key)
+        tmp = target.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def start(self, host: str = "127.0.0.1", port: int = 8780):
+        if not self.token and not _is_loopback(host):
+            raise ValueError(f"Cache-Server auf {host} nur mit Token (--token / EXEBUILDER_CACHE_TOKEN)")
+        self.server = ThreadingHTTPServer((host, port), _CacheRequestHandler)
+        self.server.daemon_threads = True
+        self.server.cache_server = self
+        return self.server.server_address
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8780):
+        host, port = self.start(host, port)
+        log.success(f"Build-Cache läuft auf http://{host}:{port} (Ablage: {self.root})")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            log.info("Cache-Server wird beendet...")
+        finally:
+            self.server.server_close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Remote-Build-Cache (Referenz-Server)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--root", default=str(Path("builds") / "remote_cache"))
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8780)
+    p_serve.add_argument("--token", default=os.environ.get("EXEBUILDER_CACHE_TOKEN"))
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            CacheServer(Path(args.root), token=args.token).serve(args.host, args.port)
+        except ValueError as e:
+            log.error(str(e))
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
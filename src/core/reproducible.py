@@ -0,0 +1,246 @@
+import os
+import mmap
+import shutil
+import struct
+from array import array
+from pathlib import Path
+from src.core.assets import file_digest
+from src.utils.helpers import log
+
+# 1980-01-01: kleinster Zeitstempel, den auch ZIP/PYZ-Einträge darstellen können
+DEFAULT_EPOCH = 315532800
+
+_DIR_EXPORT, _DIR_RESOURCE, _DIR_DEBUG = 0, 2, 6
+
+
+def source_date_epoch(config: dict) -> int:
+    """Config 'source_date_epoch' > Umgebung SOURCE_DATE_EPOCH > fester Standard."""
+    value = config.get("source_date_epoch") or os.environ.get("SOURCE_DATE_EPOCH")
+    return int(value) if value else DEFAULT_EPOCH
+
+
+def build_environment(epoch: int) -> dict:
+    """Umgebungsvariablen für einen deterministischen PyInstaller-Lauf."""
+    return {
+        "SOURCE_DATE_EPOCH": str(epoch),
+        # Feste Hash-Reihenfolge für set/dict von str im Build-Prozess (PyInstaller-Doku)
+        "PYTHONHASHSEED": "0",
+        "TZ": "UTC",
+        "LC_ALL": "C",
+    }
+
+
+def normalize_tree_times(root: Path, epoch: int):
+    """Setzt mtime/atime aller Dateien und Ordner unter 'root' (oder der Datei selbst) auf 'epoch'."""
+    root = Path(root)
+    if root.is_file():
+        os.utime(root, (epoch, epoch))
+        return
+    for current, dirs, files in os.walk(root, topdown=False):
+        for name in files:
+            os.utime(Path(current) / name, (epoch, epoch))
+        os.utime(current, (epoch, epoch))
+
+
+class PEImage:
+    """
+    Minimaler PE-Parser für die Felder, die zwischen zwei Builds variieren. 'data' ist ein
+    bytes-artiger Puffer, in der Regel ein mmap der Datei (EXEs mit Archiv sind oft Hunderte MB groß).
+    """
+
+    def __init__(self, data):
+        self.data = data
+        if data[:2] != b"MZ":
+            raise ValueError("Kein PE (MZ fehlt)")
+        self.pe = struct.unpack_from("<I", data, 0x3C)[0]
+        if data[self.pe:self.pe + 4] != b"PE\0\0":
+            raise ValueError("Kein PE (Signatur fehlt)")
+        self.num_sections, = struct.unpack_from("<H", data, self.pe + 6)
+        self.opt_size, = struct.unpack_from("<H", data, self.pe + 20)
+        self.opt = self.pe + 24
+        magic, = struct.unpack_from("<H", data, self.opt)
+        if magic not in (0x10B, 0x20B):
+            raise ValueError("Unbekannter Optional-Header")
+        dirs_at = self.opt + (96 if magic == 0x10B else 112)
+        count, = struct.unpack_from("<I", data, dirs_at - 4)
+        self.directories = [struct.unpack_from("<II", data, dirs_at + 8 * i) for i in range(min(count, 16))]
+        table = self.opt + self.opt_size
+        self.sections = []
+        for i in range(self.num_sections):
+            off = table + 40 * i
+            name = bytes(data[off:off + 8]).rstrip(b"\0").decode(errors="replace")
+            vsize, vaddr, raw_size, raw_ptr = struct.unpack_from("<IIII", data, off + 8)
+            self.sections.append((name, vaddr, max(vsize, raw_size), raw_ptr, raw_size))
+
+    @property
+    def checksum_offset(self) -> int:
+        return self.opt + 64
+
+    def rva_to_offset(self, rva: int):
+        for _, vaddr, vsize, raw_ptr, raw_size in self.sections:
+            if vaddr <= rva < vaddr + vsize and rva - vaddr < raw_size:
+                return raw_ptr + rva - vaddr
+        return None
+
+    def timestamp_offsets(self) -> list:
+        """Alle Dateioffsets von TimeDateStamp-Feldern (COFF, Export, Debug, Ressourcen-Verzeichnisse)."""
+        offsets = [self.pe + 8]
+
+        def directory(index):
+            if index < len(self.directories) and self.directories[index][0]:
+                rva, size = self.directories[index]
+                return self.rva_to_offset(rva), size
+            return None, 0
+
+        export, _ = directory(_DIR_EXPORT)
+        if export is not None:
+            offsets.append(export + 4)
+
+        debug, size = directory(_DIR_DEBUG)
+        if debug is not None:
+            for i in range(size // 28):
+                offsets.append(debug + 28 * i + 4)
+
+        resource, _ = directory(_DIR_RESOURCE)
+        if resource is not None:
+            seen, stack = set(), [resource]
+            while stack:
+                node = stack.pop()
+                if node in seen or node + 16 > len(self.data):
+                    continue
+                seen.add(node)
+                offsets.append(node + 4)
+                named, ids = struct.unpack_from("<HH", self.data, node + 12)
+                for i in range(named + ids):
+                    entry = node + 16 + 8 * i
+                    if entry + 8 > len(self.data):
+                        break
+                    target, = struct.unpack_from("<I", self.data, entry + 4)
+                    if target & 0x80000000:  # Unterverzeichnis
+                        stack.append(resource + (target & 0x7FFFFFFF))
+        return offsets
+
+    def compute_checksum(self, chunk: int = 1024 * 1024) -> int:
+        """PE-Prüfsumme (wie imagehlp!CheckSumMappedFile), blockweise über 16-Bit-Wörter."""
+        data = self.data
+        swap = struct.pack("=H", 1) != struct.pack("<H", 1)
+        total = 0
+        for start in range(0, len(data), chunk):  # 'chunk' gerade -> Wortgrenzen bleiben erhalten
+            buf = bytes(data[start:start + chunk])
+            words = array("H")
+            words.frombytes(buf + b"\0" if len(buf) % 2 else buf)
+            if words.itemsize != 2:
+                raise RuntimeError("array('H') ist nicht 16 Bit")
+            if swap:
+                words.byteswap()
+            total += sum(words)
+        total -= sum(struct.unpack_from("<HH", data, self.checksum_offset))
+        while total >> 16:
+            total = (total & 0xFFFF) + (total >> 16)
+        return (total + len(data)) & 0xFFFFFFFF
+
+    def region_of(self, offset: int) -> str:
+        if offset < self.opt + self.opt_size + 40 * self.num_sections:
+            return "PE-Header"
+        for name, _, _, raw_ptr, raw_size in self.sections:
+            if raw_ptr <= offset < raw_ptr + raw_size:
+                return f"Sektion {name}"
+        end = max((p + s for _, _, _, p, s in self.sections), default=0)
+        return "Overlay (PyInstaller-Archiv)" if offset >= end else "zwischen Sektionen"
+
+
+def normalize_executable(path: Path, epoch: int) -> bool:
+    """
+    Entfernt nichtdeterministische PE-Metadaten: alle TimeDateStamps -> 'epoch', Prüfsumme neu berechnet.
+    ELF und andere Formate bleiben unverändert. Rückgabe: True, wenn etwas geändert wurde.
+    Gepatcht wird eine Kopie per mmap; die Datei liegt nie vollständig im Speicher.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.read(2) != b"MZ":
+            return False
+    tmp = path.with_name(path.name + ".norm")
+    shutil.copyfile(path, tmp)
+    changed = False
+    try:
+        with open(tmp, "r+b") as f, mmap.mmap(f.fileno(), 0) as data:
+            image = PEImage(data)
+            stamp = struct.pack("<I", epoch & 0xFFFFFFFF)
+            for off in image.timestamp_offsets():
+                if off + 4 <= len(data) and data[off:off + 4] != stamp:
+                    data[off:off + 4] = stamp
+                    changed = True
+            checksum = struct.pack("<I", image.compute_checksum())
+            if data[image.checksum_offset:image.checksum_offset + 4] != checksum:
+                data[image.checksum_offset:image.checksum_offset + 4] = checksum
+                changed = True
+            if changed:
+                data.flush()
+    except (ValueError, struct.error):
+        changed = False  # Kein (gültiges) PE
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if not changed:
+        tmp.unlink(missing_ok=True)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def first_difference(a: Path, b: Path, chunk: int = 1024 * 1024):
+    """Offset des ersten abweichenden Bytes (oder None bei identischen Dateien)."""
+    offset = 0
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            ca, cb = fa.read(chunk), fb.read(chunk)
+            if ca != cb:
+                for i, (x, y) in enumerate(zip(ca, cb)):
+                    if x != y:
+                        return offset + i
+                return offset + min(len(ca), len(cb))
+            if not ca:
+                return None
+            offset += len(ca)
+
+
+def describe_difference(a: Path, b: Path) -> str:
+    offset = first_difference(a, b)
+    if offset is None:
+        return "identisch"
+    region = "unbekannt"
+    try:
+        with open(a, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            region = PEImage(data).region_of(offset)
+    except (ValueError, struct.error):
+        pass
+    return f"erste Abweichung bei Offset 0x{offset:x} ({region}), Größen {a.stat().st_size}/{b.stat().st_size}"
+
+
+class DeterminismCheck:
+    """Baut zweimal mit identischen Eingaben und vergleicht die SHA-256 der unsignierten Executables."""
+
+    def __init__(self, build_func, keep_dir: Path = Path("builds") / "repro"):
+        # build_func() -> Pfad zur fertigen (normalisierten) EXE oder None
+        self.build_func = build_func
+        self.keep_dir = keep_dir
+
+    def run(self) -> dict:
+        self.keep_dir.mkdir(parents=True, exist_ok=True)
+        digests, copies = [], []
+        for attempt in (1, 2):
+            exe = self.build_func()
+            if not exe:
+                return {"reproducible": False, "error": f"Build {attempt} fehlgeschlagen", "digests": digests}
+            copy = self.keep_dir / f"build{attempt}{Path(exe).suffix}"
+            shutil.copy2(exe, copy)
+            copies.append(copy)
+            digests.append(file_digest(copy))
+
+        result = {"reproducible": digests[0] == digests[1], "digests": digests, "error": None}
+        if result["reproducible"]:
+            log.success(f"Reproduzierbar: beide Builds ergeben sha256 {digests[0][:16]}...")
+        else:
+            result["difference"] = describe_difference(copies[0], copies[1])
+            log.error(f"NICHT reproduzierbar: {result['difference']} (Kopien in {self.keep_dir})")
+        return result
@@ -0,0 +1,469 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from pathlib import Path
+from src.utils.helpers import log
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_MB = 1024 * 1024
+
+
+def kill_process_tree(pid: int):
+    """Beendet einen Prozess inkl. aller Kinder (psutil wenn verfügbar)."""
+    if psutil is not None:
+        try:
+            parent = psutil.Process(pid)
+            procs = parent.children(recursive=True) + [parent]
+        except psutil.NoSuchProcess:
+            return
+        for p in procs:
+            try:
+                p.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(procs, timeout=5)
+        return
+
+    if sys.platform == "win32":
+        import subprocess
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+    else:
+        try:
+            os.kill(pid, 9)
+        except ProcessLookupError:
+            pass
+
+
+# Job, zu dem der aktuelle Thread gehört (Pipeline-Stages erben den Kontext)
+current_job = contextvars.ContextVar("exebuilder_job", default=None)
+
+
+class ProcessRegistry:
+    """
+    Merkt sich die Kindprozesse (PyInstaller, osslsigncode) pro Job, damit ein Abbruch
+    den kompletten Prozessbaum beenden kann. Prozesse ohne Job-Kontext werden ignoriert.
+    """
+
+    def __init__(self):
+        self._procs = {}
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    def register(self, pid: int):
+        job_id = current_job.get()
+        if job_id is None:
+            return
+        with self._lock:
+            self._procs.setdefault(job_id, set()).add(pid)
+            cancelled = job_id in self._cancelled
+        if cancelled:
+            # Abbruch kam, bevor der Prozess lief
+            kill_process_tree(pid)
+
+    def unregister(self, pid: int):
+        job_id = current_job.get()
+        if job_id is None:
+            return
+        with self._lock:
+            pids = self._procs.get(job_id)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._procs[job_id]
+
+    def cancel(self, job_id: str) -> int:
+        """Beendet alle Prozessbäume des Jobs; spätere Prozesse des Jobs werden sofort beendet."""
+        with self._lock:
+            self._cancelled.add(job_id)
+            pids = list(self._procs.get(job_id, ()))
+        for pid in pids:
+            kill_process_tree(pid)
+        if pids:
+            log.warning(f"Job {job_id}: {len(pids)} Prozessbaum/-bäume beendet.")
+        return len(pids)
+
+    def is_cancelled(self, job_id: str = None) -> bool:
+        job_id = job_id or current_job.get()
+        with self._lock:
+            return job_id in self._cancelled
+
+    def forget(self, job_id: str):
+        with self._lock:
+            self._cancelled.discard(job_id)
+            self._procs.pop(job_id, None)
+
+
+class ResourceLimits:
+    """
+    Optionale Grenzen pro Build.
+    memory_mb:   RAM des gesamten Prozessbaums (cgroup memory.max, sonst RSS-Watchdog)
+    cpu_percent: CPU-Anteil in Prozent eines Kerns, 200 = 2 Kerne (nur cgroup cpu.max)
+    cpu_seconds: CPU-Zeit pro Prozess (RLIMIT_CPU, nur POSIX)
+    """
+
+    def __init__(self, memory_mb: int = None, cpu_percent: int = None, cpu_seconds: int = None):
+        self.memory_mb = memory_mb
+        self.cpu_percent = cpu_percent
+        self.cpu_seconds = cpu_seconds
+
+    @classmethod
+    def from_config(cls, config: dict):
+        limits = cls(config.get("max_memory_mb"), config.get("max_cpu_percent"), config.get("max_cpu_seconds"))
+        return limits if limits else None
+
+    def __bool__(self):
+        return any((self.memory_mb, self.cpu_percent, self.cpu_seconds))
+
+    def as_dict(self) -> dict:
+        return {"memory_mb": self.memory_mb, "cpu_percent": self.cpu_percent, "cpu_seconds": self.cpu_seconds}
+
+    def preexec(self):
+        """Für Popen(preexec_fn=...) bzw. das Fork-Kind: rlimits im Kindprozess setzen (nur POSIX)."""
+        if resource is None or not self.cpu_seconds:
+            return None
+        seconds = int(self.cpu_seconds)
+
+        def apply():
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds))
+        return apply
+
+
+class CgroupSandbox:
+    """
+    cgroup v2 Gruppe pro Build. Benötigt ein delegiertes Verzeichnis in EXEBUILDER_CGROUP_ROOT
+    (z.B. per 'systemd-run --user --scope -p Delegate=yes'). Ohne Delegation: available() ist False.
+    """
+
+    ENV = "EXEBUILDER_CGROUP_ROOT"
+
+    def __init__(self, name: str, limits: ResourceLimits):
+        self.path = Path(os.environ[self.ENV]) / name
+        self.limits = limits
+
+    @classmethod
+    def available(cls) -> bool:
+        root = os.environ.get(cls.ENV)
+        return bool(root) and sys.platform.startswith("linux") and (Path(root) / "cgroup.controllers").exists()
+
+    def create(self):
+        self.path.mkdir(exist_ok=True)
+        if self.limits.memory_mb:
+            (self.path / "memory.max").write_text(str(int(self.limits.memory_mb * _MB)))
+            # Kein Swap: lieber sauber am Limit scheitern als den Host auslagern lassen
+            swap = self.path / "memory.swap.max"
+            if swap.exists():
+                swap.write_text("0")
+        if self.limits.cpu_percent:
+            period = 100000
+            (self.path / "cpu.max").write_text(f"{int(period * self.limits.cpu_percent / 100)} {period}")
+
+    def attach(self, pid: int):
+        (self.path / "cgroup.procs").write_text(str(pid))
+
+    def contains(self, pid: int) -> bool:
+        try:
+            return str(pid) in (self.path / "cgroup.procs").read_text().split()
+        except OSError:
+            return False
+
+    def oom_killed(self) -> bool:
+        try:
+            for line in (self.path / "memory.events").read_text().splitlines():
+                key, value = line.split()
+                if key == "oom_kill" and int(value) > 0:
+                    return True
+        except (OSError, ValueError):
+            pass
+        return False
+
+    def remove(self):
+        try:
+            self.path.rmdir()
+        except OSError:
+            pass
+
+
+class ResourceSampler:
+    """
+    Misst CPU, RSS und I/O eines Prozessbaums in einem Hintergrund-Thread (psutil).
+    Überschreitet der Baum 'limits.memory_mb', wird er beendet (plattformunabhängiger Watchdog).
+    """
+
+    def __init__(self, pid: int, interval: float = 0.25, limits: ResourceLimits = None):
+        self.pid = pid
+        self.interval = interval
+        self.limits = limits
+        self.killed_reason = None
+        self._procs = {}
+        self._io = {}
+        self._samples = 0
+        self._rss_sum = 0
+        self._cpu_sum = 0.0
+        self._peak_rss = 0
+        self._peak_cpu = 0.0
+        self._peak_procs = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._start = None
+
+    @staticmethod
+    def available() -> bool:
+        return psutil is not None
+
+    def start(self):
+        self._start = time.perf_counter()
+        if psutil is None:
+            return self
+        self._thread = threading.Thread(target=self._loop, name=f"sampler-{self.pid}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _tree(self) -> list:
+        try:
+            root = self._procs.get(self.pid) or psutil.Process(self.pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+        # Process-Objekte wiederverwenden, sonst liefert cpu_percent() immer 0
+        current = {}
+        for p in procs:
+            current[p.pid] = self._procs.get(p.pid, p)
+        self._procs = current
+        return list(current.values())
+
+    def sample(self):
+        rss, cpu = 0, 0.0
+        procs = self._tree()
+        for p in procs:
+            try:
+                with p.oneshot():
+                    rss += p.memory_info().rss
+                    cpu += p.cpu_percent(None)
+                    try:
+                        io = p.io_counters()
+                        self._io[p.pid] = (io.read_bytes, io.write_bytes)
+                    except (AttributeError, psutil.AccessDenied):
+                        pass  # macOS kennt keine io_counters
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        if not procs:
+            return
+        self._samples += 1
+        self._rss_sum += rss
+        self._cpu_sum += cpu
+        self._peak_rss = max(self._peak_rss, rss)
+        self._peak_cpu = max(self._peak_cpu, cpu)
+        self._peak_procs = max(self._peak_procs, len(procs))
+
+        if self.limits and self.limits.memory_mb and rss > self.limits.memory_mb * _MB and not self.killed_reason:
+            self.killed_reason = f"Speicherlimit überschritten ({rss / _MB:.0f} MB > {self.limits.memory_mb} MB)"
+            log.error(f"Build beendet: {self.killed_reason}")
+            kill_process_tree(self.pid)
+
+    def _loop(self):
+        self.sample()
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.report()
+
+    def report(self) -> dict:
+        n = max(1, self._samples)
+        return {
+            "sampled": psutil is not None,
+            "samples": self._samples,
+            "duration": round(time.perf_counter() - self._start, 3) if self._start else 0.0,
+            "peak_rss_mb": round(self._peak_rss / _MB, 1),
+            "avg_rss_mb": round(self._rss_sum / n / _MB, 1),
+            "peak_cpu_percent": round(self._peak_cpu, 1),
+            "avg_cpu_percent": round(self._cpu_sum / n, 1),
+            "peak_processes": self._peak_procs,
+            "io_read_mb": round(sum(r for r, _ in self._io.values()) / _MB, 1),
+            "io_write_mb": round(sum(w for _, w in self._io.values()) / _MB, 1),
+            "killed": self.killed_reason,
+        }
+
+
+class ResourceHistory:
+    """Gemessene Spitzenwerte pro App (JSON), damit der Governor parallele Builds realistisch packen kann."""
+
+    KEEP = 10
+
+    def __init__(self, path: Path = Path("builds") / "cache" / "resource_history.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _entries(self) -> dict:
+        """Erst beim ersten Zugriff laden (nicht beim Import); Aufrufer hält self._lock."""
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def record(self, app: str, report: dict):
+        if not report.get("samples"):
+            return
+        with self._lock:
+            entries = self._entries().setdefault(app, [])
+            entries.append({"peak_rss_mb": report["peak_rss_mb"], "peak_cpu_percent": report["peak_cpu_percent"],
+                            "duration": report["duration"], "time": int(time.time())})
+            del entries[:-self.KEEP]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.path.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
+            except OSError as e:
+                log.debug(f"Ressourcen-Historie nicht gespeichert: {e}")
+
+    def estimate_memory_mb(self, app: str, default: float = 1024.0) -> float:
+        """Höchster Peak der letzten Läufe (+10% Reserve), sonst 'default'."""
+        with self._lock:
+            entries = self._entries().get(app)
+        if not entries:
+            return default
+        return max(e["peak_rss_mb"] for e in entries) * 1.1
+
+
+class ResourceGovernor:
+    """
+    Lässt parallele Builds nur so weit zu, wie ihr geschätzter Speicherbedarf in das Budget passt
+    (Standard: 80% des physischen RAMs). Ein einzelner Build wird immer zugelassen.
+    """
+
+    def __init__(self, memory_budget_mb: float = None, history: ResourceHistory = None):
+        if memory_budget_mb is None:
+            total = psutil.virtual_memory().total / _MB if psutil is not None else None
+            memory_budget_mb = total * 0.8 if total else None
+        self.memory_budget_mb = memory_budget_mb
+        self.history = history or ResourceHistory()
+        self._cond = threading.Condition()
+        self._reserved = 0.0
+        self._active = 0
+
+    def _estimate(self, app: str, limits: ResourceLimits = None) -> float:
+        estimate = self.history.estimate_memory_mb(app)
+        if limits and limits.memory_mb:
+            estimate = min(estimate, limits.memory_mb)
+        return estimate
+
+    def acquire(self, app: str, limits: ResourceLimits = None) -> float:
+        need = self._estimate(app, limits)
+        with self._cond:
+            if self.memory_budget_mb is not None:
+                waited = False
+                while self._active and self._reserved + need > self.memory_budget_mb:
+                    if not waited:
+                        log.info(f"⏳ {app}: warte auf Speicher ({need:.0f} MB benötigt, "
+                                 f"{self.memory_budget_mb - self._reserved:.0f} MB frei)")
+                        waited = True
+                    self._cond.wait()
+            self._reserved += need
+            self._active += 1
+        return need
+
+    def release(self, reserved: float):
+        with self._cond:
+            self._reserved -= reserved
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record(self, app: str, report: dict):
+        self.history.record(app, report)
+
+
+class ResourceMonitor:
+    """Bündelt Governor, Limits (cgroup/rlimit) und Sampler für genau einen Kindprozess."""
+
+    def __init__(self, app: str, limits: ResourceLimits = None, governor: "ResourceGovernor" = None):
+        self.app = app
+        self.limits = limits
+        self.governor = governor
+        self.cgroup = None
+        self.sampler = None
+        self._reserved = None
+        self.report = None
+
+    def __enter__(self):
+        if self.governor:
+            self._reserved = self.governor.acquire(self.app, self.limits)
+        if self.limits and (self.limits.memory_mb or self.limits.cpu_percent) and CgroupSandbox.available():
+            sandbox = CgroupSandbox(f"exebuilder-{os.getpid()}-{threading.get_ident()}", self.limits)
+            try:
+                sandbox.create()
+                self.cgroup = sandbox
+            except OSError as e:
+                log.warning(f"cgroup konnte nicht angelegt werden ({e}) - nur Watchdog aktiv.")
+                sandbox.remove()
+        return self
+
+    def preexec(self):
+        """
+        Läuft im Kindprozess vor exec: rlimits setzen und sich selbst in die cgroup eintragen. So gelten
+        die Limits ab der ersten Instruktion, auch für Enkelprozesse, die PyInstaller sofort startet.
+        """
+        rlimits = self.limits.preexec() if self.limits else None
+        cgroup = self.cgroup
+        if not cgroup:
+            return rlimits
+
+        def apply():
+            if rlimits:
+                rlimits()
+            try:
+                cgroup.attach(os.getpid())
+            except OSError:
+                pass  # Kein Logging im Kind; attach() prüft im Elternprozess nach
+        return apply
+
+    def child_limits(self) -> dict:
+        """preexec() als Daten, für Kinder, die ein anderer Prozess forkt (Zygote)."""
+        return {"cpu_seconds": self.limits.cpu_seconds if self.limits else None,
+                "cgroup": str(self.cgroup.path) if self.cgroup else None}
+
+    def attach(self, pid: int):
+        """Nach dem Start des Kindprozesses aufrufen: cgroup-Zuordnung prüfen, Sampler starten."""
+        if self.cgroup and not self.cgroup.contains(pid):
+            log.warning(f"Prozess {pid} ist nicht in der cgroup - nur Watchdog aktiv.")
+        self.sampler = ResourceSampler(pid, limits=self.limits).start()
+
+    def __exit__(self, *exc):
+        self.report = self.sampler.stop() if self.sampler else None
+        if self.report is not None:
+            self.report["limits"] = self.limits.as_dict() if self.limits else None
+            if self.cgroup:
+                self.report["enforcement"] = "cgroup"
+                if self.cgroup.oom_killed():
+                    self.report["killed"] = f"cgroup OOM ({self.limits.memory_mb} MB)"
+            elif self.limits:
+                self.report["enforcement"] = "watchdog/rlimit"
+        if self.cgroup:
+            self.cgroup.remove()
+        if self.governor:
+            if self.report:
+                self.governor.record(self.app, self.report)
+            self.governor.release(self._reserved)
+        return False
+
+
+# Singleton Instanz (prozessweit, damit parallele Builds im selben Prozess sich ein Budget teilen)
+resource_governor = ResourceGovernor()
+process_registry = ProcessRegistry()
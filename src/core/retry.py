@@ -0,0 +1,345 @@
+import sys
+import time
+import errno
+import random
+import socket
+import threading
+import contextlib
+import contextvars
+import subprocess
+from src.utils.helpers import log
+from src.utils.tracing import tracer
+
+
+class ErrorClass:
+    """Fehlerklassen für die Retry-Entscheidung."""
+    TRANSIENT = "transient"   # Netzwerk weg, Timeout, 5xx -> erneut versuchen
+    THROTTLED = "throttled"   # 429 / 503 -> länger warten
+    PERMANENT = "permanent"   # 4xx, Hash-Mismatch, falsches Passwort -> sofort abbrechen
+
+
+class CircuitOpenError(ConnectionError):
+    """Wird geworfen, wenn ein Endpunkt wegen wiederholter Fehler gesperrt ist."""
+
+
+# Netzwerk-Errnos, die typischerweise vorübergehend sind
+_TRANSIENT_ERRNOS = {
+    errno.ECONNRESET, errno.ECONNREFUSED, errno.ECONNABORTED, errno.ETIMEDOUT,
+    errno.ENETUNREACH, errno.ENETDOWN, errno.EHOSTUNREACH, errno.EPIPE,
+}
+
+# Marker in der Tool-Ausgabe (pip / osslsigncode), die auf Netzwerkprobleme hinweisen
+_PIP_TRANSIENT_MARKERS = (
+    "NewConnectionError", "ConnectTimeoutError", "ReadTimeoutError", "ProtocolError",
+    "Temporary failure in name resolution", "Max retries exceeded", "Connection reset",
+    "Could not fetch URL", "HTTP error 5", "Read timed out",
+)
+_PIP_PERMANENT_MARKERS = (
+    "THESE PACKAGES DO NOT MATCH THE HASHES", "No matching distribution found",
+    "Could not find a version that satisfies", "ResolutionImpossible", "Invalid requirement",
+)
+_SIGN_TRANSIENT_MARKERS = (
+    "CURL failure", "Could not resolve", "Couldn't connect", "timed out",
+    "Failed to get timestamp", "Failed to send timestamp", "HTTP code: 5",
+)
+# pip Exit-Codes: 2 = UNKNOWN_ERROR, 3 = VIRTUALENV_NOT_FOUND, 4 = PREVIOUS_BUILD_DIR_ERROR, 23 = NO_MATCHES_FOUND
+_PIP_PERMANENT_CODES = {2, 3, 4, 23}
+
+
+def classify_process_error(exc: subprocess.CalledProcessError) -> str:
+    """Klassifiziert Exit-Codes + Ausgabe von pip und osslsigncode."""
+    cmd = " ".join(str(c) for c in exc.cmd) if isinstance(exc.cmd, (list, tuple)) else str(exc.cmd)
+    output = "\n".join(str(x) for x in (exc.output, exc.stderr) if x)
+
+    if exc.returncode < 0:
+        # Per Signal beendet (z.B. Cancel) -> nicht wiederholen
+        return ErrorClass.PERMANENT
+
+    if " pip " in f" {cmd} " or "-m pip" in cmd:
+        if exc.returncode in _PIP_PERMANENT_CODES:
+            return ErrorClass.PERMANENT
+        if any(m in output for m in _PIP_PERMANENT_MARKERS):
+            return ErrorClass.PERMANENT
+        if any(m in output for m in _PIP_TRANSIENT_MARKERS):
+            return ErrorClass.TRANSIENT
+        # Exit 1 ohne eindeutige Ausgabe: pip meldet Netzwerkfehler ebenfalls mit 1
+        return ErrorClass.TRANSIENT if exc.returncode == 1 and not output else ErrorClass.PERMANENT
+
+    if "osslsigncode" in cmd:
+        if any(m in output for m in _SIGN_TRANSIENT_MARKERS):
+            return ErrorClass.TRANSIENT
+        return ErrorClass.PERMANENT
+
+    return ErrorClass.PERMANENT
+
+
+def classify_exception(exc: BaseException) -> str:
+    """Ordnet eine Exception anhand ihres Typs einer ErrorClass zu."""
+    # requests nur prüfen, wenn es bereits geladen wurde (kein Import-Overhead)
+    requests = sys.modules.get("requests")
+    if requests is not None and hasattr(requests, "exceptions"):
+        rex = requests.exceptions
+        if isinstance(exc, rex.HTTPError):
+            status = exc.response.status_code if exc.response is not None else 0
+            if status in (429, 503):
+                return ErrorClass.THROTTLED
+            if status >= 500 or status == 408:
+                return ErrorClass.TRANSIENT
+            return ErrorClass.PERMANENT
+        if isinstance(exc, (rex.ConnectionError, rex.Timeout, rex.ChunkedEncodingError)):
+            return ErrorClass.TRANSIENT
+
+    if isinstance(exc, CircuitOpenError):
+        return ErrorClass.PERMANENT
+    if isinstance(exc, subprocess.CalledProcessError):
+        return classify_process_error(exc)
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return ErrorClass.TRANSIENT
+    if isinstance(exc, (socket.timeout, socket.gaierror, TimeoutError, ConnectionError)):
+        return ErrorClass.TRANSIENT
+    if isinstance(exc, OSError) and exc.errno in _TRANSIENT_ERRNOS:
+        return ErrorClass.TRANSIENT
+    return ErrorClass.PERMANENT
+
+
+class RetryPolicy:
+    """Budget pro Schritt: maximale Versuche, Gesamtzeit und Backoff-Parameter."""
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+                 budget: float = 120.0, retry_on=(ErrorClass.TRANSIENT, ErrorClass.THROTTLED)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retry_on = tuple(retry_on)
+
+    def compute_delay(self, attempt: int, error_class: str, exc: BaseException = None) -> float:
+        if error_class == ErrorClass.THROTTLED:
+            retry_after = self._retry_after(exc)
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+            base = self.base_delay * 4
+        else:
+            base = self.base_delay
+        cap = min(self.max_delay, base * (2 ** (attempt - 1)))
+        return random.uniform(cap / 2, cap)
+
+    @staticmethod
+    def _retry_after(exc):
+        response = getattr(exc, "response", None)
+        if response is None:
+            return None
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Sperrt einen Endpunkt nach 'failure_threshold' Fehlern in Folge für 'reset_timeout' Sekunden.
+    Danach wird genau ein Probe-Versuch zugelassen (half-open); parallele Aufrufer bleiben gesperrt,
+    bis die Probe per record_success/record_failure/release abgeschlossen ist.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                # Eine hängengebliebene Probe (Aufrufer nie zurückgekehrt) blockiert höchstens reset_timeout
+                if self._probing and now - self._probe_started < self.reset_timeout:
+                    return False
+                self._probing = True
+                self._probe_started = now
+            return True
+
+    def release(self):
+        """Probe ohne Aussage über den Endpunkt beendet (z.B. permanenter Fehler): nächste Probe erlauben."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    log.warning(f"Circuit Breaker offen für '{self.name}' ({self.failures} Fehler in Folge).")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class StepStats:
+    """Retry-Statistik eines Pipeline-Schritts."""
+
+    def __init__(self, step: str):
+        self.step = step
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.time_lost = 0.0
+        self.last_error = None
+
+    def as_dict(self) -> dict:
+        return {
+            "step": self.step,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "time_lost": round(self.time_lost, 3),
+            "last_error": self.last_error,
+        }
+
+
+# Statistik des laufenden Pipeline-Laufs (run_stats); Stage-Threads erben den Kontext
+_run_stats = contextvars.ContextVar("exebuilder_retry_stats", default=None)
+
+
+class RetryEngine:
+    """
+    Führt netzwerkgebundene Schritte mit klassifizierten Retries, Budgets und Circuit Breaking aus.
+    Circuit Breaker gelten prozessweit, die Statistik pro Lauf (run_stats) bzw. sonst prozessweit.
+    """
+
+    DEFAULT_POLICY = RetryPolicy()
+
+    def __init__(self):
+        self.policies = {
+            "download": RetryPolicy(max_attempts=5, base_delay=2.0, max_delay=60.0, budget=300.0),
+            "pip": RetryPolicy(max_attempts=3, base_delay=5.0, max_delay=60.0, budget=900.0),
+            "timestamp": RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=30.0, budget=120.0),
+        }
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(endpoint)
+            return self._breakers[endpoint]
+
+    def _current_stats(self) -> dict:
+        run = _run_stats.get()
+        return self._stats if run is None else run
+
+    def _stats_for(self, step: str) -> StepStats:
+        stats = self._current_stats()
+        with self._lock:
+            if step not in stats:
+                stats[step] = StepStats(step)
+            return stats[step]
+
+    @contextlib.contextmanager
+    def run_stats(self):
+        """Eigene Statistik für einen Lauf; parallele Läufe (Job-Queue, Batch) zählen getrennt."""
+        token = _run_stats.set({})
+        try:
+            yield
+        finally:
+            _run_stats.reset(token)
+
+    def call(self, step: str, func, endpoint: str = None, policy: RetryPolicy = None, network=None):
+        """
+        Führt 'func()' aus. 'step' ist z.B. 'download:osslsigncode'; der Teil vor ':' wählt die Policy.
+        'network' (NetworkGuard) wird bei transienten Fehlern genutzt, um auf die Verbindung zu warten.
+        """
+        policy = policy or self.policies.get(step.split(":", 1)[0], self.DEFAULT_POLICY)
+        stats = self._stats_for(step)
+        breaker = self.breaker(endpoint) if endpoint else None
+        start = time.monotonic()
+        attempt = 0
+
+        with self._lock:
+            stats.calls += 1
+
+        while True:
+            attempt += 1
+            if breaker and not breaker.allow():
+                raise CircuitOpenError(f"Endpunkt '{endpoint}' ist temporär gesperrt (Circuit Breaker).")
+
+            t0 = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                failed_for = time.monotonic() - t0
+                error_class = classify_exception(e)
+                with self._lock:
+                    stats.attempts += 1
+                    stats.time_lost += failed_for
+                    stats.last_error = f"{type(e).__name__}: {e}"
+                if breaker and error_class != ErrorClass.PERMANENT:
+                    breaker.record_failure()
+                elif breaker:
+                    breaker.release()
+
+                if error_class not in policy.retry_on or attempt >= policy.max_attempts:
+                    raise
+
+                delay = policy.compute_delay(attempt, error_class, e)
+                remaining = policy.budget - (time.monotonic() - start)
+                if delay >= remaining:
+                    log.error(f"[{step}] Retry-Budget ({policy.budget:.0f}s) erschöpft.")
+                    raise
+
+                log.warning(f"[{step}] {error_class} Fehler (Versuch {attempt}/{policy.max_attempts}): {e} "
+                            f"-> neuer Versuch in {delay:.1f}s")
+                wait_start = time.monotonic()
+                with tracer.span(f"retry:{step}", cat="network", attempt=attempt, error_class=error_class,
+                                 delay=round(delay, 3), error=f"{type(e).__name__}: {e}"):
+                    time.sleep(delay)
+                    if network is not None:
+                        network.wait_for_network(timeout=max(0.0, remaining - delay))
+                with self._lock:
+                    stats.retries += 1
+                    stats.time_lost += time.monotonic() - wait_start
+                continue
+
+            with self._lock:
+                stats.attempts += 1
+            if breaker:
+                breaker.record_success()
+            return result
+
+    def report(self) -> list:
+        stats = self._current_stats()
+        with self._lock:
+            return [s.as_dict() for s in stats.values()]
+
+    def log_report(self):
+        """Loggt Retries und verlorene Zeit pro Schritt (nur wenn es überhaupt Retries gab)."""
+        for entry in self.report():
+            if entry["retries"] or entry["last_error"]:
+                log.info(f"🔁 {entry['step']}: {entry['retries']} Retries, "
+                         f"{entry['time_lost']:.1f}s verloren (letzter Fehler: {entry['last_error']})")
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Singleton Instanz
+retry_engine = RetryEngine()
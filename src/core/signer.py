@@ -2,7 +2,11 @@ import subprocess
 import shutil
 import os
 from pathlib import Path
+from urllib.parse import urlparse
 from src.utils.helpers import log
+from src.core.retry import retry_engine
+from src.utils.tracing import tracer
+from src.core.resources import process_registry
 
 class AuthenticodeSigner:
     """
@@ -14,7 +18,9 @@ class AuthenticodeSigner:
         self.root_dir = Path(__file__).parent.parent.parent
         self.tool_path = self.root_dir / "tools" / "osslsigncode.exe"
 
+    @tracer.traced("sign:osslsigncode", cat="sign")
     def sign_exe(self, exe_path: Path, pfx_path: Path, password: str) -> bool:
+        tracer.current().set(file=exe_path.name, bytes=exe_path.stat().st_size if exe_path.exists() else None)
         log.info(f"Signiere {exe_path.name} mit {pfx_path.name} via osslsigncode...")
         
         if not self.tool_path.exists():
@@ -48,15 +54,10 @@ class AuthenticodeSigner:
         env["OPENSSL_MODULES"] = tools_dir_str
 
         try:
-            # Ausführen im 'tools' Ordner, aber mit absoluten Pfaden zu den Dateien
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                cwd=tools_dir_str, # Wichtig für DLLs
-                env=env            # Wichtig für legacy.dll
+            # Timestamp-Server sind die häufigste Fehlerquelle -> klassifizierte Retries + Circuit Breaker
+            result = retry_engine.call(
+                "timestamp", lambda: self._run_sign(cmd, tools_dir_str, env, abs_signed_path),
+                endpoint=urlparse(timestamp_server).netloc
             )
 
             if result.returncode == 0 and abs_signed_path.exists():
@@ -70,14 +71,44 @@ class AuthenticodeSigner:
                 log.success(f"Datei signiert: {exe_path.name}")
                 return True
             else:
-                log.error("Signierung fehlgeschlagen.")
-                log.error(f"Exit Code: {result.returncode}")
-                if result.stdout:
-                    log.error(f"Output: {result.stdout.strip()}")
-                if result.stderr:
-                    log.error(f"Error: {result.stderr.strip()}")
+                log.error("Signierung fehlgeschlagen: Signierte Datei fehlt.")
                 return False
 
+        except subprocess.CalledProcessError as e:
+            log.error("Signierung fehlgeschlagen.")
+            log.error(f"Exit Code: {e.returncode}")
+            if e.output:
+                log.error(f"Output: {e.output.strip()}")
+            if e.stderr:
+                log.error(f"Error: {e.stderr.strip()}")
+            return False
         except Exception as e:
             log.error(f"Fehler beim Ausführen von osslsigncode: {e}")
             return False
+
+    def _run_sign(self, cmd: list, cwd: str, env: dict, signed_path: Path) -> subprocess.CompletedProcess:
+        # Reste eines fehlgeschlagenen Versuchs entfernen, sonst bricht osslsigncode ab
+        if signed_path.exists():
+            signed_path.unlink()
+
+        # Ausführen im 'tools' Ordner, aber mit absoluten Pfaden zu den Dateien
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            cwd=cwd, # Wichtig für DLLs
+            env=env  # Wichtig für legacy.dll
+        )
+        # Registriert, damit ein Abbruch in der Build-Queue auch osslsigncode beendet
+        process_registry.register(process.pid)
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            process_registry.unregister(process.pid)
+        result = subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, output=result.stdout, stderr=result.stderr)
+        return result
@@ -0,0 +1,309 @@
+import os
+import ast
+import time
+import threading
+from pathlib import Path
+from src.core.lockfile import LockfileResolver
+from src.utils.inotify import (Inotify, IN_CLOSE_WRITE, IN_MOVED_TO, IN_MOVED_FROM, IN_CREATE,
+                               IN_DELETE, IN_ISDIR)
+from src.utils.helpers import log
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+
+
+def local_imports(script: Path, root: Path = None) -> set:
+    """
+    Alle lokalen Module, die 'script' (transitiv) importiert – per AST, ohne Ausführung.
+    Gesucht wird nur unterhalb von 'root' (Standard: Ordner des Scripts); Site-Packages bleiben außen vor.
+    """
+    script = Path(script).resolve()
+    root = Path(root or script.parent).resolve()
+    found, queue = set(), [script]
+
+    while queue:
+        current = queue.pop()
+        try:
+            tree = ast.parse(current.read_bytes(), filename=str(current))
+        except (OSError, SyntaxError, ValueError):
+            continue
+
+        for node in ast.walk(tree):
+            candidates = []
+            if isinstance(node, ast.Import):
+                candidates = [(root, a.name) for a in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = root
+                if node.level:
+                    base = current.parent
+                    for _ in range(node.level - 1):
+                        base = base.parent
+                module = node.module or ""
+                candidates = [(base, module)] if module else []
+                # 'from pkg import submodul' -> pkg/submodul.py
+                candidates += [(base, f"{module}.{a.name}" if module else a.name) for a in node.names]
+
+            for base, dotted in candidates:
+                for path in _module_files(base, dotted):
+                    if path not in found and path != script and path.is_relative_to(root):
+                        found.add(path)
+                        queue.append(path)
+    return found
+
+
+def _module_files(base: Path, dotted: str) -> list:
+    parts = dotted.split(".")
+    target = base.joinpath(*parts)
+    files = []
+    # Paket-__init__ entlang des Pfads gehört mit zum Import
+    for i in range(1, len(parts)):
+        init = base.joinpath(*parts[:i]) / "__init__.py"
+        if init.exists():
+            files.append(init.resolve())
+    for candidate in (target.with_suffix(".py"), target / "__init__.py"):
+        if candidate.exists():
+            files.append(candidate.resolve())
+            break
+    return files
+
+
+class ChangeWatcher:
+    """
+    Beobachtet einzelne Dateien und (rekursiv) Ordner.
+    Linux: inotify auf die Eltern-Ordner (Editoren speichern oft per Rename). Sonst: mtime/Größe-Polling.
+    """
+
+    def __init__(self, files: dict, dirs: dict, poll_interval: float = 0.5):
+        # {Pfad: Art}
+        self.files = {Path(p).resolve(): kind for p, kind in files.items()}
+        self.dirs = {Path(p).resolve(): kind for p, kind in dirs.items()}
+        self.poll_interval = poll_interval
+        self._inotify = None
+        self._snapshot = {}
+
+        if Inotify.available():
+            try:
+                self._inotify = Inotify()
+                self._setup_inotify()
+            except OSError as e:
+                log.debug(f"inotify nicht nutzbar ({e}) - nutze Polling.")
+                self.close()
+        if self._inotify is None:
+            self._snapshot = self._scan()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify else "polling"
+
+    def _setup_inotify(self):
+        parents = {p.parent for p in self.files}
+        for parent in parents:
+            if parent.is_dir():
+                self._inotify.add_watch(parent, _WATCH_MASK)
+        for d in self.dirs:
+            self._watch_tree(d)
+
+    def _watch_tree(self, top: Path):
+        if not top.is_dir():
+            return
+        self._inotify.add_watch(top, _WATCH_MASK)
+        for root, subdirs, _ in os.walk(top):
+            for sub in subdirs:
+                self._inotify.add_watch(Path(root) / sub, _WATCH_MASK)
+
+    def _kind_of(self, path: Path):
+        if path in self.files:
+            return self.files[path]
+        for d, kind in self.dirs.items():
+            if path == d or path.is_relative_to(d):
+                return kind
+        return None
+
+    def _scan(self) -> dict:
+        snapshot = {}
+
+        def add(p: Path):
+            try:
+                st = p.stat()
+                snapshot[p] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+
+        for f in self.files:
+            add(f)
+        for d in self.dirs:
+            for root, _, names in os.walk(d):
+                for name in names:
+                    add(Path(root) / name)
+        return snapshot
+
+    def wait(self, timeout: float = None) -> dict:
+        """Blockiert bis zu 'timeout' Sekunden. Rückgabe: {geänderter Pfad: Art} (leer = keine Änderung)."""
+        if self._inotify:
+            return self._wait_inotify(timeout)
+        return self._wait_polling(timeout)
+
+    def _wait_inotify(self, timeout) -> dict:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            changes = {}
+            for event in self._inotify.read_events(remaining):
+                path = Path(event.full_path)
+                if event.mask & IN_ISDIR and event.mask & (IN_CREATE | IN_MOVED_TO):
+                    # Neuer Unterordner in einem beobachteten Asset-Baum
+                    if self._kind_of(path):
+                        self._watch_tree(path)
+                kind = self._kind_of(path)
+                if kind:
+                    changes[path] = kind
+            if changes or (deadline is not None and time.monotonic() >= deadline):
+                return changes
+
+    def _wait_polling(self, timeout) -> dict:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {p for p in current.keys() | self._snapshot.keys() if current.get(p) != self._snapshot.get(p)}
+            self._snapshot = current
+            if changed:
+                return {p: self._kind_of(p) for p in changed}
+            if deadline is not None and time.monotonic() >= deadline:
+                return {}
+            sleep = self.poll_interval
+            if deadline is not None:
+                sleep = min(sleep, max(0.0, deadline - time.monotonic()))
+            time.sleep(sleep)
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+
+class WatchSession:
+    """
+    Watch-Modus: Baut einmal komplett, beobachtet danach Script, lokale Imports, Icon, Assets
+    und Dependency-Dateien und baut bei Änderungen nur die betroffenen Stages neu (inkl. Signatur).
+    Mehrere Änderungen innerhalb von 'debounce' Sekunden werden zu einem Rebuild zusammengefasst.
+    """
+
+    # Art der Änderung -> Stages, deren Inputs sich geändert haben (Downstream kommt automatisch dazu)
+    KIND_STAGES = {
+        "script": {"bytecode", "build"},
+        "icon": {"build"},
+        "asset": {"config", "assets"},
+        "dependencies": {"environment:deps"},
+    }
+
+    def __init__(self, orchestrator, config: dict, debounce: float = 0.3, poll_interval: float = 0.5):
+        self.orchestrator = orchestrator
+        self.config = dict(config)
+        # Zwischenstände im Watch-Modus sind keine Releases
+        self.config.setdefault("delta", False)
+        self.config.setdefault("archive", False)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.scheduler = orchestrator.build_pipeline(self.config)
+        self.context = {"config": self.config}
+        self._valid = set()  # Stages, deren Outputs im Kontext aktuell sind
+        self.builds = 0
+
+    def targets(self) -> tuple[dict, dict]:
+        script = Path(self.config["script_file"]).resolve()
+        files = {script: "script"}
+        for module in local_imports(script):
+            files[module] = "script"
+        if self.config.get("icon_path"):
+            files[Path(self.config["icon_path"])] = "icon"
+
+        dirs = {}
+        for item in self.config.get("assets", []):
+            p = Path(item)
+            if p.is_dir():
+                dirs[p] = "asset"
+            else:
+                files[p] = "asset"
+
+        resolver = LockfileResolver.detect(Path("."))
+        if resolver is not None:
+            files[resolver.source] = "dependencies"
+            # Bei poetry.lock (lock-version 2.0) bestimmt pyproject.toml, was zur Hauptgruppe gehört
+            if resolver.source.name == "poetry.lock" and Path("pyproject.toml").exists():
+                files[Path("pyproject.toml")] = "dependencies"
+        return files, dirs
+
+    def rebuild(self, kinds=()) -> object:
+        """Führt nur die Stages aus, deren Inputs sich geändert haben (plus alles dahinter)."""
+        dirty = set()
+        for kind in kinds:
+            dirty |= self.KIND_STAGES.get(kind, set())
+        if "environment:deps" in dirty:
+            self.orchestrator.invalidate_environment("deps")
+        # Stages ohne gültiges Ergebnis (erster Lauf, vorheriger Fehler) laufen immer mit
+        dirty |= set(self.scheduler.stages) - self._valid
+        rerun = self.scheduler.downstream(dirty)
+
+        stale = {out for name in rerun for out in self.scheduler.stages[name].outputs}
+        ctx = {k: v for k, v in self.context.items() if k not in stale}
+        skip = set(self.scheduler.stages) - rerun
+
+        log.info(f"Rebuild: {', '.join(n for n in self.scheduler.topological_order() if n in rerun)}")
+        run = self.scheduler.run(ctx, skip=skip)
+        self.context = run.context
+        for name, result in run.results.items():
+            if result.status == "ok":
+                self._valid.add(name)
+            else:
+                self._valid.discard(name)
+        self.builds += 1
+        # Ab dem zweiten Build den PyInstaller-Analyse-Cache im workpath behalten
+        self.config["clean"] = False
+
+        for failed in run.failed:
+            log.error(f"Stage '{failed.name}' fehlgeschlagen: {failed.error}")
+        if run.ok:
+            log.success(f"✅ Signiert in {run.wall_time:.2f}s: {run.context['signed']}")
+        return run
+
+    def _collect(self, watcher: ChangeWatcher, stop: threading.Event) -> dict:
+        """Wartet auf die erste Änderung und sammelt dann, bis 'debounce' Sekunden Ruhe ist."""
+        changes = {}
+        while not changes:
+            if stop.is_set():
+                return {}
+            changes = watcher.wait(timeout=0.5)
+        while True:
+            more = watcher.wait(timeout=self.debounce)
+            if not more:
+                return changes
+            changes.update(more)
+
+    def _open_watcher(self, targets: tuple) -> ChangeWatcher:
+        files, dirs = targets
+        watcher = ChangeWatcher(files, dirs, poll_interval=self.poll_interval)
+        log.info(f"👀 Watch-Modus ({watcher.backend}): {len(files)} Dateien, {len(dirs)} Ordner. Strg+C beendet.")
+        return watcher
+
+    def run(self, stop: threading.Event = None):
+        stop = stop or threading.Event()
+        # Watcher läuft schon während des Builds, damit Änderungen währenddessen nicht verloren gehen
+        targets = self.targets()
+        watcher = self._open_watcher(targets)
+        try:
+            self.rebuild()
+            while not stop.is_set():
+                changes = self._collect(watcher, stop)
+                if not changes:
+                    continue
+
+                log.info(f"Änderung erkannt: {', '.join(sorted({p.name for p in changes}))}")
+                self.rebuild(set(changes.values()))
+
+                # Neue Imports / Asset-Dateien -> Watcher neu aufsetzen
+                new_targets = self.targets()
+                if new_targets != targets:
+                    watcher.close()
+                    targets = new_targets
+                    watcher = self._open_watcher(targets)
+        finally:
+            watcher.close()
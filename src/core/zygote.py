@@ -0,0 +1,215 @@
+"""
+Zygote für warme Worker: ein frisch gestarteter Interpreter, der PyInstaller vorab importiert und nie
+einen Thread startet. Pro Build forkt er ein Kind, das PyInstaller.__main__.run() direkt aufruft - ohne
+Interpreter- und Import-Kaltstart.
+
+Der Worker selbst darf nicht forken: dort laufen bereits Log-Writer- und Stage-Threads, deren Locks
+(Logging-Queue, Import-Lock) das Kind im gesperrten Zustand erben würde.
+
+Nur Standardbibliothek: die Datei läuft im Zygote als Script, ohne das Paket 'src' (und damit ohne
+dessen Log-Thread) zu importieren. Nur POSIX (fork, Dateideskriptoren über Unix-Sockets).
+"""
+import io
+import os
+import sys
+import json
+import socket
+import struct
+import threading
+import importlib
+import subprocess
+import traceback
+
+# Module, die der Zygote vorab lädt (Import-Kosten fallen einmal pro Worker an statt pro Build)
+WARM_MODULES = ("PyInstaller.__main__", "PyInstaller.building.build_main", "PyInstaller.depend.analysis")
+
+
+def _send(sock: socket.socket, message: dict, fds: list = ()):
+    """Nachricht mit Längenpräfix; Dateideskriptoren reisen als SCM_RIGHTS mit dem Präfix."""
+    data = json.dumps(message).encode("utf-8")
+    socket.send_fds(sock, [struct.pack("<I", len(data))], list(fds))
+    sock.sendall(data)
+
+
+def _recv(sock: socket.socket):
+    """-> (Nachricht, Dateideskriptoren) oder (None, []) bei geschlossener Verbindung."""
+    head, fds = b"", []
+    while len(head) < 4:
+        chunk, new_fds, _, _ = socket.recv_fds(sock, 4 - len(head), 4)
+        fds += new_fds
+        if not chunk:
+            break
+        head += chunk
+    data = b""
+    if len(head) == 4:
+        length, = struct.unpack("<I", head)
+        while len(data) < length:
+            chunk = sock.recv(length - len(data))
+            if not chunk:
+                break
+            data += chunk
+        if len(data) == length:
+            return json.loads(data), fds
+    for fd in fds:
+        os.close(fd)
+    return None, []
+
+
+def _apply_limits(limits: dict):
+    """Wie ResourceMonitor.preexec(): rlimit setzen und sich selbst in die cgroup eintragen."""
+    if limits.get("cpu_seconds"):
+        import resource
+        seconds = int(limits["cpu_seconds"])
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds))
+    if limits.get("cgroup"):
+        try:
+            with open(os.path.join(limits["cgroup"], "cgroup.procs"), "w") as f:
+                f.write(str(os.getpid()))
+        except OSError:
+            pass  # Der Worker prüft die Zuordnung und warnt
+
+
+def _child(request: dict, out_fd: int, ready_fd: int):
+    """Im geforkten Kind: Ausgabe umlenken, Limits setzen, PyInstaller laufen lassen, nie zurückkehren."""
+    code = 1
+    try:
+        os.dup2(out_fd, 1)
+        os.dup2(out_fd, 2)
+        os.close(out_fd)
+        sys.stdout = io.TextIOWrapper(os.fdopen(1, "wb", closefd=False), encoding="utf-8", line_buffering=True)
+        sys.stderr = sys.stdout
+        _apply_limits(request.get("limits") or {})
+        os.close(ready_fd)  # Limits gelten -> der Zygote darf die PID melden
+        os.environ.update(request.get("env") or {})
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        # Wie 'python -m PyInstaller': Arbeitsverzeichnis zuerst im Suchpfad
+        sys.path.insert(0, os.getcwd())
+        import PyInstaller.__main__
+        PyInstaller.__main__.run(request["args"])
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+        finally:
+            os._exit(code)
+
+
+def serve(fd: int):
+    """Hauptschleife des Zygote: ein Build nach dem anderen, bis der Worker die Verbindung schließt."""
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+    sock = socket.socket(fileno=fd)
+    while True:
+        request, fds = _recv(sock)
+        if request is None:
+            return
+        out_fd = fds[0]
+        for extra in fds[1:]:
+            os.close(extra)
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            os.close(ready_r)
+            _child(request, out_fd, ready_w)
+        os.close(out_fd)
+        os.close(ready_w)
+        os.read(ready_r, 1)  # EOF, sobald das Kind seine Limits gesetzt hat (oder gestorben ist)
+        os.close(ready_r)
+        _send(sock, {"pid": pid})
+        _, status = os.waitpid(pid, 0)
+        _send(sock, {"pid": pid, "returncode": os.waitstatus_to_exitcode(status)})
+
+
+class _ZygoteChild:
+    """Ein vom Zygote geforktes PyInstaller-Kind; verhält sich nach außen wie ein Popen-Objekt."""
+
+    def __init__(self, zygote: "Zygote", pid: int, read_fd: int):
+        self._zygote = zygote
+        self.pid = pid
+        self.returncode = None
+        self.stdout = io.TextIOWrapper(os.fdopen(read_fd, "rb"), encoding="utf-8", errors="replace")
+
+    def wait(self) -> int:
+        if self.returncode is None:
+            try:
+                reply, _ = _recv(self._zygote.sock)
+            except OSError:
+                reply = None
+            self.returncode = reply["returncode"] if reply else 1
+            self.stdout.close()
+            self._zygote.lock.release()
+        return self.returncode
+
+    def kill(self):
+        try:
+            os.kill(self.pid, 9)
+        except ProcessLookupError:
+            pass
+
+
+class Zygote:
+    """
+    Worker-Seite: startet den Zygote als eigenen Prozess (vor jedem Build, unabhängig von den Threads
+    des Workers) und liefert pro PyInstaller-Lauf ein Popen-ähnliches Objekt. Ein Lauf gleichzeitig;
+    ist der Zygote belegt oder beendet, startet der Aufrufer PyInstaller wie bisher kalt.
+    """
+
+    def __init__(self):
+        ours, theirs = socket.socketpair()
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__), str(theirs.fileno())],
+                                        pass_fds=[theirs.fileno()], stdin=subprocess.DEVNULL)
+        theirs.close()
+        self.sock = ours
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def supported() -> bool:
+        return hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def spawn(self, args: list, cwd=None, limits: dict = None, env: dict = None):
+        """
+        _ZygoteChild oder None (belegt/beendet). 'limits' wie ResourceMonitor.child_limits(); 'env' nur
+        Variablen, die PyInstaller zur Laufzeit liest (der Interpreter läuft bereits).
+        """
+        if not self.alive() or not self.lock.acquire(blocking=False):
+            return None
+        read_fd, write_fd = os.pipe()
+        try:
+            try:
+                _send(self.sock, {"args": list(args), "cwd": str(cwd) if cwd else None, "limits": limits or {},
+                                  "env": env or {}}, [write_fd])
+            finally:
+                os.close(write_fd)
+            reply, _ = _recv(self.sock)
+        except OSError:
+            reply = None
+        if reply is None:
+            os.close(read_fd)
+            self.lock.release()
+            return None
+        return _ZygoteChild(self, reply["pid"], read_fd)
+
+    def close(self):
+        self.sock.close()
+        try:
+            self.process.wait(5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+if __name__ == "__main__":
+    # Als Script gestartet steht src/core vorn im Suchpfad; dessen Module dürfen nichts überdecken
+    sys.path.pop(0)
+    serve(int(sys.argv[1]))
@@ -0,0 +1,213 @@
+import sys
+import queue
+import tkinter as tk
+from tkinter import ttk
+from collections import deque
+from src.utils.log_backend import backend, DEBUG, INFO, WARNING, ERROR
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+_TAGS = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+_CLEAR = object()
+
+
+class StreamRedirector:
+    """
+    Ersetzt stdout/stderr: Zeilen gehen in die Queue der Konsole (thread-sicher, kein Tk-Aufruf)
+    und zusätzlich unverändert an das ursprüngliche Terminal.
+    """
+
+    def __init__(self, console: "ConsoleView", level: int = INFO, passthrough=None):
+        self.console = console
+        self.level = level
+        self.passthrough = passthrough
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        if self.passthrough is not None:
+            try:
+                self.passthrough.write(text)
+            except (OSError, ValueError):
+                pass
+        self._buffer += text
+        if "\n" in self._buffer:
+            *lines, self._buffer = self._buffer.split("\n")
+            for line in lines:
+                if line.strip():
+                    self.console.put(self.level, line.rstrip("\r"))
+        return len(text)
+
+    def flush(self):
+        if self.passthrough is not None:
+            try:
+                self.passthrough.flush()
+            except (OSError, ValueError):
+                pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class ConsoleView(ttk.Frame):
+    """
+    Build-Konsole der GUI. Producer (Log-Thread, Build-Threads) legen Zeilen nur in eine Queue;
+    der Tk-Mainloop holt sie per after() gebündelt ab. Es werden höchstens 'max_lines' Zeilen
+    gehalten und angezeigt – Speicher und Renderzeit bleiben auch bei 200k Zeilen konstant.
+    """
+
+    def __init__(self, parent, max_lines: int = 5000, interval_ms: int = 50, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.min_level = INFO
+        self._queue = queue.SimpleQueue()
+        self._lines = deque(maxlen=max_lines)   # (level, text) – alle Stufen, ungefiltert
+        self._shown = 0
+        self._search_pos = "1.0"
+        self._build()
+        self.after(self.interval_ms, self._drain)
+
+    # --- Aufbau ---
+
+    def _build(self):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 4))
+        ttk.Label(bar, text="Level:").pack(side="left")
+        self.var_level = tk.StringVar(value="INFO")
+        level_box = ttk.Combobox(bar, textvariable=self.var_level, values=list(LEVELS), width=9, state="readonly")
+        level_box.pack(side="left", padx=(4, 12))
+        level_box.bind("<<ComboboxSelected>>", lambda e: self.set_level(self.var_level.get()))
+
+        ttk.Label(bar, text="Suche:").pack(side="left")
+        self.entry_search = ttk.Entry(bar, width=30)
+        self.entry_search.pack(side="left", padx=4)
+        self.entry_search.bind("<Return>", lambda e: self.search_next())
+        ttk.Button(bar, text="Weiter", command=self.search_next, width=8).pack(side="left")
+        self.lbl_status = ttk.Label(bar, text="")
+        self.lbl_status.pack(side="left", padx=10)
+        ttk.Button(bar, text="Leeren", command=self.clear, width=8).pack(side="right")
+
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+        self.text = tk.Text(body, bg="#1e1e1e", fg="#00ff00", height=8, font=("Consolas", 9),
+                            state="disabled", wrap="none", undo=False)
+        scroll = ttk.Scrollbar(body, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.tag_configure("debug", foreground="#888888")
+        self.text.tag_configure("warning", foreground="#ffcc00")
+        self.text.tag_configure("error", foreground="#ff5555")
+        self.text.tag_configure("match", background="#665500")
+
+    # --- Producer-Seite (beliebiger Thread) ---
+
+    def put(self, level: int, text: str):
+        self._queue.put((level, text))
+
+    def on_log_record(self, record):
+        """Listener für das Log-Backend (läuft im Log-Thread)."""
+        _, level, _, label, msg, _ = record
+        self._queue.put((level, f"[{label}] {msg}" if label else msg))
+
+    def clear(self):
+        """Thread-sicher: Der eigentliche Reset passiert beim nächsten Drain im Tk-Thread."""
+        self._queue.put(_CLEAR)
+
+    def attach(self):
+        """Leitet stdout/stderr und das Log-Backend auf diese Konsole um."""
+        terminal = sys.__stdout__
+        # Backend schreibt farbig weiter ins Terminal, die GUI bekommt die Einträge samt Level
+        backend.console_stream = terminal
+        backend.listeners.append(self.on_log_record)
+        sys.stdout = StreamRedirector(self, INFO, terminal)
+        sys.stderr = StreamRedirector(self, WARNING, sys.__stderr__)
+
+    def detach(self):
+        if self.on_log_record in backend.listeners:
+            backend.listeners.remove(self.on_log_record)
+        backend.console_stream = None
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+    # --- Tk-Thread ---
+
+    def _drain(self):
+        new, reset = [], False
+        try:
+            while True:
+                item = self._queue.get_nowait()
+                if item is _CLEAR:
+                    self._lines.clear()
+                    new, reset = [], True
+                    continue
+                new.append(item)
+        except queue.Empty:
+            pass
+
+        if new or reset:
+            if len(new) > self.max_lines:
+                new = new[-self.max_lines:]
+            self._lines.extend(new)
+            if reset or len(new) == self.max_lines:
+                self._render_all()
+            else:
+                self._append([item for item in new if item[0] >= self.min_level])
+        self.after(self.interval_ms, self._drain)
+
+    def _append(self, items: list):
+        if not items:
+            return
+        at_bottom = self.text.yview()[1] >= 0.999
+        self.text.configure(state="normal")
+        # Aufeinanderfolgende Zeilen gleichen Levels in einem insert()
+        chunk, tag = [], None
+        for level, line in items:
+            line_tag = _TAGS.get(level, "info")
+            if line_tag != tag and chunk:
+                self.text.insert("end", "\n".join(chunk) + "\n", tag)
+                chunk = []
+            tag = line_tag
+            chunk.append(line)
+        if chunk:
+            self.text.insert("end", "\n".join(chunk) + "\n", tag)
+        self._shown += len(items)
+        excess = self._shown - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._shown -= excess
+        self.text.configure(state="disabled")
+        if at_bottom:
+            self.text.see("end")
+        self.lbl_status.configure(text=f"{self._shown} Zeilen")
+
+    def _render_all(self):
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.configure(state="disabled")
+        self._shown = 0
+        self._search_pos = "1.0"
+        self._append([item for item in self._lines if item[0] >= self.min_level])
+        self.lbl_status.configure(text=f"{self._shown} Zeilen")
+
+    def set_level(self, name: str):
+        self.min_level = LEVELS.get(name, INFO)
+        self._render_all()
+
+    def search_next(self):
+        pattern = self.entry_search.get()
+        self.text.tag_remove("match", "1.0", "end")
+        if not pattern:
+            self.lbl_status.configure(text=f"{self._shown} Zeilen")
+            return
+        length = tk.IntVar()
+        pos = self.text.search(pattern, self._search_pos, stopindex="end", nocase=True, count=length)
+        if not pos and self._search_pos != "1.0":
+            pos = self.text.search(pattern, "1.0", stopindex="end", nocase=True, count=length)
+        if not pos:
+            self.lbl_status.configure(text="Kein Treffer")
+            self._search_pos = "1.0"
+            return
+        end = f"{pos}+{length.get()}c"
+        self.text.tag_add("match", pos, end)
+        self.text.see(pos)
+        self._search_pos = end
+        self.lbl_status.configure(text=f"Treffer in Zeile {pos.split('.')[0]}")
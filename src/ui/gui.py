@@ -1,34 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import sys
 import threading
 from pathlib import Path
 
-# Framework Imports
-from src.core.orchestrator import BuildOrchestrator
+# Framework Imports (Orchestrator & Co. werden erst bei Bedarf geladen -> Fenster erscheint sofort)
 from src.utils.helpers import log
+from src.ui.console import ConsoleView
+from src.ui.jobs_panel import JobPanel
 
-try:
-    from tkinterdnd2 import DND_FILES
-except ImportError:
-    pass
-
-class ConsoleRedirector:
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
-
-    def write(self, str_val):
-        try:
-            self.text_widget.configure(state='normal')
-            self.text_widget.insert('end', str_val)
-            self.text_widget.see('end')
-            self.text_widget.configure(state='disabled')
-        except:
-            pass
-        sys.__stdout__.write(str_val)
-
-    def flush(self):
-        sys.__stdout__.flush()
+_ENV_STATUS = {
+    "pending": ("⏳ Umgebung wird vorbereitet...", "#ffcc00"),
+    "ready": ("✅ Umgebung bereit", "#55cc55"),
+    "failed": ("⚠️ Umgebung fehlerhaft (siehe Konsole)", "#ff5555"),
+}
 
 class AppGUI:
     def __init__(self, root, dnd_enabled=False):
@@ -37,11 +21,66 @@ class AppGUI:
         self.root.title("ExeFile Builder - PRO Edition")
         self.root.geometry("1000x900")
         self.root.configure(bg="#2b2b2b")
-        self.orchestrator = BuildOrchestrator()
+        self._orchestrator = None
+        self._orchestrator_lock = threading.Lock()
+        self._env_state = None
         self._setup_styles()
         self._create_widgets()
         if self.dnd_enabled: self._setup_dnd()
 
+    @property
+    def orchestrator(self):
+        """Lazy: Der Import zieht Environment, Netzwerk, Zertifikate usw. nach (~200ms)."""
+        with self._orchestrator_lock:
+            if self._orchestrator is None:
+                from src.core.orchestrator import BuildOrchestrator
+                self._orchestrator = BuildOrchestrator()
+            return self._orchestrator
+
+    # --- ENVIRONMENT (Hintergrund) ---
+    def prepare_environment(self, project_root: Path):
+        """
+        Tools und Dependencies im Hintergrund vorbereiten, während das Fenster schon bedienbar ist.
+        Builds, die vorher gestartet werden, warten in ihren Environment-Stages auf dieselben Locks.
+        """
+        self._env_state = "pending"
+        self._show_env_status()
+        threading.Thread(target=self._prepare_environment, args=(project_root,),
+                         name="EnvironmentPrep", daemon=True).start()
+        self.root.after(200, self._poll_environment)
+
+    def _prepare_environment(self, project_root: Path):
+        try:
+            log.info(f"Analysiere Umgebung in: {project_root}")
+            self.orchestrator.ensure_environment(project_root)
+            self._env_state = "ready"
+        except Exception as e:
+            log.error(f"Kritischer Fehler beim Environment-Setup: {e}")
+            self._env_state = "failed"
+
+    def _poll_environment(self):
+        # Tk nur aus dem Mainloop anfassen: Status per after() abholen
+        self._show_env_status()
+        if self._env_state == "pending":
+            self.root.after(200, self._poll_environment)
+        elif self._env_state == "ready" and not self.dnd_enabled:
+            self._enable_dnd()
+
+    def _show_env_status(self):
+        text, color = _ENV_STATUS.get(self._env_state, ("", "#ffffff"))
+        self.lbl_env.configure(text=text, foreground=color)
+
+    def _enable_dnd(self):
+        """tkinterdnd2 wurde evtl. gerade erst installiert: tkdnd in den laufenden Tk-Interpreter laden."""
+        try:
+            from tkinterdnd2 import TkinterDnD
+            TkinterDnD._require(self.root)
+        except Exception:
+            log.info("Drag & Drop ist ab dem nächsten Start verfügbar.")
+            return
+        self.dnd_enabled = True
+        self._setup_dnd()
+
     def _setup_styles(self):
         style = ttk.Style()
         style.theme_use('clam')
@@ -133,12 +172,18 @@ class AppGUI:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill='x', pady=10)
         ttk.Button(btn_frame, text="🚀 START BUILD & SIGN", command=self.start_build, width=30).pack(side='left')
-        ttk.Button(btn_frame, text="EXIT", command=self.root.quit).pack(side='right')
+        ttk.Button(btn_frame, text="EXIT", command=self._quit).pack(side='right')
+        self.lbl_env = ttk.Label(btn_frame, text="")
+        self.lbl_env.pack(side='left', padx=20)
+
+        # Build-Queue: mehrere Configs einreihen, parallel ausführen, einzeln abbrechen
+        self.jobs = JobPanel(main_frame, lambda: self.orchestrator)
+        self.jobs.pack(fill='x', pady=(0, 10))
 
-        self.txt_console = tk.Text(main_frame, bg="#1e1e1e", fg="#00ff00", height=8, font=("Consolas", 9), state='disabled')
-        self.txt_console.pack(fill='both', expand=True)
-        sys.stdout = ConsoleRedirector(self.txt_console)
-        sys.stderr = ConsoleRedirector(self.txt_console)
+        # Thread-sichere Konsole: Build-Threads schreiben in eine Queue, Tk holt per after() ab
+        self.console = ConsoleView(main_frame)
+        self.console.pack(fill='both', expand=True)
+        self.console.attach()
 
     def _create_file_entry(self, parent, label, attr, row, ftype):
         ttk.Label(parent, text=label).grid(row=row, column=0, sticky='w', pady=5)
@@ -166,6 +211,8 @@ class AppGUI:
         for index in sel[::-1]: self.list_assets.delete(index)
 
     def _setup_dnd(self):
+        from tkinterdnd2 import DND_FILES
+
         def drop_generic(event, entry):
             path = event.data.strip("{}"); entry.delete(0,'end'); entry.insert(0, path)
         
@@ -205,10 +252,8 @@ class AppGUI:
         if not config["script_file"]:
             messagebox.showerror("Fehler", "Kein Script gewählt!"); return
         
-        t = threading.Thread(target=self._run, args=(config,))
-        t.start()
+        self.jobs.submit(config)
 
-    def _run(self, conf):
-        self.txt_console.configure(state='normal'); self.txt_console.delete(1.0,'end'); self.txt_console.configure(state='disabled')
-        try: self.orchestrator.run_full_pipeline(conf)
-        except Exception as e: log.error(f"CRASH: {e}")
+    def _quit(self):
+        self.jobs.shutdown()
+        self.root.quit()
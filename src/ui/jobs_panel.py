@@ -0,0 +1,192 @@
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk
+from src.core.builder import app_build_dir
+from src.core.jobs import JobQueue, Job
+from src.core.resources import current_job, process_registry
+from src.utils.helpers import log
+
+_STATUS = {Job.QUEUED: "Wartend", Job.RUNNING: "Läuft", Job.DONE: "Fertig",
+           Job.FAILED: "Fehler", Job.CANCELLED: "Abgebrochen"}
+_CACHE_LABELS = {"tools": "Tools", "deps": "Deps", "cert": "Zert.", "assets": "Assets", "bytecode": "Bytecode",
+                 "remote": "Remote"}
+_COLUMNS = (("app", "App", 150), ("status", "Status", 90), ("stage", "Stage", 220),
+            ("progress", "Fortschritt", 80), ("elapsed", "Zeit", 70), ("cache", "Cache", 200))
+
+
+class JobPanel(ttk.LabelFrame):
+    """
+    Build-Queue der GUI. Jeder Klick auf "Start" reiht eine Config ein; die JobQueue führt
+    höchstens 'Parallel' Pipelines gleichzeitig aus. Builds mit gleichem App-Namen laufen
+    nacheinander, weil sie sich workpath/spec/dist teilen. Die Tabelle wird per after()
+    aus dem Tk-Thread aktualisiert, Stage-Events landen nur in einem dict.
+    'get_orchestrator' wird erst beim ersten Job aufgerufen, damit der Orchestrator (und seine
+    Importe) den Start der GUI nicht verzögert.
+    """
+
+    def __init__(self, parent, get_orchestrator, max_concurrent: int = 1, interval_ms: int = 250, **kwargs):
+        super().__init__(parent, text=" Build-Queue ", padding=10, **kwargs)
+        self.get_orchestrator = get_orchestrator
+        self.interval_ms = interval_ms
+        self.queue = JobQueue(self._run_job, max_concurrent=max_concurrent)
+        self._progress = {}   # job_id -> {"running": [...], "done": int, "total": int, "failed": str}
+        self._lock = threading.Lock()
+        self._app_locks = {}
+        self._build(max_concurrent)
+        self.after(self.interval_ms, self._refresh)
+
+    # --- Aufbau ---
+
+    def _build(self, max_concurrent: int):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 4))
+        ttk.Label(bar, text="Parallel:").pack(side="left")
+        self.var_concurrency = tk.IntVar(value=max_concurrent)
+        ttk.Spinbox(bar, from_=1, to=max(1, os.cpu_count() or 1), width=4, textvariable=self.var_concurrency,
+                    command=self._apply_concurrency, state="readonly").pack(side="left", padx=(4, 12))
+        ttk.Button(bar, text="Fertige entfernen", command=self.remove_finished).pack(side="right")
+        ttk.Button(bar, text="Abbrechen", command=self.cancel_selected).pack(side="right", padx=4)
+
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, columns=[c[0] for c in _COLUMNS], show="headings", height=5)
+        for key, title, width in _COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, stretch=key in ("stage", "cache"))
+        scroll = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def _apply_concurrency(self):
+        self.queue.set_concurrency(self.var_concurrency.get())
+
+    # --- Bedienung (Tk-Thread) ---
+
+    def submit(self, config: dict) -> Job:
+        total = len(self.get_orchestrator().build_pipeline(config).stages)
+        job = self.queue.submit(config)
+        self._set_progress(job.id, total=total)
+        return job
+
+    def cancel(self, job_id: str):
+        """Wartende Jobs fallen aus der Queue, laufende verlieren ihren PyInstaller-/Signatur-Prozessbaum."""
+        if self.queue.cancel(job_id):
+            process_registry.cancel(job_id)
+            log.warning(f"Job {job_id} abgebrochen.")
+
+    def cancel_selected(self):
+        for job_id in self.tree.selection():
+            self.cancel(job_id)
+
+    def remove_finished(self):
+        self.queue.remove_finished()
+        self._refresh(reschedule=False)
+
+    def shutdown(self):
+        """Beim Beenden der GUI keine verwaisten PyInstaller-Prozesse zurücklassen."""
+        for job in self.queue.list():
+            if not job.is_finished:
+                self.cancel(job.id)
+        self.queue.stop()
+
+    # --- Job-Threads ---
+
+    def _app_lock(self, app_name: str) -> threading.Lock:
+        with self._lock:
+            return self._app_locks.setdefault(app_name.lower(), threading.Lock())
+
+    def _state(self, job_id: str) -> dict:
+        # Aufrufer hält self._lock
+        return self._progress.setdefault(job_id, {"running": [], "done": 0, "total": 0, "failed": None})
+
+    def _set_progress(self, job_id: str, **values):
+        with self._lock:
+            self._state(job_id).update(values)
+
+    def _on_stage(self, job_id: str, event: str, result):
+        with self._lock:
+            state = self._state(job_id)
+            if event == "stage_start":
+                state["running"].append(result.name)
+            elif event == "stage_end":
+                if result.name in state["running"]:
+                    state["running"].remove(result.name)
+                state["done"] += 1
+                if result.status == "failed" and not state["failed"]:
+                    state["failed"] = result.name
+
+    def _run_job(self, job: Job) -> dict:
+        # Kindprozesse dieses Threads (und der Stage-Threads) werden dem Job zugeordnet
+        token = current_job.set(job.id)
+        try:
+            app_name = job.config.get("app_name") or "MyApp"
+            lock = self._app_lock(app_name)
+            if lock.locked():
+                self._set_progress(job.id, running=["wartet auf gleichnamigen Build"])
+            with lock:
+                self._set_progress(job.id, running=[])
+                if job.cancel_requested:
+                    return {"ok": False}
+                # Eigener Build-Baum pro App: parallele Jobs teilen sich weder dist/work noch den
+                # PyInstaller-Cache, den --clean leert; gleichnamige Jobs serialisiert der Lock
+                config = {**job.config, "build_dir": str(app_build_dir(app_name))}
+                run = self.get_orchestrator().run_full_pipeline(
+                    config, listeners=[lambda event, result: self._on_stage(job.id, event, result)])
+            if run is None:
+                return {"ok": False, "error": "Script nicht gefunden"}
+            result = run.as_dict()
+            result["cache_hits"] = dict(run.context.get("cache_hits", {}))
+            return result
+        except Exception as e:
+            log.error(f"CRASH: {e}")
+            raise
+        finally:
+            current_job.reset(token)
+            process_registry.forget(job.id)
+
+    # --- Anzeige (Tk-Thread) ---
+
+    @staticmethod
+    def _format_cache(hits: dict) -> str:
+        parts = []
+        for key, value in hits.items():
+            label = _CACHE_LABELS.get(key, key)
+            parts.append(label if value is True else f"{label} {value}")
+        return ", ".join(parts) or "-"
+
+    def _row(self, job: Job) -> tuple:
+        with self._lock:
+            state = dict(self._state(job.id))
+            state["running"] = list(state["running"])
+        info = job.as_dict()
+        if job.status == Job.RUNNING:
+            stage = ", ".join(state["running"]) or "-"
+        elif job.status == Job.FAILED:
+            stage = state["failed"] or (job.error or "-")
+        else:
+            stage = "-"
+        elapsed = f"{info['elapsed']:.1f}s" if info["elapsed"] is not None else "-"
+        hits = (job.result or {}).get("cache_hits", {}) if isinstance(job.result, dict) else {}
+        progress = f"{state['done']}/{state['total']}" if state["total"] else "-"
+        return (info["app_name"] or "?", _STATUS.get(job.status, job.status), stage, progress, elapsed,
+                self._format_cache(hits))
+
+    def _refresh(self, reschedule: bool = True):
+        jobs = self.queue.list()
+        known = set()
+        for job in jobs:
+            known.add(job.id)
+            values = self._row(job)
+            if self.tree.exists(job.id):
+                self.tree.item(job.id, values=values)
+            else:
+                self.tree.insert("", "end", iid=job.id, values=values)
+        for item in self.tree.get_children():
+            if item not in known:
+                self.tree.delete(item)
+                with self._lock:
+                    self._progress.pop(item, None)
+        if reschedule:
+            self.after(self.interval_ms, self._refresh)
@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+from pathlib import Path
+
+
+class ExitCode:
+    """Exit-Codes der Headless-CLI (CI wertet sie aus, ohne Logs zu parsen)."""
+    OK = 0
+    FAILED = 1          # Pipeline fehlgeschlagen (Stage ohne eigene Kategorie, z.B. package/archive)
+    USAGE = 2           # Falsche Argumente, Config fehlt/ungültig, Script nicht gefunden
+    BUILD = 3           # config/assets/bytecode/build
+    SIGN = 4            # certificate/sign
+    ENVIRONMENT = 5     # environment:tools / environment:deps
+    VERIFY = 6          # Verifikation fehlgeschlagen (ungültige EXE, nicht reproduzierbar)
+    REGRESSION = 7      # Benchmark langsamer als die Baseline erlaubt
+    INTERRUPTED = 130
+
+    _BY_STAGE = {"config": BUILD, "assets": BUILD, "bytecode": BUILD, "build": BUILD, "certificate": SIGN, "sign": SIGN,
+                 "environment:tools": ENVIRONMENT, "environment:deps": ENVIRONMENT}
+
+    @classmethod
+    def for_run(cls, run) -> int:
+        """Code des ersten (frühesten) fehlgeschlagenen Stages eines PipelineRun."""
+        if run is None:
+            return cls.USAGE
+        failed = sorted(run.failed, key=lambda r: r.start or 0)
+        if not failed:
+            return cls.OK if run.ok else cls.FAILED
+        return cls._BY_STAGE.get(failed[0].name, cls.FAILED)
+
+
+class EventStream:
+    """
+    Maschinenlesbarer Event-Stream als NDJSON (eine JSON-Zeile pro Event).
+    Jede Zeile trägt 'run' (ID dieses Aufrufs), 'seq', 'ts' und 'event'; parallele CI-Aufrufe lassen
+    sich so über 'run' zusammenführen. Schreiben ist thread-sicher (Stages laufen parallel).
+    """
+
+    def __init__(self, out=None, run_id: str = None):
+        self.out = out if out is not None else sys.stdout
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._owned = False
+
+    @classmethod
+    def open(cls, target: str = "-", run_id: str = None) -> "EventStream":
+        """'-' = stdout, sonst Datei (Append, damit mehrere Aufrufe eine Datei teilen können)."""
+        if not target or target == "-":
+            return cls(reserve_stdout(), run_id)
+        path = Path(target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stream = cls(open(path, "a", encoding="utf-8", buffering=1), run_id)
+        stream._owned = True
+        return stream
+
+    def emit(self, event: str, **fields) -> dict:
+        with self._lock:
+            self._seq += 1
+            record = {"run": self.run_id, "seq": self._seq, "ts": round(time.time(), 6), "event": event}
+            record.update(fields)
+            line = json.dumps(record, ensure_ascii=False, default=_to_json) + "\n"
+            try:
+                self.out.write(line)
+                self.out.flush()
+            except (OSError, ValueError):
+                pass
+            return record
+
+    def stage_listener(self, event: str, result):
+        """Pipeline-Listener (PipelineScheduler): stage_start / stage_end mit Dauer und Fehler."""
+        if event == "stage_start":
+            self.emit("stage_start", stage=result.name)
+        elif event == "stage_end":
+            self.emit("stage_end", stage=result.name, status=result.status,
+                      duration=round(result.duration, 4), error=str(result.error) if result.error else None)
+
+    def artifact(self, kind: str, path: Path, digest: str = None, **fields) -> dict:
+        path = Path(path)
+        size = path.stat().st_size if path.is_file() else None
+        if digest is None and path.is_file():
+            from src.core.assets import file_digest
+            digest = file_digest(path)
+        return self.emit("artifact", kind=kind, path=str(path.resolve()), bytes=size, sha256=digest, **fields)
+
+    def close(self):
+        try:
+            self.out.close() if self._owned else self.out.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def _to_json(value):
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    if isinstance(value, BaseException):
+        return f"{type(value).__name__}: {value}"
+    return repr(value)
+
+
+def reserve_stdout():
+    """
+    Hält stdout exklusiv für den Event-Stream frei: fd 1 wird dupliziert und danach auf stderr
+    umgebogen. print(), Log-Thread und Kindprozesse (pip, winget, ...) landen damit auf stderr,
+    der zurückgegebene Stream schreibt auf das ursprüngliche stdout.
+    """
+    sys.stdout.flush()
+    try:
+        fd = os.dup(sys.stdout.fileno())
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    except (OSError, ValueError, AttributeError):
+        # Kein echtes fd (z.B. eingebettet): zumindest Python-seitig umleiten
+        original = sys.stdout
+        sys.stdout = sys.stderr
+        return original
+    return os.fdopen(fd, "w", encoding="utf-8", buffering=1)
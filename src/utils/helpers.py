@@ -1,15 +1,11 @@
-import logging
-import sys
 from pathlib import Path
-from colorama import init, Fore, Style
-
-# Initialisiere Colorama für Windows CMD Support
-init(autoreset=True)
+from src.utils.log_backend import backend, DEBUG, INFO, WARNING, ERROR
 
 class Logger:
-    """Zentraler Logger, der sowohl in die Konsole (bunt) als auch in Dateien schreibt."""
+    """Zentraler Logger: Fassade vor dem asynchronen Log-Backend (Konsole bunt, Dateien rotiert + JSON-Zeilen)."""
     
     _instance = None
+    NAME = "PySignBuilder"
 
     def __new__(cls):
         if cls._instance is None:
@@ -18,48 +14,27 @@ class Logger:
         return cls._instance
 
     def _setup(self):
-        self.logger = logging.getLogger("PySignBuilder")
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Formatter
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-
-        # Console Handler
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setLevel(logging.INFO)
-        # Wir färben die Ausgabe im Code direkt, daher hier einfacher Formatter
-        ch.setFormatter(formatter)
-        
-        # File Handler
-        log_dir = Path("logs")
-        if not log_dir.exists():
-            log_dir.mkdir(exist_ok=True)
-            
-        fh = logging.FileHandler(log_dir / "build.log", encoding='utf-8')
-        fh.setLevel(logging.DEBUG)
-        fh.setFormatter(formatter)
-
-        self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+        # Kein eigener Handler mehr: Queue + Hintergrund-Thread im Backend übernehmen Konsole und Dateien
+        self.backend = backend
 
     def info(self, msg):
-        print(f"{Fore.CYAN}[INFO] {Style.RESET_ALL}{msg}")
-        self.logger.info(msg)
+        self.backend.emit(INFO, msg, self.NAME, "INFO")
 
     def success(self, msg):
-        print(f"{Fore.GREEN}[SUCCESS] {Style.RESET_ALL}{msg}")
-        self.logger.info(f"SUCCESS: {msg}")
+        self.backend.emit(INFO, msg, self.NAME, "SUCCESS")
 
     def warning(self, msg):
-        print(f"{Fore.YELLOW}[WARN] {Style.RESET_ALL}{msg}")
-        self.logger.warning(msg)
+        self.backend.emit(WARNING, msg, self.NAME, "WARN")
 
     def error(self, msg):
-        print(f"{Fore.RED}[ERROR] {Style.RESET_ALL}{msg}")
-        self.logger.error(msg)
+        self.backend.emit(ERROR, msg, self.NAME, "ERROR")
         
     def debug(self, msg):
-        self.logger.debug(msg)
+        self.backend.emit(DEBUG, msg, self.NAME, "DEBUG")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wartet, bis alle bisherigen Einträge geschrieben sind (z.B. vor direkten print()-Ausgaben)."""
+        return self.backend.flush(timeout)
 
 # Singleton Instanz
 log = Logger()
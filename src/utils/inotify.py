@@ -0,0 +1,118 @@
+import os
+import sys
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# Event-Masken aus <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            lib.inotify_init1  # noqa: B018 - Existenz prüfen
+            _libc = lib
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+class InotifyEvent:
+    def __init__(self, path: str, name: str, mask: int):
+        self.path = path
+        self.name = name
+        self.mask = mask
+
+    @property
+    def full_path(self) -> str:
+        return os.path.join(self.path, self.name) if self.name else self.path
+
+    def __repr__(self):
+        return f"InotifyEvent({self.full_path!r}, mask={self.mask:#x})"
+
+
+class Inotify:
+    """
+    Minimaler ctypes-Wrapper um Linux inotify (ohne Zusatzpaket).
+    Auf anderen Plattformen ist available() False; Aufrufer fallen dann auf Polling zurück.
+    """
+
+    def __init__(self):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify nicht verfügbar")
+        self._libc = libc
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._watches = {}
+
+    @staticmethod
+    def available() -> bool:
+        return _load_libc() is not None
+
+    def add_watch(self, path, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        self._watches[wd] = str(path)
+        return wd
+
+    def rm_watch(self, wd: int):
+        if self._watches.pop(wd, None) is not None:
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float = None) -> list:
+        """Wartet max. 'timeout' Sekunden auf Events und liefert alle gepufferten Events."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events, offset = [], 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            events.append(InotifyEvent(self._watches.get(wd, ""), name, mask))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
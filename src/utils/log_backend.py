@@ -0,0 +1,202 @@
+import os
+import sys
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import threading
+from pathlib import Path
+from colorama import init, Fore, Style
+
+# Initialisiere Colorama für Windows CMD Support
+init(autoreset=True)
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_COLORS = {DEBUG: "", INFO: Fore.CYAN, WARNING: Fore.YELLOW, ERROR: Fore.RED}
+
+_BATCH = 512
+
+
+class RotatingWriter:
+    """
+    Datei mit größenbasierter Rotation: build.log -> build.log.1.gz -> build.log.2.gz ...
+    Rotiert und komprimiert wird im Log-Thread, nie im Aufrufer.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, backups: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self._size = self._f.tell()
+
+    def write(self, text: str):
+        if self.max_bytes and self._size + len(text) > self.max_bytes and self._size:
+            self.rotate()
+        self._f.write(text)
+        self._size += len(text.encode("utf-8")) if not text.isascii() else len(text)
+
+    def flush(self):
+        self._f.flush()
+
+    def rotate(self):
+        self._f.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}.gz")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}.gz"))
+        if self.backups > 0:
+            rotated = self.path.with_name(f"{self.path.name}.1.gz")
+            tmp = rotated.with_name(rotated.name + ".tmp")
+            with open(self.path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp, rotated)
+        self._f = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def close(self):
+        self._f.close()
+
+
+class LogBackend:
+    """
+    Gemeinsames Log-Backend für alle Logger-Fassaden.
+    Aufrufer legen nur ein Tupel in eine Queue (Mikrosekunden); ein Hintergrund-Thread schreibt
+    gebündelt in die Konsole (farbig, ab INFO), in logs/build.log (Textformat) und logs/build.jsonl
+    (eine JSON-Zeile pro Eintrag), jeweils mit Rotation und gzip.
+    """
+
+    def __init__(self, log_dir: Path = Path("logs"), max_bytes: int = None, backups: int = 5,
+                 console_level: int = INFO):
+        self.log_dir = Path(log_dir)
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(float(os.environ.get("EXEBUILDER_LOG_MAX_MB", 10)) * 1024 * 1024)
+        self.backups = backups
+        self.console_level = console_level
+        self.level = DEBUG
+        self.listeners = []  # callable(record) – z.B. GUI-Konsole; läuft im Log-Thread
+        self.console_stream = None  # None = das jeweils aktuelle sys.stdout
+        self._queue = queue.SimpleQueue()
+        self._text = None
+        self._json = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._start()
+        atexit.register(self.close)
+        if hasattr(os, "register_at_fork"):
+            # Im Kind (fork) existiert der Log-Thread nicht -> dort synchron schreiben
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _open(self):
+        if self._text is None:
+            self._text = RotatingWriter(self.log_dir / "build.log", self.max_bytes, self.backups)
+            self._json = RotatingWriter(self.log_dir / "build.jsonl", self.max_bytes, self.backups)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        self._thread = None
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    # --- Aufrufer-Seite ---
+
+    def emit(self, level: int, msg, logger: str = "ExeBuilder", label: str = None):
+        if level < self.level:
+            return
+        record = (time.time(), level, logger, label, msg, threading.current_thread().name)
+        if self._thread is None:
+            with self._lock:
+                self._write_batch([record])
+            return
+        self._queue.put(record)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wartet, bis alle bis jetzt eingereihten Einträge geschrieben sind."""
+        if self._thread is None or threading.current_thread() is self._thread:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(5)
+        self._thread = None
+        for writer in (self._text, self._json):
+            if writer is not None:
+                writer.flush()
+
+    # --- Log-Thread ---
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, markers, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= _BATCH:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:  # Logging darf nie den Prozess beenden
+                    sys.__stderr__.write(f"[LOG] Schreibfehler: {e}\n")
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: list):
+        self._open()
+        console, text, lines = [], [], []
+        for ts, level, logger, label, msg, thread in batch:
+            msg = str(msg)
+            name = LEVEL_NAMES.get(level, str(level))
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+            text.append(f"{stamp},{int(ts % 1 * 1000):03d} - {name} - {label + ': ' if label == 'SUCCESS' else ''}{msg}\n")
+            lines.append(json.dumps({"ts": round(ts, 6), "level": name, "label": label or name,
+                                     "logger": logger, "thread": thread, "pid": self._pid, "msg": msg},
+                                    ensure_ascii=False) + "\n")
+            if level >= self.console_level:
+                color = Fore.GREEN if label == "SUCCESS" else _COLORS.get(level, "")
+                console.append(f"{color}[{label or name}]{Style.RESET_ALL} {msg}\n")
+            for listener in self.listeners:
+                try:
+                    listener((ts, level, logger, label, msg, thread))
+                except Exception:
+                    pass
+
+        self._text.write("".join(text))
+        self._json.write("".join(lines))
+        self._text.flush()
+        self._json.flush()
+        if console:
+            out = self.console_stream or sys.stdout
+            try:
+                out.write("".join(console))
+                out.flush()
+            except (OSError, ValueError, AttributeError):
+                pass
+
+
+# Singleton Instanz (ein Backend pro Prozess, geteilt von allen Logger-Fassaden)
+backend = LogBackend()
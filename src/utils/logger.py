@@ -1,13 +1,10 @@
-import logging
-import sys
-from pathlib import Path
-from colorama import init, Fore, Style
-
-# Initialisiere Colorama
-init(autoreset=True)
+from src.utils.log_backend import backend, DEBUG, INFO, WARNING, ERROR
 
 class FrameworkLogger:
+    """Fassade vor dem gemeinsamen Log-Backend (früher eigene Datei logs/framework.log)."""
+
     _instance = None
+    NAME = "ExeBuilderFramework"
 
     def __new__(cls):
         if cls._instance is None:
@@ -16,43 +13,24 @@ class FrameworkLogger:
         return cls._instance
 
     def _setup(self):
-        self.logger = logging.getLogger("ExeBuilderFramework")
-        self.logger.setLevel(logging.DEBUG)
-        
-        formatter = logging.Formatter('%(asctime)s - [%(levelname)s] - %(message)s', datefmt='%H:%M:%S')
-
-        # Console Output
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setLevel(logging.INFO)
-        ch.setFormatter(formatter)
-        
-        # File Output
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-        fh = logging.FileHandler(log_dir / "framework.log", encoding='utf-8')
-        fh.setLevel(logging.DEBUG)
-        fh.setFormatter(formatter)
-
-        self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+        self.backend = backend
 
     def info(self, msg):
-        print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {msg}")
-        self.logger.info(msg)
+        self.backend.emit(INFO, msg, self.NAME, "INFO")
 
     def success(self, msg):
-        print(f"{Fore.GREEN}[SUCCESS]{Style.RESET_ALL} {msg}")
-        self.logger.info(f"SUCCESS: {msg}")
+        self.backend.emit(INFO, msg, self.NAME, "SUCCESS")
 
     def warning(self, msg):
-        print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} {msg}")
-        self.logger.warning(msg)
+        self.backend.emit(WARNING, msg, self.NAME, "WARNING")
 
     def error(self, msg):
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} {msg}")
-        self.logger.error(msg)
+        self.backend.emit(ERROR, msg, self.NAME, "ERROR")
 
     def debug(self, msg):
-        self.logger.debug(msg)
+        self.backend.emit(DEBUG, msg, self.NAME, "DEBUG")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return self.backend.flush(timeout)
 
 log = FrameworkLogger()
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import atexit
+import functools
+import contextlib
+import threading
+import contextvars
+from pathlib import Path
+
+_current_span = contextvars.ContextVar("exebuilder_span", default=None)
+# Event-Liste des laufenden collect()-Blocks (z.B. 'trace_file' eines Pipeline-Laufs); Stage-Threads erben sie
+_run_sink = contextvars.ContextVar("exebuilder_trace_sink", default=None)
+
+
+class _NoopSpan:
+    """Platzhalter bei deaktiviertem Tracing: keine Zeitmessung, keine Allokation pro Aufruf."""
+    __slots__ = ()
+
+    def set(self, **attrs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """Ein Zeitabschnitt mit Attributen. Verschachtelung folgt dem contextvars-Kontext (auch über Stage-Threads)."""
+    __slots__ = ("tracer", "name", "cat", "attrs", "start_ns", "parent", "_token")
+
+    def __init__(self, tracer, name: str, cat: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.attrs = attrs
+        self.start_ns = 0
+        self.parent = None
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        if self.parent is not None:
+            self.attrs.setdefault("parent", self.parent.name)
+        self.tracer._record(self, end_ns)
+        return False
+
+
+class Tracer:
+    """
+    Leichtgewichtiges Tracing mit Export im Chrome Trace-Event Format (lädt in Perfetto / chrome://tracing).
+    Prozessweit per EXEBUILDER_TRACE=<datei.json> oder start(); nur für einen Lauf per collect(), ohne
+    dass parallele Läufe mitschreiben. Deaktiviert kostet ein span() nur eine Kontext-Abfrage.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self._events = []
+        self._lock = threading.Lock()
+        self._threads = {}
+        # Zeitbasis in µs relativ zum Prozessstart des Tracers (Chrome erwartet nur monotone Werte)
+        self._epoch_ns = time.perf_counter_ns()
+        self._wall_offset_us = time.time() * 1e6 - self._epoch_ns / 1000
+
+    def start(self, output: Path = None):
+        with self._lock:
+            self.enabled = True
+            if output:
+                self.output = Path(output)
+
+    def stop(self) -> list:
+        """Deaktiviert das Tracing und liefert alle bis dahin gesammelten Events."""
+        with self._lock:
+            self.enabled = False
+            return list(self._events)
+
+    def active(self) -> bool:
+        """Wird im aktuellen Kontext aufgezeichnet (prozessweit oder per collect())?"""
+        return self.enabled or _run_sink.get() is not None
+
+    @contextlib.contextmanager
+    def collect(self):
+        """Sammelt die Events dieses Kontexts (inkl. Stage-Threads) in einer eigenen Liste."""
+        sink = []
+        token = _run_sink.set(sink)
+        try:
+            yield sink
+        finally:
+            _run_sink.reset(token)
+
+    def span(self, name: str, cat: str = "pipeline", **attrs):
+        if not self.active():
+            return _NOOP
+        return Span(self, name, cat, attrs)
+
+    def current(self):
+        """Aktueller Span (oder ein No-op), um Attribute von innen nachzutragen."""
+        return _current_span.get() or _NOOP
+
+    def traced(self, name: str = None, cat: str = "pipeline"):
+        """Decorator-Variante von span()."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.active():
+                    return func(*args, **kwargs)
+                with Span(self, span_name, cat, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instant(self, name: str, cat: str = "pipeline", **attrs):
+        if not self.active():
+            return
+        self._append({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._ts(time.perf_counter_ns()),
+                      "pid": os.getpid(), "tid": self._tid(), "args": attrs})
+
+    def counter(self, name: str, **values):
+        """Zählerwerte (z.B. Bytes), in Perfetto als Verlaufskurve dargestellt."""
+        if not self.active():
+            return
+        self._append({"name": name, "ph": "C", "ts": self._ts(time.perf_counter_ns()),
+                      "pid": os.getpid(), "tid": self._tid(), "args": values})
+
+    # --- intern ---
+
+    def _ts(self, ns: int) -> float:
+        return (ns - self._epoch_ns) / 1000
+
+    def _tid(self) -> int:
+        thread = threading.current_thread()
+        tid = thread.native_id or threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = thread.name
+        return tid
+
+    def _append(self, event: dict):
+        sink = _run_sink.get()
+        with self._lock:
+            if sink is not None:
+                sink.append(event)
+            if self.enabled:
+                self._events.append(event)
+
+    def _record(self, span: Span, end_ns: int):
+        self._append({
+            "name": span.name, "cat": span.cat, "ph": "X",
+            "ts": self._ts(span.start_ns), "dur": (end_ns - span.start_ns) / 1000,
+            "pid": os.getpid(), "tid": self._tid(),
+            "args": {k: _jsonable(v) for k, v in span.attrs.items()},
+        })
+
+    def events(self, events: list = None) -> list:
+        """Alle (bzw. die übergebenen, z.B. aus collect()) Events inkl. Prozess-/Thread-Namen als Metadaten."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events if events is None else events)
+            threads = dict(self._threads)
+        meta = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"ExeBuilder ({pid})"}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in threads.items()]
+        return meta + events
+
+    def export(self, path: Path = None, events: list = None) -> Path:
+        """Schreibt den Trace (bzw. die Events aus collect()) als Chrome Trace-Event JSON."""
+        path = Path(path or self.output or "trace.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "traceEvents": self.events(events),
+            "displayTimeUnit": "ms",
+            "otherData": {"wall_clock_offset_us": self._wall_offset_us},
+        }
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    @staticmethod
+    def merge(paths: list, output: Path) -> Path:
+        """Führt Traces mehrerer Prozesse (z.B. Daemon-Worker) zu einer Datei zusammen."""
+        merged = []
+        for p in paths:
+            data = json.loads(Path(p).read_text(encoding="utf-8"))
+            offset = data.get("otherData", {}).get("wall_clock_offset_us", 0)
+            for event in data.get("traceEvents", []):
+                if "ts" in event:
+                    # Auf gemeinsame Wanduhr-Basis bringen
+                    event["ts"] += offset
+                merged.append(event)
+        Path(output).write_text(json.dumps({"traceEvents": merged, "displayTimeUnit": "ms"}), encoding="utf-8")
+        return Path(output)
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# Singleton Instanz
+tracer = Tracer()
+
+_env_trace = os.environ.get("EXEBUILDER_TRACE")
+if _env_trace:
+    # Pro Prozess eine Datei, damit Worker-Prozesse sich nicht überschreiben ('{pid}' im Namen)
+    tracer.start(Path(_env_trace.replace("{pid}", str(os.getpid()))))
+    atexit.register(tracer.export)